@@ -0,0 +1,125 @@
+"""
+Backtest Cache - Incremental Backtesting Across Requests
+
+A backtest window's prediction depends only on its input bars, the train scaler and
+the model file. Consecutive /predict/ calls for a ticker share almost every window:
+the 10-year range moves by a bar or two, so the test split does too. BacktestCache
+stores the predicted price per target date, keyed by (ticker, architecture, model
+version, sequence length), so run_backtest only infers the windows not seen before
+(usually the newest bars).
+
+A cached prediction is reused only if:
+  - the model file is the same (name, mtime, size), so retrains and hot swaps miss
+  - the train scaler is the same; when the train/test split moves and changes the
+    scaler min/max, every window is rescored
+  - every bar of its window and its target date is in the cached series with the
+    same close, with no bars inserted or dropped in between; restated history
+    (e.g. split-adjusted prices) therefore misses
+
+Metrics are recomputed from the merged arrays (a few hundred floats); the expensive
+part, inference, is what the cache skips. Cache failures never fail a backtest.
+"""
+
+import io
+
+import numpy as np
+from django.db import DatabaseError
+
+from .models import BacktestCacheEntry
+
+
+class BacktestCache:
+    """
+    Per-(ticker, model) store of backtest predictions, passed to run_backtest.
+
+    Usage:
+        cache = BacktestCache('AAPL', 'lstm', '', manager.model_fingerprint('lstm'))
+        result = run_backtest(close_prices, model, cache=cache)
+    """
+
+    def __init__(self, ticker, architecture, model_version, model_fingerprint):
+        self.ticker = ticker
+        self.architecture = architecture
+        self.model_version = model_version
+        self.model_fingerprint = model_fingerprint
+
+    def load(self, dates, prices, scaler, sequence_length):
+        """
+        Cached predictions for the windows of a series.
+
+        Args:
+            dates (np.ndarray): datetime64[D] bar dates
+            prices (np.ndarray): Closes of those bars
+            scaler: Train scaler the windows are scaled with
+            sequence_length (int): Window length
+
+        Returns:
+            np.ndarray: float64 predicted price per window (len(prices) - sequence_length),
+                NaN where the window must be inferred
+        """
+        predictions = np.full(len(prices) - sequence_length, np.nan)
+        try:
+            entry = self._entries(sequence_length).first()
+        except DatabaseError:
+            return predictions
+        if entry is None or not self._matches(entry, scaler):
+            return predictions
+
+        cached = np.load(io.BytesIO(bytes(entry.payload)))
+        cached_dates = cached['dates'].astype('datetime64[D]')
+        cached_prices, cached_predictions = cached['prices'], cached['predictions']
+
+        # Position of each new bar in the cached series
+        pos = np.searchsorted(cached_dates, dates).clip(max=len(cached_dates) - 1)
+        found = cached_dates[pos] == dates
+        if not np.allclose(prices[found], cached_prices[pos[found]], rtol=1e-9, atol=0.0):
+            return predictions
+
+        # Window w covers bars w .. w + sequence_length (target included): reusable when
+        # all of them are cached and consecutive there
+        found_count = np.concatenate([[0], np.cumsum(found)])
+        targets = np.arange(sequence_length, len(prices))
+        starts = targets - sequence_length
+        reusable = (
+            (found_count[targets + 1] - found_count[starts] == sequence_length + 1)
+            & (pos[targets] - pos[starts] == sequence_length)
+        )
+        predictions[reusable] = cached_predictions[pos[targets[reusable]]]
+        return predictions
+
+    def store(self, dates, prices, predictions, scaler, sequence_length):
+        """Replace the entry with this series' bars and window predictions."""
+        aligned = np.full(len(prices), np.nan)
+        aligned[sequence_length:] = predictions
+        buffer = io.BytesIO()
+        np.savez(
+            buffer, dates=dates.astype('int64'), prices=np.asarray(prices, dtype='float64'),
+            predictions=aligned,
+        )
+        try:
+            BacktestCacheEntry.objects.update_or_create(
+                ticker=self.ticker, architecture=self.architecture,
+                model_version=self.model_version, sequence_length=sequence_length,
+                defaults={
+                    'model_fingerprint': self.model_fingerprint,
+                    'scale': float(scaler.scale_[0]),
+                    'offset': float(scaler.min_[0]),
+                    'payload': buffer.getvalue(),
+                    'n_windows': len(predictions),
+                },
+            )
+        except DatabaseError:
+            pass  # A lost cache write only costs a full backtest next time
+
+    def _entries(self, sequence_length):
+        return BacktestCacheEntry.objects.filter(
+            ticker=self.ticker, architecture=self.architecture,
+            model_version=self.model_version, sequence_length=sequence_length,
+        )
+
+    def _matches(self, entry, scaler):
+        return (
+            entry.model_fingerprint == self.model_fingerprint
+            and np.isclose(entry.scale, scaler.scale_[0], rtol=1e-12, atol=0.0)
+            and np.isclose(entry.offset, scaler.min_[0], rtol=1e-12, atol=0.0)
+        )
@@ -0,0 +1,108 @@
+"""
+Backtest Core - Window and Metric Helpers Without pandas
+
+The parts of a backtest that only need numpy: sliding model windows over a scaled
+series and streaming regression metrics. They live apart from data_pipeline.py so
+walk-forward pool workers (walk_forward_worker.py) can import them without pulling in
+pandas or yfinance; data_pipeline re-exports both.
+"""
+
+import numpy as np
+
+
+def create_sequences(data, sequence_length=100):
+    """
+    Create LSTM input sequences (X, y pairs) from scaled data.
+
+    This function implements a sliding window approach where each X is a sequence
+    of 'sequence_length' consecutive values, and y is the next value.
+
+    X and y are read-only views of data (no copy): X is a strided window view, so
+    its memory is the input series itself. The dtype is kept, so float32 data gives
+    float32 windows ready for the ONNX model. Copy X before writing to it.
+
+    Args:
+        data (np.ndarray): Scaled data array, shape (n_samples, 1) or (n_samples,)
+        sequence_length (int): Length of input sequence (default: 100)
+
+    Returns:
+        tuple: (X, y) where:
+            - X: np.ndarray view of shape (n_sequences, sequence_length, 1)
+            - y: np.ndarray view of shape (n_sequences,)
+
+    Example:
+        Given prices: [10, 20, 30, 40, 50] and sequence_length=3:
+        X[0] = [10, 20, 30], y[0] = 40
+        X[1] = [20, 30, 40], y[1] = 50
+    """
+    if len(data) < sequence_length + 1:
+        raise ValueError(
+            f"Insufficient data for sequences: {len(data)} samples, "
+            f"need at least {sequence_length + 1}"
+        )
+
+    series = np.asarray(data).reshape(len(data), -1)[:, 0]
+
+    # X: every window of 'sequence_length' values except the last (it has no next value)
+    X = np.lib.stride_tricks.sliding_window_view(series[:-1], sequence_length)
+    # y: the value right after each window
+    y = series[sequence_length:]
+    y.flags.writeable = False
+
+    # Add the feature axis for LSTM input: (n_sequences, sequence_length, 1)
+    return X[:, :, np.newaxis], y
+
+
+class StreamingRegressionMetrics:
+    """
+    MSE, RMSE and R² accumulated chunk by chunk in one pass.
+
+    Keeps the residual sum of squares and shifted sums of the targets (shifted by the
+    first target, which keeps the variance accurate for prices far from zero).
+
+    Usage:
+        metrics = StreamingRegressionMetrics()
+        for y_true, y_pred in chunks:
+            metrics.update(y_true, y_pred)
+        metrics.result()  # {'mse', 'rmse', 'r2'}
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.ss_res = 0.0
+        self._shift = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, y_actual, y_predicted):
+        y_actual = np.asarray(y_actual, dtype='float64')
+        y_predicted = np.asarray(y_predicted, dtype='float64')
+        if not len(y_actual):
+            return
+        if self._shift is None:
+            self._shift = float(y_actual[0])
+        residuals = y_actual - y_predicted
+        centered = y_actual - self._shift
+        self.n += len(y_actual)
+        self.ss_res += float(residuals @ residuals)
+        self._sum += float(centered.sum())
+        self._sum_sq += float(centered @ centered)
+
+    def result(self):
+        """
+        Returns:
+            dict: {'mse', 'rmse', 'r2'} as floats (same values as sklearn.metrics)
+
+        Raises:
+            ValueError: If no samples were added
+        """
+        if not self.n:
+            raise ValueError("No samples to compute metrics from.")
+        mse = self.ss_res / self.n
+        ss_tot = max(self._sum_sq - self._sum * self._sum / self.n, 0.0)
+        if ss_tot == 0.0:
+            # Constant target: perfect fit scores 1, anything else 0 (as in sklearn)
+            r2 = 1.0 if self.ss_res == 0.0 else 0.0
+        else:
+            r2 = 1.0 - self.ss_res / ss_tot
+        return {'mse': mse, 'rmse': float(np.sqrt(mse)), 'r2': r2}
@@ -12,6 +12,9 @@ import numpy as np
 import yfinance as yf
 from datetime import datetime
 
+from .backtest_core import StreamingRegressionMetrics, create_sequences
+from .scaling import AffineScaler
+
 
 def download_stock_data(ticker, years=10):
     """
@@ -110,48 +113,116 @@ def prepare_backtesting_data(close_prices, train_ratio=0.7):
     }
 
 
-def create_sequences(data, sequence_length=100):
+def run_backtest(close_prices, model, sequence_length=100, train_ratio=0.7, scaler_factory=None,
+                 chunk_size=None, cache=None):
     """
-    Create LSTM input sequences (X, y pairs) from scaled data.
+    Replay the /predict/ backtest: one-step-ahead predictions over the test period.
+
+    The scaler is fitted on the training split only; the last sequence_length training
+    days seed the first test window.
 
-    This function implements a sliding window approach where each X is a sequence
-    of 'sequence_length' consecutive values, and y is the next value.
+    With chunk_size, windows go through the model chunk_size at a time: each chunk's
+    predictions are written into one preallocated output array and folded into
+    streaming metrics, so the model input and activations stay bounded by the chunk
+    however long the history is.
+
+    With a cache (see backtest_cache.BacktestCache), predictions of windows scored by an
+    earlier run are reused and only the remaining windows are inferred.
 
     Args:
-        data (np.ndarray): Scaled data array, shape (n_samples, 1)
-        sequence_length (int): Length of input sequence (default: 100)
+        close_prices (pd.Series): Time series of closing prices
+        model: ONNX session (or compatible) taking (n, sequence_length, 1) float32 windows
+        sequence_length (int): Window length (default: 100)
+        train_ratio (float): Ratio of data used for training (default: 0.7)
+        scaler_factory (callable): scaler_factory(train pd.Series) -> fitted scaler, e.g.
+            a scaler_store lookup (default: fit an AffineScaler on the training split)
+        chunk_size (int): Windows per model call (default: None = all in one call)
+        cache: Object with load(dates, prices, scaler, sequence_length) -> predictions
+            (NaN where unknown) and store(dates, prices, predictions, scaler,
+            sequence_length); dates are the bar dates of prices (default: None)
 
     Returns:
-        tuple: (X, y) where:
-            - X: np.ndarray of shape (n_sequences, sequence_length, 1)
-            - y: np.ndarray of shape (n_sequences,)
-
-    Example:
-        Given prices: [10, 20, 30, 40, 50] and sequence_length=3:
-        X[0] = [10, 20, 30], y[0] = 40
-        X[1] = [20, 30, 40], y[1] = 50
+        dict: Dictionary containing:
+            - 'y_actual': np.ndarray of actual test prices
+            - 'y_predicted': np.ndarray of predicted test prices
+            - 'split_idx': int index where the train/test split occurs
+            - 'metrics': {'mse', 'rmse', 'r2'} of the predictions
+            - 'windows_inferred': int number of windows run through the model
     """
-    if len(data) < sequence_length + 1:
-        raise ValueError(
-            f"Insufficient data for sequences: {len(data)} samples, "
-            f"need at least {sequence_length + 1}"
-        )
-
-    X, y = [], []
+    data_split = prepare_backtesting_data(close_prices, train_ratio=train_ratio)
+
+    if scaler_factory is None:
+        train_scaler = AffineScaler.fit(data_split['train'].values.reshape(-1, 1))
+    else:
+        train_scaler = scaler_factory(data_split['train'])
+
+    inputs = pd.concat([data_split['past_100'], data_split['test']])
+    prices = inputs.values.astype('float64')
+    # Scaled once into a float32 series; the model windows are views of it
+    input_data = train_scaler.transform(prices.reshape(-1, 1)).astype('float32')
+    x_test, _ = create_sequences(input_data, sequence_length=sequence_length)
+    # Targets are the unscaled prices after each window (no scale round trip)
+    y_actual = prices[sequence_length:]
+
+    dates = bar_dates(inputs) if cache is not None else None
+    if dates is not None:
+        y_predicted = cache.load(dates, prices, train_scaler, sequence_length)
+    else:
+        y_predicted = np.full(len(x_test), np.nan)
+    missing = np.isnan(y_predicted)
+    windows_inferred = int(missing.sum())
+
+    input_name = model.get_inputs()[0].name
+    n_windows = len(x_test)
+    step = chunk_size if chunk_size and chunk_size > 0 else n_windows
+    metrics = StreamingRegressionMetrics()
+
+    for start in range(0, n_windows, step):
+        stop = min(start + step, n_windows)
+        rows = start + np.flatnonzero(missing[start:stop])
+        if len(rows) == stop - start:
+            chunk_scaled = model.run(None, {input_name: x_test[start:stop]})[0]
+        elif len(rows):
+            # Only windows the cache did not cover (gathered into a chunk-sized copy)
+            chunk_scaled = model.run(None, {input_name: x_test[rows]})[0]
+        if len(rows):
+            # Write the prices straight into the output rows
+            predicted = chunk_scaled[:, 0].astype('float64')
+            y_predicted[rows] = train_scaler.inverse_transform_inplace(predicted)
+        metrics.update(y_actual[start:stop], y_predicted[start:stop])
+
+    if dates is not None and windows_inferred:
+        cache.store(dates, prices, y_predicted, train_scaler, sequence_length)
 
-    for i in range(sequence_length, data.shape[0]):
-        # X: previous 'sequence_length' values
-        X.append(data[i - sequence_length:i, 0])
-        # y: next value
-        y.append(data[i, 0])
+    return {
+        'y_actual': y_actual,
+        'y_predicted': y_predicted,
+        'split_idx': data_split['split_idx'],
+        'metrics': metrics.result(),
+        'windows_inferred': windows_inferred,
+    }
 
-    X = np.array(X)
-    y = np.array(y)
 
-    # Reshape X for LSTM input: (n_sequences, sequence_length, 1)
-    X = X.reshape(X.shape[0], X.shape[1], 1)
+def regression_metrics(y_actual, y_predicted):
+    """
+    MSE, RMSE and R² of predictions (same values as sklearn.metrics).
 
-    return X, y
+    Returns:
+        dict: {'mse', 'rmse', 'r2'} as floats
+    """
+    metrics = StreamingRegressionMetrics()
+    metrics.update(y_actual, y_predicted)
+    return metrics.result()
+
+
+def bar_dates(prices):
+    """Bar dates as datetime64[D] (timezone dropped), or None without a DatetimeIndex."""
+    index = getattr(prices, 'index', None)
+    if not isinstance(index, pd.DatetimeIndex):
+        return None
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]')
 
 
 def validate_data_quality(close_prices):
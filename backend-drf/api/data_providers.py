@@ -9,6 +9,14 @@ Providers:
 - AlphaVantageProvider (requires API key, 25 req/day free tier)
 - FinnhubProvider (requires API key, 60 calls/min free, real-time quotes)
 
+StoredHistoryProvider wraps any of them with the local price store (api/price_store.py):
+history is downloaded once per ticker, later calls only fetch the bars after the last
+stored date.
+
+get_historical_many / get_historical_since_many download several tickers at once:
+natively in one bulk request for yfinance and yahooquery, on a bounded thread pool
+otherwise. Tickers without data are left out of the result.
+
 Usage:
     from .data_providers import get_provider_with_fallback, get_realtime_provider
     df = get_provider_with_fallback('AAPL', user=request.user)
@@ -18,7 +26,12 @@ Usage:
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+
+# Concurrent single-ticker downloads in the get_historical_many fallback
+BULK_MAX_WORKERS = 8
 
 
 class BaseDataProvider(ABC):
@@ -29,6 +42,23 @@ class BaseDataProvider(ABC):
         """Get historical OHLCV data. Must return DataFrame with 'Close' column."""
         pass
 
+    def get_historical_since(self, ticker: str, start: date) -> pd.DataFrame:
+        """
+        Get daily bars from start (inclusive) to the latest; may be empty.
+        Providers without a range query download the full history and slice it.
+        """
+        years = (date.today() - start).days // 365 + 1
+        df = self.get_historical(ticker, years)
+        return df[df.index >= pd.Timestamp(start)]
+
+    def get_historical_many(self, tickers: list, years: int = 10) -> dict:
+        """Get historical data for several tickers: {ticker: DataFrame}, failures left out."""
+        return _map_tickers(lambda t: self.get_historical(t, years), tickers)
+
+    def get_historical_since_many(self, tickers: list, start: date) -> dict:
+        """get_historical_since for several tickers: {ticker: DataFrame}, failures left out."""
+        return _map_tickers(lambda t: self.get_historical_since(t, start), tickers)
+
     @abstractmethod
     def get_quote(self, ticker: str) -> dict:
         """
@@ -52,23 +82,55 @@ class YFinanceProvider(BaseDataProvider):
     name = 'yfinance'
 
     def get_historical(self, ticker: str, years: int = 10) -> pd.DataFrame:
-        import yfinance as yf
         end = datetime.now()
         start = end - timedelta(days=years * 365)
-        df = yf.download(
-            ticker, start=start.strftime('%Y-%m-%d'),
-            end=end.strftime('%Y-%m-%d'), progress=False, auto_adjust=True
-        )
+        df = self._download(ticker, start, end)
         if df.empty:
             raise ValueError(
                 f"Ticker '{ticker}' not found or no data available via yfinance."
             )
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
         if 'Close' not in df.columns:
             raise ValueError(f"No Close price data for ticker '{ticker}'.")
         return df
 
+    def get_historical_since(self, ticker: str, start: date) -> pd.DataFrame:
+        return self._download(ticker, start, datetime.now())
+
+    def get_historical_many(self, tickers: list, years: int = 10) -> dict:
+        end = datetime.now()
+        return self._download_many(tickers, end - timedelta(days=years * 365), end)
+
+    def get_historical_since_many(self, tickers: list, start: date) -> dict:
+        return self._download_many(tickers, start, datetime.now())
+
+    def _download(self, ticker, start, end):
+        import yfinance as yf
+        df = yf.download(
+            ticker, start=start.strftime('%Y-%m-%d'),
+            end=end.strftime('%Y-%m-%d'), progress=False, auto_adjust=True
+        )
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        return df
+
+    def _download_many(self, tickers, start, end):
+        import yfinance as yf
+        df = yf.download(
+            list(tickers), start=start.strftime('%Y-%m-%d'),
+            end=end.strftime('%Y-%m-%d'), progress=False, auto_adjust=True,
+            group_by='ticker', threads=True
+        )
+        frames = {}
+        if df.empty:
+            return frames
+        for ticker in tickers:
+            if ticker not in df.columns.get_level_values(0):
+                continue
+            frame = df[ticker].dropna(how='all')
+            if not frame.empty and 'Close' in frame.columns:
+                frames[ticker] = frame
+        return frames
+
     def get_quote(self, ticker: str) -> dict:
         import yfinance as yf
         t = yf.Ticker(ticker)
@@ -103,16 +165,53 @@ class YahooQueryProvider(BaseDataProvider):
     name = 'yahooquery'
 
     def get_historical(self, ticker: str, years: int = 10) -> pd.DataFrame:
-        from yahooquery import Ticker
         end = datetime.now()
         start = end - timedelta(days=years * 365)
+        df = self._download(ticker, start, end)
+        if df.empty:
+            raise ValueError(f"No data found for ticker '{ticker}' via yahooquery.")
+        return df
+
+    def get_historical_since(self, ticker: str, start: date) -> pd.DataFrame:
+        return self._download(ticker, start, datetime.now())
+
+    def get_historical_many(self, tickers: list, years: int = 10) -> dict:
+        end = datetime.now()
+        return self._download_many(tickers, end - timedelta(days=years * 365), end)
+
+    def get_historical_since_many(self, tickers: list, start: date) -> dict:
+        return self._download_many(tickers, start, datetime.now())
+
+    def _download(self, ticker, start, end):
+        from yahooquery import Ticker
         t = Ticker(ticker)
         df = t.history(
             start=start.strftime('%Y-%m-%d'),
             end=end.strftime('%Y-%m-%d')
         )
-        if df is None or (isinstance(df, pd.DataFrame) and df.empty):
-            raise ValueError(f"No data found for ticker '{ticker}' via yahooquery.")
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return pd.DataFrame()
+        return self._format(df)
+
+    def _download_many(self, tickers, start, end):
+        from yahooquery import Ticker
+        t = Ticker(list(tickers), asynchronous=True)
+        history = t.history(
+            start=start.strftime('%Y-%m-%d'),
+            end=end.strftime('%Y-%m-%d')
+        )
+        # One frame indexed by (symbol, date), or a dict when some symbols failed
+        if isinstance(history, pd.DataFrame):
+            symbols = history.index.get_level_values(0).unique() if not history.empty else []
+            history = {symbol: history.xs(symbol, level=0, drop_level=False) for symbol in symbols}
+        frames = {}
+        for ticker, df in history.items():
+            if isinstance(df, pd.DataFrame) and not df.empty:
+                frames[ticker] = self._format(df)
+        return frames
+
+    @staticmethod
+    def _format(df):
         if isinstance(df.index, pd.MultiIndex):
             df = df.droplevel(0)
         df.index = pd.to_datetime(df.index)
@@ -155,19 +254,31 @@ class AlphaVantageProvider(BaseDataProvider):
     def __init__(self, api_key: str):
         self.api_key = api_key
 
+    # Bars returned by outputsize='compact'
+    COMPACT_BARS = 100
+
     def get_historical(self, ticker: str, years: int = 10) -> pd.DataFrame:
+        data = self._daily(ticker, outputsize='full')
+        cutoff = datetime.now() - timedelta(days=years * 365)
+        return data[data.index >= cutoff.strftime('%Y-%m-%d')]
+
+    def get_historical_since(self, ticker: str, start: date) -> pd.DataFrame:
+        # Same quota cost either way, but the compact payload is ~50x smaller
+        compact = np.busday_count(start, date.today()) < self.COMPACT_BARS
+        data = self._daily(ticker, outputsize='compact' if compact else 'full')
+        return data[data.index >= pd.Timestamp(start)]
+
+    def _daily(self, ticker, outputsize):
         from alpha_vantage.timeseries import TimeSeries
         ts = TimeSeries(key=self.api_key, output_format='pandas')
-        data, _ = ts.get_daily_adjusted(symbol=ticker, outputsize='full')
+        data, _ = ts.get_daily_adjusted(symbol=ticker, outputsize=outputsize)
         if data.empty:
             raise ValueError(
                 f"No data found for ticker '{ticker}' via Alpha Vantage. "
                 f"Ensure the ticker is valid and your API key is correct."
             )
         data = data.sort_index()
-        cutoff = datetime.now() - timedelta(days=years * 365)
-        data = data[data.index >= cutoff.strftime('%Y-%m-%d')]
-        data = data.rename(columns={
+        return data.rename(columns={
             '1. open': 'Open',
             '2. high': 'High',
             '3. low': 'Low',
@@ -177,7 +288,6 @@ class AlphaVantageProvider(BaseDataProvider):
             '7. dividend amount': 'Dividends',
             '8. split coefficient': 'Stock Splits',
         })
-        return data
 
     def get_quote(self, ticker: str) -> dict:
         from alpha_vantage.timeseries import TimeSeries
@@ -228,6 +338,15 @@ class FinnhubProvider(BaseDataProvider):
         """Finnhub free tier has limited history. Falls back to yfinance for historical data."""
         return YFinanceProvider().get_historical(ticker, years)
 
+    def get_historical_since(self, ticker: str, start: date) -> pd.DataFrame:
+        return YFinanceProvider().get_historical_since(ticker, start)
+
+    def get_historical_many(self, tickers: list, years: int = 10) -> dict:
+        return YFinanceProvider().get_historical_many(tickers, years)
+
+    def get_historical_since_many(self, tickers: list, start: date) -> dict:
+        return YFinanceProvider().get_historical_since_many(tickers, start)
+
     def get_quote(self, ticker: str) -> dict:
         import finnhub
         client = finnhub.Client(api_key=self.api_key)
@@ -285,6 +404,38 @@ class FinnhubProvider(BaseDataProvider):
             return False
 
 
+class StoredHistoryProvider(BaseDataProvider):
+    """
+    Serves history from the local price store, asking the wrapped provider only for
+    the bars after the last stored date. Quotes and intraday data go straight upstream.
+    """
+
+    def __init__(self, upstream: BaseDataProvider):
+        self.upstream = upstream
+        self.name = upstream.name
+
+    def get_historical(self, ticker: str, years: int = 10) -> pd.DataFrame:
+        from .price_store import get_history
+        return get_history(ticker, self.upstream, years)
+
+    def get_quote(self, ticker: str) -> dict:
+        return self.upstream.get_quote(ticker)
+
+    def get_intraday(self, ticker: str, interval: str = '5') -> pd.DataFrame:
+        return self.upstream.get_intraday(ticker, interval)
+
+    def validate_key(self) -> bool:
+        return self.upstream.validate_key()
+
+
+def with_price_store(provider: BaseDataProvider) -> BaseDataProvider:
+    """Wrap a provider with the local price store when settings.PRICE_STORE is enabled."""
+    from django.conf import settings
+    if not getattr(settings, 'PRICE_STORE', {}).get('ENABLED'):
+        return provider
+    return StoredHistoryProvider(provider)
+
+
 def get_historical_provider(user=None) -> BaseDataProvider:
     """
     Get the provider for historical data based on user config.
@@ -325,17 +476,39 @@ def get_realtime_provider(user=None) -> BaseDataProvider:
 def get_provider_with_fallback(ticker: str, user=None, years: int = 10) -> pd.DataFrame:
     """
     Download historical data with automatic yahooquery fallback if primary provider fails.
-    This is the main entry point for all historical data downloads.
+    This is the main entry point for all historical data downloads; results are shared
+    across workers and users through the history cache (api/history_cache.py).
     """
+    from .history_cache import get_cached_history
     provider = get_historical_provider(user)
+    return get_cached_history(
+        provider.name, ticker, years,
+        lambda: _download_with_fallback(provider, ticker, years),
+    )
+
+
+def _download_with_fallback(provider: BaseDataProvider, ticker: str, years: int) -> pd.DataFrame:
     try:
-        return provider.get_historical(ticker, years)
+        return with_price_store(provider).get_historical(ticker, years)
     except Exception as primary_error:
         if not isinstance(provider, (YahooQueryProvider, YFinanceProvider)):
             raise primary_error
         if isinstance(provider, YFinanceProvider):
             try:
-                return YahooQueryProvider().get_historical(ticker, years)
+                return with_price_store(YahooQueryProvider()).get_historical(ticker, years)
             except Exception:
                 raise primary_error
         raise primary_error
+
+
+def _map_tickers(fetch, tickers, max_workers=BULK_MAX_WORKERS):
+    """Run a single-ticker download for each ticker on a bounded thread pool."""
+    def attempt(ticker):
+        try:
+            return ticker, fetch(ticker)
+        except Exception:
+            return ticker, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        results = pool.map(attempt, tickers)
+        return {t: df for t, df in results if df is not None and not df.empty}
@@ -0,0 +1,109 @@
+"""
+History Cache - Shared Cache of Historical Downloads
+
+get_provider_with_fallback results are cached in Django's default cache, keyed by
+(provider, ticker, years, server date), as an npz payload of the frame (~100 KB for
+10 years of OHLCV). With the file-based or Redis backend configured in settings.CACHES
+the entry is shared by all gunicorn workers and all users: one fetch serves every
+repeat request for a ticker.
+
+Daily bars only change when a session closes, so an entry lives until the next
+exchange close (HISTORY_CACHE['EXCHANGE_TIMEZONE'] / ['CLOSE_TIME'], weekdays;
+holidays just cost one extra fetch). Providers return bars up to the previous server
+date, so the date is part of the key and the first request of a new day fetches again.
+
+Misses are single-flight (api/single_flight.py): concurrent requests for the same
+key in a process share one fetch, and with the cache enabled workers serialize on a
+per-key file lock and re-check the cache after waiting, so a burst on a hot ticker
+costs one download.
+
+Cache backend errors never fail a request: the frame is then fetched directly.
+"""
+
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .price_store import decode_bars, encode_bars, normalize_bars
+from .single_flight import SingleFlight, file_lock
+
+
+_flights = SingleFlight()
+
+
+def get_cached_history(provider_name, ticker, years, fetch):
+    """
+    Historical frame from the shared cache, or fetch() and cache it.
+
+    Args:
+        provider_name (str): Name of the provider the request resolves to
+        ticker (str): Ticker symbol
+        years (int): History length
+        fetch (callable): Downloads the frame on a miss
+
+    Returns:
+        pd.DataFrame: Bars with a DatetimeIndex named 'Date' and at least a 'Close' column
+    """
+    options = getattr(settings, 'HISTORY_CACHE', {})
+    flight = f'history:{provider_name}:{ticker}:{years}'
+    key = f'{flight}:{date.today().isoformat()}'
+    if options.get('ENABLED'):
+        payload = _cache_get(key)
+        if payload is not None:
+            return decode_bars(payload)
+
+    # Every caller decodes its own copy of the leader's payload
+    return decode_bars(_flights.do(key, lambda: _fetch_once(flight, key, fetch, options)))
+
+
+def _fetch_once(flight, key, fetch, options):
+    if not options.get('ENABLED'):
+        # Nothing is shared between workers, so waiting on each other gains nothing
+        return encode_bars(normalize_bars(fetch()))
+
+    with file_lock(flight):
+        # Another worker may have fetched while this one waited for the lock
+        payload = _cache_get(key)
+        if payload is not None:
+            return payload
+
+        payload = encode_bars(normalize_bars(fetch()))
+        try:
+            cache.set(key, payload, seconds_until_close(
+                options.get('EXCHANGE_TIMEZONE', 'America/New_York'),
+                options.get('CLOSE_TIME', '16:00'),
+            ))
+        except Exception:
+            pass  # A lost cache write only costs another fetch
+        return payload
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def seconds_until_close(exchange_timezone='America/New_York', close_time='16:00', now=None):
+    """
+    Seconds until the next weekday session close of the exchange.
+
+    Args:
+        exchange_timezone (str): IANA timezone of the exchange
+        close_time (str): Local close time, 'HH:MM'
+        now (datetime): Aware current time (default: now)
+
+    Returns:
+        int: Seconds until the next close, at least 1
+    """
+    tz = ZoneInfo(exchange_timezone)
+    now = (now or datetime.now(tz)).astimezone(tz)
+    hour, minute = (int(part) for part in close_time.split(':'))
+    close = datetime.combine(now.date(), time(hour, minute), tzinfo=tz)
+    while close <= now or close.weekday() >= 5:
+        close = datetime.combine(close.date() + timedelta(days=1), time(hour, minute), tzinfo=tz)
+    # Timestamps, not close - now: same-tzinfo subtraction ignores DST changes in between
+    return max(1, int(close.timestamp() - now.timestamp()))
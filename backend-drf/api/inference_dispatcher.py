@@ -0,0 +1,205 @@
+"""
+Inference Dispatcher - Cross-Request Micro-Batching for ONNX Sessions
+
+Every /predict/ request runs many small InferenceSession.run calls (one per
+backtest, one per forecast day with all MC samples). Under concurrency each
+gunicorn thread pays the fixed per-call overhead on its own. BatchingSession
+sits in front of a session and merges concurrent calls into one forward pass:
+
+    caller threads --run()--> queue --> batcher thread --session.run(merged)-->
+    caller threads <--------- per-caller row slices of the outputs ----------+
+
+- Only calls with identical output names and per-row input shapes are merged
+  (e.g. all (n, 100, 1) windows for the sequence model).
+- The batcher never holds a batch open: it merges whatever queued up while the
+  previous forward pass ran, so merging only happens when callers actually
+  overlap and a lone caller pays no wait.
+- Calls with max_batch_size rows or more bypass the queue.
+
+Merging needs several threads per process sharing a session (gunicorn --threads /
+gthread workers). With sync workers every call would just detour through the
+batcher thread, so settings.INFERENCE_BATCHING is off by default.
+
+BatchingSession exposes the InferenceSession API used by the app (run,
+get_inputs, get_outputs), so callers are unchanged.
+"""
+
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+class _PendingCall:
+    """One caller's request, completed by the batcher thread."""
+
+    __slots__ = ('output_names', 'feed', 'rows', 'signature', 'result', 'error', 'done')
+
+    def __init__(self, output_names, feed):
+        self.output_names = output_names
+        self.feed = feed
+        self.rows = next(iter(feed.values())).shape[0]
+        self.signature = (
+            tuple(output_names) if output_names else None,
+            tuple((name, arr.shape[1:], arr.dtype.str) for name, arr in sorted(feed.items())),
+        )
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchingSession:
+    """
+    InferenceSession proxy that merges concurrent run() calls along the batch axis.
+
+    Usage:
+        session = BatchingSession(ort.InferenceSession(path), max_batch_size=512)
+        y = session.run(None, {'x': X})[0]
+    """
+
+    def __init__(self, session, max_batch_size=512, name='model'):
+        """
+        Args:
+            session (ort.InferenceSession): Session with a dynamic batch axis on every input
+            max_batch_size (int): Max rows per merged forward pass (default: 512)
+            name (str): Label for the batcher thread (default: 'model')
+        """
+        self.session = session
+        self.max_batch_size = max_batch_size
+        self.name = name
+        self._queue = queue.Queue()
+        self._closed_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._closed = False
+        # A BoundSession overwrites its outputs on the batcher thread's next run
+        self._reuses_outputs = getattr(session, 'reuses_output_buffers', False)
+
+    @staticmethod
+    def supports(session):
+        """True if every input of the session has a symbolic (batchable) leading axis."""
+        inputs = session.get_inputs()
+        return bool(inputs) and all(
+            i.shape and not isinstance(i.shape[0], int) for i in inputs
+        )
+
+    def get_inputs(self):
+        return self.session.get_inputs()
+
+    def get_outputs(self):
+        return self.session.get_outputs()
+
+    def __getattr__(self, attr):
+        return getattr(self.session, attr)
+
+    def run(self, output_names, input_feed, run_options=None):
+        """
+        Run the session, sharing the forward pass with concurrent callers.
+
+        Args:
+            output_names (list | None): Output names (None for all outputs)
+            input_feed (dict): Input name -> np.ndarray, all with the same leading size
+            run_options: Passed through; calls with run_options are not merged
+
+        Returns:
+            list[np.ndarray]: Outputs for this caller's rows only
+        """
+        rows = {arr.shape[0] for arr in input_feed.values()}
+        if run_options is not None or len(rows) != 1 or rows.pop() >= self.max_batch_size:
+            return self.session.run(output_names, input_feed, run_options)
+
+        call = _PendingCall(output_names, input_feed)
+        if not self._closed:
+            self._ensure_thread()
+        with self._closed_lock:
+            if self._closed:
+                # Replaced or evicted by the model registry: finish on the session directly
+                return self.session.run(output_names, input_feed)
+            self._queue.put(call)
+        call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def close(self):
+        """Stop the batcher thread once queued calls are served; later calls run unbatched."""
+        with self._closed_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+    def _ensure_thread(self):
+        if self._pid != os.getpid():
+            # Forked (e.g. gunicorn --preload): the parent's thread and queue did not survive
+            self._queue = queue.Queue()
+            self._closed_lock = threading.Lock()
+            self._thread_lock = threading.Lock()
+            self._thread = None
+            self._pid = os.getpid()
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._serve, name=f'onnx-batcher-{self.name}', daemon=True
+                    )
+                    self._thread.start()
+
+    def _serve(self):
+        """Batcher loop: collect compatible calls, run once, scatter the rows back."""
+        carry = None
+        stop = False
+        while not stop:
+            first = carry if carry is not None else self._queue.get()
+            carry = None
+            if first is None:
+                return
+            batch, rows = [first], first.rows
+
+            # Merge what queued up meanwhile; never wait for more
+            while rows < self.max_batch_size:
+                try:
+                    call = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if call is None:
+                    stop = True
+                    break
+                if call.signature != first.signature or rows + call.rows > self.max_batch_size:
+                    carry = call
+                    break
+                batch.append(call)
+                rows += call.rows
+
+            self._execute(batch)
+
+    def _execute(self, batch):
+        try:
+            if len(batch) == 1:
+                call = batch[0]
+                outputs = self.session.run(call.output_names, call.feed)
+                call.result = [out.copy() for out in outputs] if self._reuses_outputs else outputs
+            else:
+                feed = {
+                    name: np.concatenate([call.feed[name] for call in batch], axis=0)
+                    for name in batch[0].feed
+                }
+                outputs = self.session.run(batch[0].output_names, feed)
+                start = 0
+                for call in batch:
+                    stop = start + call.rows
+                    # Copy the rows out when the session reuses its output buffers
+                    call.result = [
+                        out[start:stop].copy() if self._reuses_outputs else out[start:stop]
+                        for out in outputs
+                    ]
+                    start = stop
+        except Exception as e:
+            for call in batch:
+                call.error = e
+        finally:
+            for call in batch:
+                call.done.set()
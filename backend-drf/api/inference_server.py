@@ -0,0 +1,293 @@
+"""
+Inference Server - Shared Out-of-Process ONNX Inference over a Unix Socket
+
+By default every gunicorn worker loads its own ONNX sessions in MLModelManager,
+so model memory is paid once per worker. With settings.INFERENCE_SERVER['SOCKET']
+set, the sessions live in a single local process instead:
+
+    gunicorn worker ──RemoteSession.run()──> unix socket ──> inference server
+    (no onnxruntime sessions)                                (MLModelManager, local)
+
+Start the server next to the web workers:
+    python manage.py run_inference_server
+    INFERENCE_SOCKET=/tmp/neurostock-inference.sock gunicorn stock_prediction_main.wsgi:application
+
+Wire format (both directions), no pickling:
+    [4-byte big-endian header length][JSON header][raw array buffers...]
+The header lists each array's name, dtype and shape; the buffers follow in the same
+order. Arrays are sent straight from their memory with sendmsg() and received with
+recv_into() into preallocated numpy arrays.
+
+Requests:
+    {"op": "describe", "architecture": "lstm", "kind": "sequence" | "step" | "horizon", "version": ""}
+    {"op": "run", "architecture": ..., "kind": ..., "version": ..., "outputs": [...] | null, "arrays": [...]}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+
+MODEL_KINDS = ('sequence', 'step', 'horizon')
+
+# Mirrors onnxruntime.NodeArg for the attributes used by the app
+NodeArg = namedtuple('NodeArg', ['name', 'shape', 'type'])
+
+_HEADER_LEN = struct.Struct('>I')
+
+
+def _send_message(sock, header, arrays=()):
+    """Send a JSON header followed by the raw bytes of each array."""
+    arrays = [np.ascontiguousarray(a) for a in arrays]
+    header = dict(header, arrays=[
+        {'name': name, 'dtype': a.dtype.str, 'shape': list(a.shape)}
+        for name, a in zip(header.get('arrays', [None] * len(arrays)), arrays)
+    ])
+    payload = json.dumps(header).encode()
+    buffers = [_HEADER_LEN.pack(len(payload)), payload] + [
+        memoryview(a.reshape(-1).view(np.uint8)) for a in arrays if a.size
+    ]
+    while buffers:
+        sent = sock.sendmsg(buffers)
+        # Drop fully sent buffers, trim the partially sent one
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers[0])
+            buffers.pop(0)
+        if buffers and sent:
+            buffers[0] = memoryview(buffers[0])[sent:]
+
+
+def _recv_into(sock, view):
+    while len(view):
+        n = sock.recv_into(view)
+        if n == 0:
+            raise ConnectionError('Inference socket closed mid-message')
+        view = view[n:]
+
+
+def _recv_message(sock):
+    """
+    Receive one message.
+
+    Returns:
+        tuple: (header dict, list of np.ndarray) or (None, []) if the peer closed cleanly
+    """
+    prefix = bytearray(_HEADER_LEN.size)
+    n = sock.recv_into(prefix)
+    if n == 0:
+        return None, []
+    _recv_into(sock, memoryview(prefix)[n:])
+    payload = bytearray(_HEADER_LEN.unpack(prefix)[0])
+    _recv_into(sock, memoryview(payload))
+    header = json.loads(payload)
+
+    arrays = []
+    for spec in header['arrays']:
+        a = np.empty(spec['shape'], dtype=np.dtype(spec['dtype']))
+        if a.size:
+            _recv_into(sock, memoryview(a.reshape(-1).view(np.uint8)))
+        arrays.append(a)
+    return header, arrays
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class RemoteSession:
+    """
+    InferenceSession stand-in that forwards run() to the inference server.
+
+    Each thread keeps its own connection, so concurrent requests in a worker do not
+    serialize on one socket.
+    """
+
+    def __init__(self, socket_path, architecture, kind, inputs, outputs, version='', timeout=120.0):
+        self.socket_path = socket_path
+        self.architecture = architecture
+        self.kind = kind
+        self.version = version
+        self.timeout = timeout
+        self._inputs = inputs
+        self._outputs = outputs
+        self._local = threading.local()
+
+    @classmethod
+    def connect(cls, socket_path, architecture, kind, version='', timeout=120.0):
+        """
+        Describe a model on the server and return a session proxy for it.
+
+        Returns:
+            RemoteSession | None: Proxy, or None if the server has no such model file
+
+        Raises:
+            RuntimeError: If the server is unreachable or fails to load the model
+        """
+        header, _ = _request(socket_path, timeout, {
+            'op': 'describe', 'architecture': architecture, 'kind': kind, 'version': version,
+        })
+        if not header['available']:
+            return None
+        return cls(
+            socket_path, architecture, kind,
+            inputs=[NodeArg(*arg) for arg in header['inputs']],
+            outputs=[NodeArg(*arg) for arg in header['outputs']],
+            version=version,
+            timeout=timeout,
+        )
+
+    def get_inputs(self):
+        return self._inputs
+
+    def get_outputs(self):
+        return self._outputs
+
+    def run(self, output_names, input_feed, run_options=None):
+        """Run the remote session; same contract as ort.InferenceSession.run."""
+        names = list(input_feed)
+        header = {
+            'op': 'run', 'architecture': self.architecture, 'kind': self.kind,
+            'version': self.version,
+            'outputs': list(output_names) if output_names else None, 'arrays': names,
+        }
+        sock = self._socket()
+        try:
+            _send_message(sock, header, [input_feed[name] for name in names])
+            reply, arrays = _recv_message(sock)
+        except OSError:
+            # Drop the broken connection; the next call reconnects
+            self._local.sock = None
+            sock.close()
+            raise
+        if reply is None:
+            self._local.sock = None
+            raise ConnectionError('Inference server closed the connection')
+        _raise_for_error(reply)
+        return arrays
+
+    def _socket(self):
+        sock = getattr(self._local, 'sock', None)
+        # A connection inherited across fork would be shared with the parent
+        if sock is None or self._local.pid != os.getpid():
+            sock = _open_socket(self.socket_path, self.timeout)
+            self._local.sock = sock
+            self._local.pid = os.getpid()
+        return sock
+
+
+def _open_socket(socket_path, timeout):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError as e:
+        sock.close()
+        raise RuntimeError(
+            f"Inference server not reachable at {socket_path}: {str(e)}. "
+            f"Start it with: python manage.py run_inference_server"
+        )
+    return sock
+
+
+def _request(socket_path, timeout, header, arrays=()):
+    """One-shot request on a fresh connection (used for describe)."""
+    sock = _open_socket(socket_path, timeout)
+    try:
+        _send_message(sock, header, arrays)
+        reply, out = _recv_message(sock)
+    finally:
+        sock.close()
+    if reply is None:
+        raise ConnectionError('Inference server closed the connection')
+    _raise_for_error(reply)
+    return reply, out
+
+
+def _raise_for_error(reply):
+    if not reply.get('ok'):
+        raise RuntimeError(f"Inference server error: {reply['error']}")
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class _InferenceHandler(socketserver.BaseRequestHandler):
+    """Serves requests on one connection until the client disconnects."""
+
+    def handle(self):
+        while True:
+            try:
+                header, arrays = _recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            if header is None:
+                return
+            try:
+                reply, out = self.server.dispatch(header, arrays)
+            except Exception as e:
+                reply, out = {'ok': False, 'error': f'{type(e).__name__}: {str(e)}'}, []
+            try:
+                _send_message(self.request, reply, out)
+            except OSError:
+                return
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Threaded Unix socket server owning the process's ONNX sessions.
+
+    Sessions come from a local MLModelManager, so concurrent requests from all web
+    workers also share forward passes through its BatchingSession.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, manager):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _InferenceHandler)
+        self.manager = manager
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+    def get_session(self, architecture, kind, version=''):
+        if kind == 'sequence':
+            return self.manager.get_model(architecture=architecture, version=version)
+        if kind == 'step':
+            return self.manager.get_step_model(architecture=architecture, version=version)
+        if kind == 'horizon':
+            return self.manager.get_horizon_model(architecture=architecture, version=version)
+        raise ValueError(f"Unknown model kind '{kind}'. Supported: {', '.join(MODEL_KINDS)}")
+
+    def dispatch(self, header, arrays):
+        """Handle one decoded request and return (reply header, output arrays)."""
+        session = self.get_session(header['architecture'], header['kind'], header.get('version', ''))
+        if header['op'] == 'describe':
+            if session is None:
+                return {'ok': True, 'available': False}, []
+            return {
+                'ok': True, 'available': True,
+                'inputs': [[i.name, i.shape, i.type] for i in session.get_inputs()],
+                'outputs': [[o.name, o.shape, o.type] for o in session.get_outputs()],
+            }, []
+
+        if header['op'] == 'run':
+            if session is None:
+                raise FileNotFoundError(
+                    f"No {header['kind']} model for {header['architecture']} on the server"
+                )
+            feed = {spec['name']: a for spec, a in zip(header['arrays'], arrays)}
+            outputs = session.run(header['outputs'], feed)
+            return {'ok': True}, outputs
+
+        raise ValueError(f"Unknown op '{header['op']}'")
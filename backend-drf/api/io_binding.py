@@ -0,0 +1,154 @@
+"""
+IOBinding Sessions - Reusable Input/Output Buffers for ONNX Inference
+
+A plain InferenceSession.run(None, {name: X}) wraps X in a fresh OrtValue, lets
+onnxruntime allocate every output and copies the outputs into new numpy arrays.
+Recursive forecasting repeats that thousands of times per request with identical
+shapes. BoundSession runs through onnxruntime IOBinding instead:
+
+- Outputs are written straight into numpy buffers preallocated per input shape.
+- C-contiguous inputs of the right dtype are bound in place (no copy); the binding
+  is only refreshed when the caller passes a different array. Other inputs are
+  copied into a preallocated buffer, and so are inputs that overlap one of the
+  binding's own output buffers (recurrent states fed back by the step loop), so no
+  kernel ever writes an output over an input it has not read yet.
+- Bindings and buffers live in a thread-local pool keyed by (output names, input
+  shapes), so concurrent threads never share buffers. Each thread keeps at most
+  max_shapes entries (least recently used are dropped).
+
+The returned arrays are the pooled buffers: they stay valid until the same thread
+runs the same input shapes again. Callers consume or copy them before the next
+call (BatchingSession copies each caller's rows out).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class _Binding:
+    """One IOBinding with its bound input pointers and output buffers."""
+
+    __slots__ = ('io_binding', 'input_ptrs', 'input_buffers', 'outputs')
+
+    def __init__(self, io_binding):
+        self.io_binding = io_binding
+        self.input_ptrs = {}
+        self.input_buffers = {}
+        self.outputs = None
+
+
+class BoundSession:
+    """
+    InferenceSession proxy that runs through IOBinding with reused buffers.
+
+    Usage:
+        session = BoundSession(ort.InferenceSession(path))
+        y = session.run(None, {'x': X})[0]   # valid until this thread's next run
+    """
+
+    # Returned arrays are overwritten by later calls (see module docstring)
+    reuses_output_buffers = True
+
+    def __init__(self, session, max_shapes=8):
+        """
+        Args:
+            session (ort.InferenceSession): Local CPU session
+            max_shapes (int): Max distinct input shapes pooled per thread (default: 8)
+        """
+        self.session = session
+        self.max_shapes = max_shapes
+        self._input_types = {
+            i.name: _NUMPY_TYPES.get(i.type) for i in session.get_inputs()
+        }
+        self._output_names = [o.name for o in session.get_outputs()]
+        self._local = threading.local()
+
+    @staticmethod
+    def supports(session):
+        """True for local sessions whose inputs all have numpy-mappable tensor types."""
+        return hasattr(session, 'io_binding') and all(
+            i.type in _NUMPY_TYPES for i in session.get_inputs()
+        )
+
+    def get_inputs(self):
+        return self.session.get_inputs()
+
+    def get_outputs(self):
+        return self.session.get_outputs()
+
+    def __getattr__(self, attr):
+        return getattr(self.session, attr)
+
+    def run(self, output_names, input_feed, run_options=None):
+        """
+        Run the session with pooled buffers; same contract as ort.InferenceSession.run.
+
+        Returns:
+            list[np.ndarray]: Output buffers, reused by this thread's next call with
+                the same input shapes
+        """
+        names = tuple(output_names) if output_names else tuple(self._output_names)
+        key = (names, tuple((name, arr.shape) for name, arr in input_feed.items()))
+        binding = self._binding(key)
+
+        outputs = binding.outputs or ()
+        for name, arr in input_feed.items():
+            dtype = self._input_types[name]
+            fed_back = any(np.may_share_memory(arr, out) for out in outputs)
+            if fed_back or not (arr.dtype == dtype and arr.flags.c_contiguous):
+                buffer = binding.input_buffers.get(name)
+                if buffer is None:
+                    buffer = binding.input_buffers[name] = np.empty(arr.shape, dtype=dtype)
+                np.copyto(buffer, arr, casting='unsafe')
+                arr = buffer
+            ptr = arr.ctypes.data
+            if binding.input_ptrs.get(name) != ptr:
+                binding.io_binding.bind_input(name, 'cpu', 0, dtype, arr.shape, ptr)
+                binding.input_ptrs[name] = ptr
+
+        if binding.outputs is None:
+            # First call for this shape: let onnxruntime size the outputs, then keep them
+            for name in names:
+                binding.io_binding.bind_output(name, 'cpu')
+            self.session.run_with_iobinding(binding.io_binding, run_options)
+            binding.outputs = [
+                np.array(out, copy=True) for out in binding.io_binding.copy_outputs_to_cpu()
+            ]
+            binding.io_binding.clear_binding_outputs()
+            for name, out in zip(names, binding.outputs):
+                binding.io_binding.bind_output(
+                    name, 'cpu', 0, out.dtype.type, out.shape, out.ctypes.data
+                )
+            return binding.outputs
+
+        self.session.run_with_iobinding(binding.io_binding, run_options)
+        return binding.outputs
+
+    def _binding(self, key):
+        """Return this thread's binding for key, creating it and evicting the oldest."""
+        local = self._local
+        # Bindings inherited across fork belong to the parent's threads
+        if getattr(local, 'pid', None) != os.getpid():
+            local.pool = OrderedDict()
+            local.pid = os.getpid()
+        pool = local.pool
+        binding = pool.get(key)
+        if binding is None:
+            binding = pool[key] = _Binding(self.session.io_binding())
+            while len(pool) > self.max_shapes:
+                pool.popitem(last=False)
+        else:
+            pool.move_to_end(key)
+        return binding
+
+
+_NUMPY_TYPES = {
+    'tensor(float)': np.float32,
+    'tensor(double)': np.float64,
+    'tensor(int64)': np.int64,
+    'tensor(int32)': np.int32,
+    'tensor(bool)': np.bool_,
+}
@@ -0,0 +1,106 @@
+"""
+Django Management Command: Benchmark Sequence Building
+
+Compares the backtest window builder before and after the switch to strided views:
+
+- loop: the previous create_sequences (Python loop of slices + np.array) followed by
+  the .astype('float32') the model feed needed
+- view: data_pipeline.create_sequences on the float32 series (sliding window view)
+
+The workload is the backtest input of run_backtest (last 100 training days + the 30%
+test split) for 10-, 20- and 30-year daily histories. Time is the median over repeats;
+peak memory is the largest traced allocation while building (tracemalloc).
+
+Usage:
+    python manage.py benchmark_sequences
+    python manage.py benchmark_sequences --years 10,20,30,50 --repeats 50
+"""
+
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from api.data_pipeline import create_sequences
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _create_sequences_loop(data, sequence_length=100):
+    """The previous loop-based builder, kept as the benchmark reference."""
+    X, y = [], []
+    for i in range(sequence_length, data.shape[0]):
+        X.append(data[i - sequence_length:i, 0])
+        y.append(data[i, 0])
+    X = np.array(X)
+    y = np.array(y)
+    return X.reshape(X.shape[0], X.shape[1], 1), y
+
+
+class Command(BaseCommand):
+    help = 'Benchmark backtest sequence building: loop + copy vs. strided view'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', default='10,20,30',
+                            help='Comma-separated history lengths in years')
+        parser.add_argument('--sequence-length', type=int, default=100)
+        parser.add_argument('--repeats', type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('Benchmarking sequence building'))
+        sequence_length = options['sequence_length']
+        repeats = options['repeats']
+
+        self.stdout.write(
+            f"\n{'years':>6}{'windows':>9}{'loop ms':>10}{'view ms':>10}"
+            f"{'loop peak MB':>14}{'view peak MB':>14}"
+        )
+        for years in [int(y) for y in options['years'].split(',')]:
+            days = years * TRADING_DAYS_PER_YEAR
+            # Backtest input: last sequence_length training days + the test split
+            n = sequence_length + (days - int(days * 0.7))
+            scaled = np.random.default_rng(0).random((n, 1))
+
+            def loop():
+                X, y = _create_sequences_loop(scaled, sequence_length)
+                return X.astype('float32'), y
+
+            def view():
+                return create_sequences(scaled.astype('float32'), sequence_length)
+
+            X_loop, _ = loop()
+            X_view, _ = view()
+            assert np.array_equal(X_loop, X_view)
+
+            self.stdout.write(
+                f'{years:>6}{len(X_view):>9}'
+                f'{self._time_ms(loop, repeats):>10.2f}{self._time_ms(view, repeats):>10.3f}'
+                f'{self._peak_mb(loop):>14.2f}{self._peak_mb(view):>14.3f}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            '\n✓ view windows are read-only and share memory with the scaled series'
+        ))
+
+    @staticmethod
+    def _time_ms(build, repeats):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            build()
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
+
+    @staticmethod
+    def _peak_mb(build):
+        tracemalloc.start()
+        try:
+            result = build()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del result
+        return peak / 2 ** 20
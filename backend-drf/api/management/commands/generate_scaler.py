@@ -5,23 +5,39 @@ This command generates the training scaler by downloading AAPL historical data
 and fitting a MinMaxScaler on the first 70% (training portion only).
 
 This scaler is then used across all predictions to prevent data leakage.
+It is saved as a small AffineScaler JSON (see api/scaling.py), so inference
+never imports sklearn or unpickles anything.
 
 Usage:
     python manage.py generate_scaler
+    python manage.py generate_scaler --convert   # existing .pkl MinMaxScaler -> JSON
 """
 
 from django.core.management.base import BaseCommand
 import yfinance as yf
 from datetime import datetime
-from sklearn.preprocessing import MinMaxScaler
-import joblib
+import numpy as np
 import pandas as pd
 
+from api.ml_manager import MLModelManager
+from api.scaling import AffineScaler
+
 
 class Command(BaseCommand):
     help = 'Generate training scaler from AAPL data (70% split, no data leakage)'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert', nargs='?', const=MLModelManager.LEGACY_SCALER_PATH, default=None,
+            metavar='PKL',
+            help=f'Convert a pickled MinMaxScaler to JSON instead of refitting '
+                 f'(default: {MLModelManager.LEGACY_SCALER_PATH})',
+        )
+
     def handle(self, *args, **kwargs):
+        if kwargs['convert']:
+            return self._convert(kwargs['convert'])
+
         self.stdout.write(self.style.MIGRATE_HEADING('Generating Training Scaler'))
         self.stdout.write('This scaler will be used for all predictions to prevent data leakage.\n')
 
@@ -62,9 +78,8 @@ class Command(BaseCommand):
             ))
 
             # 3. Fit scaler ONLY on training data
-            self.stdout.write('\nStep 3: Fitting MinMaxScaler on training data only...')
-            scaler = MinMaxScaler(feature_range=(0, 1))
-            scaler.fit(training_data.values.reshape(-1, 1))
+            self.stdout.write('\nStep 3: Fitting min-max scaler on training data only...')
+            scaler = AffineScaler.fit(training_data.values.reshape(-1, 1), feature_range=(0, 1))
 
             data_min = scaler.data_min_[0]
             data_max = scaler.data_max_[0]
@@ -78,8 +93,8 @@ class Command(BaseCommand):
 
             # 4. Save scaler
             self.stdout.write('\nStep 4: Saving scaler to disk...')
-            scaler_path = 'stock_prediction_scaler.pkl'
-            joblib.dump(scaler, scaler_path)
+            scaler_path = MLModelManager.SCALER_PATH
+            scaler.save(scaler_path)
 
             self.stdout.write(self.style.SUCCESS(
                 f'  [OK] Scaler saved to: {scaler_path}'
@@ -87,7 +102,7 @@ class Command(BaseCommand):
 
             # 5. Verification
             self.stdout.write('\nStep 5: Verifying scaler...')
-            loaded_scaler = joblib.load(scaler_path)
+            loaded_scaler = AffineScaler.load(scaler_path)
 
             test_value = training_data.values[0].reshape(-1, 1)
             scaled = loaded_scaler.transform(test_value)
@@ -117,3 +132,38 @@ class Command(BaseCommand):
             ))
             import traceback
             traceback.print_exc()
+
+    def _convert(self, pkl_path):
+        """Rewrite a pickled sklearn MinMaxScaler as AffineScaler JSON."""
+        import joblib
+        from sklearn.preprocessing import MinMaxScaler
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Converting Pickled Scaler'))
+        try:
+            sk_scaler = joblib.load(pkl_path)
+            if not isinstance(sk_scaler, MinMaxScaler):
+                raise TypeError(f'Expected MinMaxScaler, got {type(sk_scaler)}')
+
+            scaler = AffineScaler.from_sklearn(sk_scaler)
+            scaler_path = MLModelManager.SCALER_PATH
+            scaler.save(scaler_path)
+
+            # Both must agree on a sweep across (and beyond) the training range
+            probe = np.linspace(
+                sk_scaler.data_min_[0] * 0.5, sk_scaler.data_max_[0] * 2, 1000
+            ).reshape(-1, 1)
+            loaded = AffineScaler.load(scaler_path)
+            max_error = max(
+                np.abs(loaded.transform(probe) - sk_scaler.transform(probe)).max(),
+                np.abs(loaded.inverse_transform(probe) - sk_scaler.inverse_transform(probe)).max(),
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'  [OK] {pkl_path} -> {scaler_path} '
+                f'(range ${scaler.data_min_[0]:.2f} - ${scaler.data_max_[0]:.2f}, '
+                f'max deviation {max_error:.2e})'
+            ))
+            self.stdout.write(f'\nCommit the scaler: git add {scaler_path}\n')
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(
+                f'\n[ERROR] Error converting scaler: {str(e)}'
+            ))
@@ -0,0 +1,91 @@
+"""
+Django Management Command: Prefetch Prices
+
+Warms the local price store (api/price_store.py) so /predict/ requests are served
+without a full upstream download. Missing tickers are downloaded in full and stale
+ones from their last stored bar, in bulk requests of --batch-size tickers
+(yfinance/yahooquery fetch a whole batch over pooled connections).
+
+Tickers come from --tickers, a --file with one ticker per line ('#' comments allowed)
+and/or the --top most predicted tickers in PredictionRecord. Meant for a nightly job:
+tickers that fail are listed and counted, and the command only exits non-zero when
+nothing could be downloaded at all.
+
+Usage:
+    python manage.py prefetch_prices --top 500
+    python manage.py prefetch_prices --tickers AAPL,MSFT,NVDA
+    python manage.py prefetch_prices --file watchlist.txt --provider yahooquery
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from api.data_providers import YahooQueryProvider, YFinanceProvider
+from api.models import PredictionRecord
+from api.price_store import warm_history
+
+
+PROVIDERS = {
+    'yfinance': YFinanceProvider,
+    'yahooquery': YahooQueryProvider,
+}
+
+
+class Command(BaseCommand):
+    help = 'Warm the local price store for a watchlist or the most predicted tickers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickers', default='',
+                            help='Comma-separated ticker symbols')
+        parser.add_argument('--file', default=None,
+                            help='File with one ticker per line')
+        parser.add_argument('--top', type=int, default=0,
+                            help='Add the N most predicted tickers in PredictionRecord')
+        parser.add_argument('--years', type=int, default=10)
+        parser.add_argument('--provider', choices=sorted(PROVIDERS), default='yfinance')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Tickers per bulk download')
+
+    def handle(self, *args, **options):
+        tickers = self._tickers(options)
+        if not tickers:
+            raise CommandError('No tickers: pass --tickers, --file or --top.')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Prefetching {len(tickers)} tickers via {options['provider']}"
+        ))
+        start = time.perf_counter()
+        result = warm_history(
+            tickers, PROVIDERS[options['provider']](),
+            years=options['years'], batch_size=options['batch_size'],
+        )
+        elapsed = time.perf_counter() - start
+
+        for status in ('downloaded', 'refreshed', 'current'):
+            self.stdout.write(f'  {status:<11}{len(result[status]):>6}')
+        if result['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"  {'failed':<11}{len(result['failed']):>6}  {', '.join(result['failed'])}"
+            ))
+            if not result['downloaded'] and not result['refreshed']:
+                raise CommandError(
+                    f"Every download failed ({len(result['failed'])} tickers) after {elapsed:.1f}s"
+                )
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Price store warmed in {elapsed:.1f}s'))
+
+    @staticmethod
+    def _tickers(options):
+        tickers = options['tickers'].split(',')
+        if options['file']:
+            with open(options['file']) as f:
+                tickers += [line.split('#')[0] for line in f]
+        if options['top']:
+            tickers += (
+                PredictionRecord.objects.values('ticker')
+                .annotate(n=Count('id')).order_by('-n')
+                .values_list('ticker', flat=True)[:options['top']]
+            )
+        # Upper-case, drop blanks and duplicates, keep order
+        return list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
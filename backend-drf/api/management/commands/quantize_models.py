@@ -0,0 +1,267 @@
+"""
+Django Management Command: Quantize ONNX Models to INT8
+
+Produces dynamically quantized (INT8 weights, per-batch activation quantization)
+variants of the sequence models in MLModelManager.MODEL_PATHS, every version on disk,
+and only keeps a variant if it passes an accuracy gate. Step and horizon models are not
+quantized.
+
+The gate replays the /predict/ backtest (data_pipeline.run_backtest) with the fp32 and
+the INT8 model on a fixed offline price fixture and refuses the INT8 model when RMSE
+grows or R² drops past the thresholds. Latency and memory deltas are reported too.
+
+Accepted variants are written as <stem>_int8.onnx (<stem>_int8@<version>.onnx for
+versions). MLModelManager loads them for the architectures listed in
+ML_PREFER_QUANTIZED (e.g. ML_PREFER_QUANTIZED=lstm,gru).
+
+Requires the onnx package (pip install onnx), which is not needed at runtime.
+
+Usage:
+    python manage.py quantize_models
+    python manage.py quantize_models --architectures lstm --max-rmse-increase 0.02
+    python manage.py quantize_models --versions 2026-10-a   # '' or 'default' = default file
+    python manage.py quantize_models --fixture prices.csv   # CSV with a Close column
+"""
+
+import os
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from api.data_pipeline import run_backtest
+from api.ml_manager import MLModelManager
+from api.model_registry import versioned_path
+
+
+class Command(BaseCommand):
+    help = 'Quantize ONNX models to INT8 and keep them only if backtest accuracy holds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--architectures', default=None,
+                            help='Comma-separated architectures (default: all available)')
+        parser.add_argument('--versions', default=None,
+                            help="Comma-separated model versions, 'default' for the default file "
+                                 "(default: every version on disk)")
+        parser.add_argument('--fixture', default=None,
+                            help='CSV with a Close column (default: fixed synthetic 10-year series)')
+        parser.add_argument('--max-rmse-increase', type=float, default=0.05,
+                            help='Max relative RMSE increase vs fp32 (default: 0.05 = 5%%)')
+        parser.add_argument('--max-r2-drop', type=float, default=0.01,
+                            help='Max absolute R² drop vs fp32 (default: 0.01)')
+        parser.add_argument('--repeats', type=int, default=20,
+                            help='Timed runs per latency measurement (default: 20)')
+
+    def handle(self, *args, **options):
+        try:
+            import onnx
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+        except ImportError:
+            raise CommandError('The onnx package is required: pip install onnx')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Quantizing ONNX models to INT8'))
+
+        manager = MLModelManager.get_instance()
+        if options['architectures']:
+            architectures = options['architectures'].split(',')
+        else:
+            architectures = [a for a in manager.MODEL_PATHS if manager.is_architecture_available(a)]
+        close_prices = self._load_fixture(options['fixture'])
+        self.stdout.write(
+            f'Fixture: {len(close_prices)} days | gate: RMSE +{options["max_rmse_increase"]:.0%}, '
+            f'R² -{options["max_r2_drop"]}\n'
+        )
+
+        refused = []
+        for architecture, version in self._targets(manager, architectures, options['versions']):
+            label = f"{architecture.upper()}{'@' + version if version else ''}"
+            fp32_path = versioned_path(manager.MODEL_PATHS[architecture], version)
+            if not os.path.exists(fp32_path):
+                self.stdout.write(self.style.WARNING(f'  Skipping {label}: {fp32_path} not found'))
+                continue
+
+            self.stdout.write(self.style.MIGRATE_LABEL(label))
+            int8_path = manager.quantized_model_path(architecture, version)
+            tmp_fp32, tmp_int8 = f'{int8_path}.pre.tmp', f'{int8_path}.tmp'
+            try:
+                model = onnx.load(fp32_path)
+                inlined = _inline_loop_constants(model)
+                onnx.save(model, tmp_fp32)
+                quantize_dynamic(
+                    tmp_fp32, tmp_int8,
+                    weight_type=QuantType.QInt8,
+                    extra_options={'EnableSubgraph': True},
+                )
+                self.stdout.write(f'  Quantized ({inlined} loop weights inlined for subgraph MatMuls)')
+
+                fp32 = self._measure(fp32_path, close_prices, options['repeats'])
+                int8 = self._measure(tmp_int8, close_prices, options['repeats'])
+                self._report(fp32, int8)
+
+                rmse_limit = fp32['rmse'] * (1 + options['max_rmse_increase'])
+                r2_limit = fp32['r2'] - options['max_r2_drop']
+                if int8['rmse'] <= rmse_limit and int8['r2'] >= r2_limit:
+                    os.replace(tmp_int8, int8_path)
+                    self.stdout.write(self.style.SUCCESS(f'  ✓ Accepted: {int8_path}'))
+                else:
+                    refused.append(label)
+                    self.stdout.write(self.style.ERROR(
+                        f'  ✗ Refused: RMSE {int8["rmse"]:.4f} (limit {rmse_limit:.4f}), '
+                        f'R² {int8["r2"]:.4f} (limit {r2_limit:.4f})'
+                    ))
+            finally:
+                for path in (tmp_fp32, tmp_int8):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        self.stdout.write(
+            '\nEnable accepted variants with ML_PREFER_QUANTIZED=<architectures> '
+            '(e.g. ML_PREFER_QUANTIZED=lstm).'
+        )
+        if refused:
+            raise CommandError(f'Accuracy gate refused: {", ".join(refused)}')
+
+    def _targets(self, manager, architectures, versions):
+        """(architecture, version) pairs to quantize; '' is the default file."""
+        if versions is not None:
+            versions = ['' if v in ('', 'default') else v for v in versions.split(',')]
+        for architecture in architectures:
+            for version in versions if versions is not None else manager.list_versions(architecture):
+                yield architecture, version
+
+    def _measure(self, model_path, close_prices, repeats):
+        """Backtest accuracy, latency (full backtest and one 50-sample MC batch) and memory."""
+        import onnxruntime as ort
+
+        rss_before = _rss_bytes()
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = 1
+        sess_options.inter_op_num_threads = 1
+        session = ort.InferenceSession(
+            model_path, sess_options=sess_options, providers=['CPUExecutionProvider']
+        )
+        backtest = run_backtest(close_prices, session)
+        rss_after = _rss_bytes()
+
+        backtest_ms = []
+        for _ in range(max(1, repeats // 4)):
+            start = time.perf_counter()
+            run_backtest(close_prices, session)
+            backtest_ms.append((time.perf_counter() - start) * 1000)
+
+        input_name = session.get_inputs()[0].name
+        mc_batch = np.random.default_rng(0).random((50, 100, 1), dtype=np.float32)
+        mc_ms = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            session.run(None, {input_name: mc_batch})
+            mc_ms.append((time.perf_counter() - start) * 1000)
+
+        metrics = backtest['metrics']
+        return {
+            'rmse': metrics['rmse'],
+            'r2': metrics['r2'],
+            'backtest_ms': statistics.median(backtest_ms),
+            'mc_batch_ms': statistics.median(mc_ms),
+            'file_kb': os.path.getsize(model_path) / 1024,
+            'rss_mb': (rss_after - rss_before) / 2 ** 20 if rss_before is not None else None,
+        }
+
+    def _report(self, fp32, int8):
+        rows = [
+            ('RMSE', 'rmse', '{:.4f}'),
+            ('R²', 'r2', '{:.4f}'),
+            ('backtest ms', 'backtest_ms', '{:.1f}'),
+            ('MC batch(50) ms', 'mc_batch_ms', '{:.1f}'),
+            ('file KB', 'file_kb', '{:.0f}'),
+            ('session RSS MB', 'rss_mb', '{:.1f}'),
+        ]
+        self.stdout.write(f"  {'':<17}{'fp32':>10}{'int8':>10}{'delta':>10}")
+        for label, key, fmt in rows:
+            if fp32[key] is None or int8[key] is None:
+                continue
+            delta = (int8[key] - fp32[key]) / fp32[key] if fp32[key] else 0.0
+            self.stdout.write(
+                f"  {label:<17}{fmt.format(fp32[key]):>10}{fmt.format(int8[key]):>10}{delta:>+10.1%}"
+            )
+
+    def _load_fixture(self, path):
+        if path:
+            return pd.read_csv(path)['Close'].astype(float).reset_index(drop=True)
+
+        # Fixed synthetic geometric random walk (~10 trading years), identical on every run
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0.0003, 0.015, 2520)
+        return pd.Series(120.0 * np.exp(np.cumsum(returns)))
+
+
+def _inline_loop_constants(model):
+    """
+    Move constant loop-carried weights into Loop bodies so subgraph MatMuls can be quantized.
+
+    tf2onnx passes recurrent kernels into the while-loop body as pass-through loop state,
+    which quantize_dynamic cannot see as initializers. Each pass-through state fed from an
+    initializer becomes a body initializer; the state is dropped when its final value is
+    unused, and orphaned outer initializers are removed.
+
+    Returns:
+        int: Number of states inlined
+    """
+    import onnx
+
+    graph = model.graph
+    initializers = {init.name: init for init in graph.initializer}
+    inlined = 0
+    for node in graph.node:
+        if node.op_type != 'Loop':
+            continue
+        body = next(a.g for a in node.attribute if a.name == 'body')
+        # Loop inputs: (M, cond, states...); body inputs: (iter, cond, states...);
+        # body outputs: (cond, states..., scans...); Loop outputs: (states..., scans...)
+        for s in reversed(range(len(node.input) - 2)):
+            state_name, outer_name = body.input[2 + s].name, node.input[2 + s]
+            if outer_name not in initializers or body.output[1 + s].name != state_name:
+                continue
+            const = onnx.TensorProto()
+            const.CopyFrom(initializers[outer_name])
+            const.name = f'{state_name}__const'
+            body.initializer.append(const)
+            for body_node in body.node:
+                for i, name in enumerate(body_node.input):
+                    if name == state_name:
+                        body_node.input[i] = const.name
+            if _count_uses(graph, node.output[s]) == 0:
+                del body.input[2 + s]
+                del body.output[1 + s]
+                del node.input[2 + s]
+                del node.output[s]
+            inlined += 1
+
+    for name, init in initializers.items():
+        if _count_uses(graph, name) == 0:
+            graph.initializer.remove(init)
+    return inlined
+
+
+def _count_uses(graph, name):
+    """Count references to a value in a graph, its subgraphs and its outputs."""
+    import onnx
+
+    uses = sum(o.name == name for o in graph.output)
+    for node in graph.node:
+        uses += list(node.input).count(name)
+        for attr in node.attribute:
+            if attr.type == onnx.AttributeProto.GRAPH:
+                uses += _count_uses(attr.g, name)
+    return uses
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,60 @@
+"""
+Django Management Command: Run the Shared Inference Server
+
+Loads the ONNX sessions once and serves them to every web worker on the host
+over a Unix socket (see api/inference_server.py). Web workers use it when the
+INFERENCE_SOCKET environment variable points at the same socket path.
+
+Usage:
+    python manage.py run_inference_server
+    python manage.py run_inference_server --socket /tmp/neurostock-inference.sock --preload lstm,gru
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.inference_server import InferenceServer
+from api.ml_manager import MLModelManager
+
+
+DEFAULT_SOCKET = '/tmp/neurostock-inference.sock'
+
+
+class Command(BaseCommand):
+    help = 'Serve ONNX inference to all web workers over a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket', default=settings.INFERENCE_SERVER.get('SOCKET') or DEFAULT_SOCKET,
+            help=f'Unix socket path (default: INFERENCE_SOCKET or {DEFAULT_SOCKET})',
+        )
+        parser.add_argument(
+            '--preload', default='lstm',
+            help='Comma-separated architectures to load before accepting connections',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('Starting inference server'))
+
+        # This process owns the sessions: always load them locally
+        manager = MLModelManager.get_instance()
+        manager.inference_socket = None
+
+        for architecture in filter(None, options['preload'].split(',')):
+            if not manager.is_architecture_available(architecture):
+                self.stdout.write(self.style.WARNING(
+                    f'  Skipping {architecture}: model file not found'
+                ))
+                continue
+            manager.get_model(architecture=architecture)
+            manager.get_step_model(architecture=architecture)
+            manager.get_horizon_model(architecture=architecture)
+
+        server = InferenceServer(options['socket'], manager)
+        self.stdout.write(self.style.SUCCESS(f'✓ Listening on {options["socket"]}'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('\nShutting down')
+        finally:
+            server.server_close()
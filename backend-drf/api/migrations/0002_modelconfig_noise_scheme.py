@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelconfig',
+            name='noise_scheme',
+            field=models.CharField(choices=[('gaussian', 'Gaussian'), ('antithetic', 'Antithetic pairs'), ('sobol', 'Sobol (quasi-random)'), ('halton', 'Halton (quasi-random)'), ('lhs', 'Latin hypercube')], default='gaussian', max_length=20),
+        ),
+    ]
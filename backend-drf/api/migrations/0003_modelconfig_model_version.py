@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 00:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_modelconfig_noise_scheme'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelconfig',
+            name='model_version',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+    ]
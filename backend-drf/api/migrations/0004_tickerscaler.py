@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_modelconfig_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TickerScaler',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=20)),
+                ('scope', models.CharField(choices=[('backtest', 'Backtest training split'), ('forecast', 'Forecast (expanding history)')], max_length=20)),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('last_close', models.FloatField()),
+                ('n_bars', models.PositiveIntegerField()),
+                ('data_min', models.FloatField()),
+                ('data_max', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('ticker', 'scope')},
+            },
+        ),
+    ]
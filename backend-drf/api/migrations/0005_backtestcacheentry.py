@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_tickerscaler'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacktestCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=20)),
+                ('architecture', models.CharField(choices=[('lstm', 'LSTM'), ('gru', 'GRU'), ('bilstm', 'Bidirectional LSTM')], max_length=20)),
+                ('model_version', models.CharField(blank=True, default='', max_length=50)),
+                ('sequence_length', models.PositiveIntegerField()),
+                ('model_fingerprint', models.CharField(max_length=200)),
+                ('scale', models.FloatField()),
+                ('offset', models.FloatField()),
+                ('payload', models.BinaryField()),
+                ('n_windows', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('ticker', 'architecture', 'model_version', 'sequence_length')},
+            },
+        ),
+    ]
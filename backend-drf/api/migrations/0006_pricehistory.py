@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_backtestcacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=20)),
+                ('source', models.CharField(max_length=20)),
+                ('history_start', models.DateField()),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('n_bars', models.PositiveIntegerField()),
+                ('payload', models.BinaryField()),
+                ('refreshed_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('ticker', 'source')},
+            },
+        ),
+    ]
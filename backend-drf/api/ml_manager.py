@@ -1,20 +1,65 @@
 """
 ML Model Manager - Singleton Pattern for Multi-Model and Scaler Lifecycle Management
 
-Supports multiple ONNX model variants (LSTM, GRU, BiLSTM) with per-architecture caching.
-Models are loaded lazily on first use and cached in memory for all subsequent requests.
+Supports multiple ONNX model variants (LSTM, GRU, BiLSTM), each with optional
+versions (<stem>@<version>.onnx). Sessions are loaded lazily on first use and kept in
+a ModelRegistry (see model_registry.py) that hot-reloads changed files and evicts
+least recently used sessions beyond settings.MODEL_REGISTRY['MEMORY_BUDGET_MB'].
+
+Architectures listed in settings.ML_PREFER_QUANTIZED load the INT8 variant of their
+sequence model (<stem>_int8.onnx or <stem>_int8@<version>.onnx, produced by
+`manage.py quantize_models`) when it exists. The preference covers the sequence model
+only: step and horizon models always load their fp32 files.
 
 Model files (place in backend-drf/):
   - stock_prediction_model.onnx          (LSTM — default, always present)
   - stock_prediction_model_gru.onnx      (GRU — optional, train locally)
   - stock_prediction_model_bilstm.onnx   (Bidirectional LSTM — optional, train locally)
+
+Optional stateful step models (see convert_to_onnx.py), used for O(1)-per-day
+recursive forecasting when present and the architecture is in settings.ML_STEP_MODELS:
+  - stock_prediction_model_step.onnx     (LSTM)
+  - stock_prediction_model_gru_step.onnx (GRU)
+
+Optional in-graph horizon models (ONNX Loop around the sequence model), used to run
+the whole recursive forecast in one call when no step model is present:
+  - stock_prediction_model_horizon.onnx, _gru_horizon.onnx, _bilstm_horizon.onnx
+
+With settings.INFERENCE_BATCHING enabled (threaded workers only), sequence and step
+sessions are served through a BatchingSession (see inference_dispatcher.py) so
+concurrent requests share forward passes.
+
+With settings.INFERENCE_IO_BINDING enabled, local sequence and step sessions run
+through IOBinding with thread-local preallocated buffers (see io_binding.py), so the
+per-day runs of recursive forecasting do not allocate. It is off by default: with
+the current small models the allocations it saves are not measurable next to the
+forward pass.
+
+With settings.INFERENCE_SERVER['SOCKET'] set, no sessions are created in this
+process: get_model() and friends return RemoteSession proxies to the shared
+inference server (see inference_server.py), so model memory is paid once per host.
+
+Sessions are created from the settings.ONNX_SESSION_PROFILES profile selected by
+settings.ONNX_SESSION_PROFILE (optimization level, threads, execution mode, memory
+arena/pattern). The optimized graph is saved to ONNX_OPTIMIZED_MODEL_DIR keyed by
+model hash, onnxruntime version and optimization level, so later boots load it
+without re-optimizing.
+
+preload() loads every available model and the scaler up front and runs a warmup
+batch through each session; wsgi.py calls it at boot when settings.ML_PRELOAD is set.
 """
 
+import hashlib
 import threading
 import os
-import onnxruntime as ort
-from sklearn.preprocessing import MinMaxScaler
-import joblib
+import time
+import numpy as np
+
+from .inference_dispatcher import BatchingSession
+from .io_binding import BoundSession
+from .inference_server import RemoteSession
+from .model_registry import ModelRegistry, estimate_session_bytes, list_versions, versioned_path
+from .scaling import AffineScaler
 
 
 class MLModelManager:
@@ -35,15 +80,42 @@ class MLModelManager:
         'gru': 'stock_prediction_model_gru.onnx',
         'bilstm': 'stock_prediction_model_bilstm.onnx',
     }
-    SCALER_PATH = 'stock_prediction_scaler.pkl'
+    # Bidirectional models need the full backward pass and have no step variant
+    STEP_MODEL_PATHS = {
+        'lstm': 'stock_prediction_model_step.onnx',
+        'gru': 'stock_prediction_model_gru_step.onnx',
+    }
+    HORIZON_MODEL_PATHS = {
+        'lstm': 'stock_prediction_model_horizon.onnx',
+        'gru': 'stock_prediction_model_gru_horizon.onnx',
+        'bilstm': 'stock_prediction_model_bilstm_horizon.onnx',
+    }
+    # AffineScaler JSON; the pickled MinMaxScaler is only read if the JSON is missing
+    SCALER_PATH = 'stock_prediction_scaler.json'
+    LEGACY_SCALER_PATH = 'stock_prediction_scaler.pkl'
+    # INT8 variants written by `manage.py quantize_models`: <stem>_int8.onnx
+    QUANTIZED_SUFFIX = '_int8'
+
+    # Session profile values -> onnxruntime enum member names
+    OPTIMIZATION_LEVELS = {
+        'disable': 'ORT_DISABLE_ALL',
+        'basic': 'ORT_ENABLE_BASIC',
+        'extended': 'ORT_ENABLE_EXTENDED',
+        'all': 'ORT_ENABLE_ALL',
+    }
+    EXECUTION_MODES = {
+        'sequential': 'ORT_SEQUENTIAL',
+        'parallel': 'ORT_PARALLEL',
+    }
 
     def __init__(self):
         if MLModelManager._instance is not None:
             raise Exception(
                 "MLModelManager is a singleton. Use get_instance() instead."
             )
-        self._models = {}
         self._training_scaler = None
+        self.inference_socket, self.inference_timeout = self._inference_server_config()
+        self._registry = ModelRegistry(self._load_session, **self._registry_config())
 
     @classmethod
     def get_instance(cls):
@@ -54,12 +126,13 @@ class MLModelManager:
                     cls._instance = cls()
         return cls._instance
 
-    def get_model(self, architecture='lstm'):
+    def get_model(self, architecture='lstm', version=''):
         """
         Get ONNX model for the given architecture, loading from disk if not cached.
 
         Args:
             architecture (str): One of 'lstm', 'gru', 'bilstm' (default: 'lstm')
+            version (str): Model version, see model_registry.py (default: '' = default file)
 
         Returns:
             ort.InferenceSession: Loaded ONNX inference session
@@ -68,54 +141,326 @@ class MLModelManager:
             FileNotFoundError: If model file doesn't exist
             RuntimeError: If model loading fails
         """
-        if architecture not in self._models:
-            with self._lock:
-                if architecture not in self._models:
-                    model_path = self.MODEL_PATHS.get(architecture)
-                    if not model_path:
-                        raise ValueError(
-                            f"Unknown architecture '{architecture}'. "
-                            f"Supported: {', '.join(self.MODEL_PATHS.keys())}"
-                        )
-                    if not os.path.exists(model_path):
-                        if architecture == 'lstm':
-                            raise FileNotFoundError(
-                                f"Model file not found: {model_path}. "
-                                f"Ensure the model is in the backend-drf/ directory."
-                            )
-                        else:
-                            raise FileNotFoundError(
-                                f"Model file '{model_path}' not found. "
-                                f"Train a {architecture.upper()} model locally using the notebook "
-                                f"in Resources_tf/ and place the exported .onnx file here."
-                            )
-                    try:
-                        sess_options = ort.SessionOptions()
-                        sess_options.inter_op_num_threads = 1
-                        sess_options.intra_op_num_threads = 1
-                        model = ort.InferenceSession(
-                            model_path,
-                            sess_options=sess_options,
-                            providers=['CPUExecutionProvider'],
-                        )
-                        input_shape = model.get_inputs()[0].shape
-                        print(
-                            f"✓ ONNX {architecture.upper()} model loaded from {model_path} "
-                            f"| input shape: {input_shape}"
-                        )
-                        self._models[architecture] = model
-                    except Exception as e:
-                        raise RuntimeError(
-                            f"Failed to load {architecture} model from {model_path}: {str(e)}"
-                        )
-        return self._models[architecture]
+        model_path = self.model_path(architecture, version)
+        return self._registry.get(('sequence', architecture, version), model_path)
+
+    def model_path(self, architecture='lstm', version=''):
+        """
+        Resolve the file get_model() loads: version file, or its INT8 variant if preferred.
+
+        Raises:
+            ValueError: If the architecture is unknown
+            FileNotFoundError: If model file doesn't exist
+        """
+        model_path = self.MODEL_PATHS.get(architecture)
+        if not model_path:
+            raise ValueError(
+                f"Unknown architecture '{architecture}'. "
+                f"Supported: {', '.join(self.MODEL_PATHS.keys())}"
+            )
+        model_path = versioned_path(model_path, version)
+        if not os.path.exists(model_path):
+            if version:
+                raise FileNotFoundError(
+                    f"Model version '{version}' for {architecture.upper()} not found: {model_path}. "
+                    f"Available: {', '.join(v or 'default' for v in self.list_versions(architecture)) or 'none'}"
+                )
+            if architecture == 'lstm':
+                raise FileNotFoundError(
+                    f"Model file not found: {model_path}. "
+                    f"Ensure the model is in the backend-drf/ directory."
+                )
+            else:
+                raise FileNotFoundError(
+                    f"Model file '{model_path}' not found. "
+                    f"Train a {architecture.upper()} model locally using the notebook "
+                    f"in Resources_tf/ and place the exported .onnx file here."
+                )
+        if architecture in self._prefer_quantized():
+            quantized = self.quantized_model_path(architecture, version)
+            if os.path.exists(quantized):
+                model_path = quantized
+        return model_path
+
+    def model_fingerprint(self, architecture='lstm', version=''):
+        """Identity of the file get_model() loads (name, mtime, size); changes on retrain or swap."""
+        model_path = self.model_path(architecture, version)
+        st = os.stat(model_path)
+        return f"{os.path.basename(model_path)}:{st.st_mtime_ns}:{st.st_size}"
+
+    @classmethod
+    def quantized_path(cls, model_path):
+        """Path of the INT8 variant of a model file."""
+        stem, ext = os.path.splitext(model_path)
+        return f"{stem}{cls.QUANTIZED_SUFFIX}{ext}"
+
+    def quantized_model_path(self, architecture='lstm', version=''):
+        """Path of the INT8 variant of a sequence model version (it may not exist)."""
+        return versioned_path(self.quantized_path(self.MODEL_PATHS[architecture]), version)
+
+    @staticmethod
+    def _prefer_quantized():
+        from django.conf import settings
+
+        return getattr(settings, 'ML_PREFER_QUANTIZED', [])
+
+    @staticmethod
+    def _step_models():
+        from django.conf import settings
+
+        return getattr(settings, 'ML_STEP_MODELS', [])
+
+    def get_step_model(self, architecture='lstm', version=''):
+        """
+        Get the stateful single-step ONNX model for the given architecture, if exported
+        and enabled in ML_STEP_MODELS.
+
+        The step model maps (x, h, c) -> (y, h', c') (GRU: (x, h) -> (y, h')),
+        where x has shape (batch, T, 1) and T may be 1 or a full warmup window.
+
+        Args:
+            architecture (str): One of 'lstm', 'gru', 'bilstm' (default: 'lstm')
+            version (str): Model version (default: '' = default file)
+
+        Returns:
+            ort.InferenceSession | None: Step session, or None if no step file exists
+                or the architecture is not in ML_STEP_MODELS
+
+        Raises:
+            RuntimeError: If the step file exists but fails to load
+        """
+        if architecture not in self._step_models():
+            return None
+        return self._get_optional_model(self.STEP_MODEL_PATHS, architecture, version, 'step')
+
+    def get_horizon_model(self, architecture='lstm', version=''):
+        """
+        Get the in-graph horizon ONNX model for the given architecture, if exported.
+
+        The horizon model maps (window, horizon, noise) -> samples of shape
+        (horizon, mc), running the whole recursive forecast inside an ONNX Loop.
+
+        Args:
+            architecture (str): One of 'lstm', 'gru', 'bilstm' (default: 'lstm')
+            version (str): Model version (default: '' = default file)
+
+        Returns:
+            ort.InferenceSession | None: Horizon session, or None if no file exists
+
+        Raises:
+            RuntimeError: If the horizon file exists but fails to load
+        """
+        return self._get_optional_model(self.HORIZON_MODEL_PATHS, architecture, version, 'horizon')
+
+    def _get_optional_model(self, paths, architecture, version, kind):
+        """Get an optional auxiliary model from the registry; None when the file is absent."""
+        model_path = paths.get(architecture)
+        if not model_path:
+            return None
+        return self._registry.get(
+            (kind, architecture, version), versioned_path(model_path, version)
+        )
+
+    def _load_session(self, key, model_path):
+        """
+        Registry loader: create the session for a model file and estimate its footprint.
+
+        A RemoteSession when an inference server is configured (no local memory),
+        otherwise a local session, batched unless it is a horizon model. When the
+        server is unreachable or does not serve the model, it is loaded locally.
+
+        Returns:
+            tuple: (session, estimated bytes)
+
+        Raises:
+            RuntimeError: If model loading fails
+        """
+        kind, architecture, version = key
+        label = f"{architecture.upper()}{'' if kind == 'sequence' else ' ' + kind}"
+        session, nbytes = None, 0
+        if self.inference_socket:
+            try:
+                session = RemoteSession.connect(
+                    self.inference_socket, architecture, kind,
+                    version=version, timeout=self.inference_timeout,
+                )
+            except Exception as e:
+                print(f"✗ Inference server unavailable for {label} model, loading locally: {str(e)}")
+            else:
+                if session is None:
+                    print(f"✗ Inference server has no {label} model, loading locally")
+        try:
+            if session is None:
+                session = self._create_session(model_path)
+                nbytes = estimate_session_bytes(model_path)
+                if kind != 'horizon':
+                    name = '-'.join(filter(None, [architecture, '' if kind == 'sequence' else kind, version]))
+                    session = self._batched(self._bound(session), name)
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to load {label} model from {model_path}: {str(e)}"
+            )
+        if kind == 'sequence':
+            detail = f"input shape: {session.get_inputs()[0].shape}"
+        else:
+            detail = f"inputs: {[i.name for i in session.get_inputs()]}"
+        print(f"✓ ONNX {label} model loaded from {self._source(model_path)} | {detail}")
+        return session, nbytes
+
+    def list_versions(self, architecture):
+        """List the model versions on disk for an architecture ('' is the default file)."""
+        model_path = self.MODEL_PATHS.get(architecture)
+        return list_versions(model_path) if model_path else []
+
+    def _source(self, model_path):
+        if self.inference_socket:
+            return f"inference server ({self.inference_socket})"
+        return model_path
+
+    @staticmethod
+    def _registry_config():
+        """Read ModelRegistry arguments from settings.MODEL_REGISTRY."""
+        from django.conf import settings
+
+        config = getattr(settings, 'MODEL_REGISTRY', {})
+        return {
+            'memory_budget_mb': config.get('MEMORY_BUDGET_MB', 256),
+            'reload_interval': config.get('RELOAD_CHECK_SECONDS', 2.0),
+        }
+
+    @staticmethod
+    def _inference_server_config():
+        """Read (socket path or None, timeout) from settings.INFERENCE_SERVER."""
+        from django.conf import settings
+
+        config = getattr(settings, 'INFERENCE_SERVER', {})
+        return config.get('SOCKET') or None, config.get('TIMEOUT', 120.0)
+
+    @classmethod
+    def _create_session(cls, model_path):
+        """
+        Create a CPU InferenceSession from the active session profile.
+
+        If an optimized copy of the model exists in the cache it is loaded with graph
+        optimizations disabled; otherwise the session optimizes the original file and
+        writes the result to the cache for the next boot.
+        """
+        # Imported here so web workers using the inference server never load onnxruntime
+        import onnxruntime as ort
+
+        profile = cls._session_profile()
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = profile.get('intra_op_num_threads', 1)
+        sess_options.inter_op_num_threads = profile.get('inter_op_num_threads', 1)
+        sess_options.execution_mode = getattr(
+            ort.ExecutionMode, cls.EXECUTION_MODES[profile.get('execution_mode', 'sequential')]
+        )
+        sess_options.enable_cpu_mem_arena = profile.get('enable_cpu_mem_arena', True)
+        sess_options.enable_mem_pattern = profile.get('enable_mem_pattern', True)
+        level = profile.get('graph_optimization_level', 'all')
+        sess_options.graph_optimization_level = getattr(
+            ort.GraphOptimizationLevel, cls.OPTIMIZATION_LEVELS[level]
+        )
+
+        cached_path = cls._optimized_model_path(model_path, level)
+        if cached_path and os.path.exists(cached_path):
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            return ort.InferenceSession(
+                cached_path, sess_options=sess_options, providers=['CPUExecutionProvider'],
+            )
+
+        tmp_path = None
+        if cached_path and level != 'disable':
+            os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+            # Unique temp name: several workers may optimize the same model at once
+            tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            sess_options.optimized_model_filepath = tmp_path
+        session = ort.InferenceSession(
+            model_path, sess_options=sess_options, providers=['CPUExecutionProvider'],
+        )
+        if tmp_path and os.path.exists(tmp_path):
+            os.replace(tmp_path, cached_path)
+            print(f"✓ Optimized graph cached at {cached_path}")
+        return session
+
+    @staticmethod
+    def _session_profile():
+        """Return the active profile dict from settings.ONNX_SESSION_PROFILES."""
+        from django.conf import settings
+
+        profiles = getattr(settings, 'ONNX_SESSION_PROFILES', {})
+        name = getattr(settings, 'ONNX_SESSION_PROFILE', 'default')
+        if name not in profiles:
+            if profiles:
+                raise ValueError(
+                    f"Unknown ONNX session profile '{name}'. "
+                    f"Available: {', '.join(profiles.keys())}"
+                )
+            return {}
+        return profiles[name]
+
+    @staticmethod
+    def _optimized_model_path(model_path, level):
+        """
+        Cache path for the optimized graph of model_path, or None if caching is off.
+
+        The name embeds a hash of the model file, the onnxruntime version and the
+        optimization level, so retrained models or upgrades never load a stale graph.
+        """
+        import onnxruntime as ort
+        from django.conf import settings
+
+        cache_dir = getattr(settings, 'ONNX_OPTIMIZED_MODEL_DIR', '')
+        if not cache_dir:
+            return None
+        digest = hashlib.sha256()
+        with open(model_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        stem = os.path.splitext(os.path.basename(model_path))[0]
+        return os.path.join(
+            str(cache_dir),
+            f"{stem}.{digest.hexdigest()[:16]}.ort{ort.__version__}.{level}.onnx",
+        )
+
+    @staticmethod
+    def _bound(session):
+        """
+        Wrap a session in a BoundSession (IOBinding, reused buffers) when enabled in settings.
+
+        Sessions with input types IOBinding cannot map are returned unchanged.
+        """
+        from django.conf import settings
+
+        config = getattr(settings, 'INFERENCE_IO_BINDING', {})
+        if not config.get('ENABLED', False) or not BoundSession.supports(session):
+            return session
+        return BoundSession(session, max_shapes=config.get('MAX_SHAPES_PER_THREAD', 8))
+
+    @staticmethod
+    def _batched(session, name):
+        """
+        Wrap a session in a cross-request BatchingSession when enabled in settings.
+
+        Sessions without a dynamic batch axis are returned unchanged.
+        """
+        from django.conf import settings
+
+        config = getattr(settings, 'INFERENCE_BATCHING', {})
+        if not config.get('ENABLED', False) or not BatchingSession.supports(session):
+            return session
+        return BatchingSession(
+            session,
+            max_batch_size=config.get('MAX_BATCH_SIZE', 512),
+            name=name,
+        )
 
     def get_training_scaler(self):
         """
         Get training scaler, loading from disk if not cached.
 
         Returns:
-            MinMaxScaler: Scaler fitted on AAPL training data (70% split)
+            AffineScaler: Scaler fitted on AAPL training data (70% split)
 
         Raises:
             FileNotFoundError: If scaler file doesn't exist
@@ -125,18 +470,19 @@ class MLModelManager:
             with self._lock:
                 if self._training_scaler is None:
                     try:
-                        if not os.path.exists(self.SCALER_PATH):
+                        if os.path.exists(self.SCALER_PATH):
+                            self._training_scaler = AffineScaler.load(self.SCALER_PATH)
+                            source = self.SCALER_PATH
+                        elif os.path.exists(self.LEGACY_SCALER_PATH):
+                            self._training_scaler = self._load_legacy_scaler()
+                            source = self.LEGACY_SCALER_PATH
+                        else:
                             raise FileNotFoundError(
                                 f"Scaler file not found: {self.SCALER_PATH}. "
                                 f"Generate it by running: python manage.py generate_scaler"
                             )
-                        self._training_scaler = joblib.load(self.SCALER_PATH)
-                        if not isinstance(self._training_scaler, MinMaxScaler):
-                            raise TypeError(
-                                f"Expected MinMaxScaler, got {type(self._training_scaler)}"
-                            )
                         print(
-                            f"✓ Scaler loaded from {self.SCALER_PATH} "
+                            f"✓ Scaler loaded from {source} "
                             f"| range: [{self._training_scaler.data_min_[0]:.2f}, "
                             f"{self._training_scaler.data_max_[0]:.2f}]"
                         )
@@ -146,13 +492,98 @@ class MLModelManager:
                         )
         return self._training_scaler
 
-    def is_architecture_available(self, architecture: str) -> bool:
-        """Check if a model file exists for the given architecture."""
+    @classmethod
+    def _load_legacy_scaler(cls):
+        """Read the pickled MinMaxScaler (imports sklearn/joblib) and convert it."""
+        import joblib
+        from sklearn.preprocessing import MinMaxScaler
+
+        scaler = joblib.load(cls.LEGACY_SCALER_PATH)
+        if not isinstance(scaler, MinMaxScaler):
+            raise TypeError(f"Expected MinMaxScaler, got {type(scaler)}")
+        print(
+            f"✗ Using legacy {cls.LEGACY_SCALER_PATH}; convert it with: "
+            f"python manage.py generate_scaler --convert"
+        )
+        return AffineScaler.from_sklearn(scaler)
+
+    def is_architecture_available(self, architecture: str, version: str = '') -> bool:
+        """Check if a model file exists for the given architecture (and version)."""
         path = self.MODEL_PATHS.get(architecture, '')
-        return bool(path) and os.path.exists(path)
+        return bool(path) and os.path.exists(versioned_path(path, version))
+
+    def preload(self, architectures=None, warmup_batch=50):
+        """
+        Eagerly load models and scaler and run one warmup inference per session.
+
+        Called at worker boot (or before fork with gunicorn --preload, so the loaded
+        weights are shared copy-on-write) to keep the first /predict/ request from
+        paying for session creation, graph optimization and scaler loading.
+
+        Args:
+            architectures (list): Architectures to load (default: every file in MODEL_PATHS)
+            warmup_batch (int): Rows in the warmup batch, matching a day of MC samples (default: 50)
+
+        Returns:
+            dict: {'<architecture>[-step|-horizon]': {'load_ms', 'warmup_ms'}, 'scaler': {'load_ms'}}
+        """
+        if architectures is None:
+            architectures = [a for a in self.MODEL_PATHS if self.is_architecture_available(a)]
+
+        timings = {}
+        start = time.perf_counter()
+        self.get_training_scaler()
+        timings['scaler'] = {'load_ms': (time.perf_counter() - start) * 1000}
+
+        loaders = (
+            ('', self.get_model),
+            ('-step', self.get_step_model),
+            ('-horizon', self.get_horizon_model),
+        )
+        for architecture in architectures:
+            for suffix, loader in loaders:
+                start = time.perf_counter()
+                session = loader(architecture=architecture)
+                loaded = time.perf_counter()
+                if session is None:
+                    continue
+                # Warm the raw session: a BatchingSession's thread must not start before fork
+                raw = getattr(session, 'session', session)
+                raw.run(None, self._warmup_feed(raw, warmup_batch))
+                timings[architecture + suffix] = {
+                    'load_ms': (loaded - start) * 1000,
+                    'warmup_ms': (time.perf_counter() - loaded) * 1000,
+                }
+
+        for name, t in timings.items():
+            warmup = f" | warmup {t['warmup_ms']:.0f} ms" if 'warmup_ms' in t else ''
+            print(f"✓ Preloaded {name}: load {t['load_ms']:.0f} ms{warmup}")
+        return timings
+
+    @staticmethod
+    def _warmup_feed(session, batch_size):
+        """Zero inputs for a session: symbolic batch axes -> batch_size, other symbolic dims -> 1."""
+        feed = {}
+        for arg in session.get_inputs():
+            shape = [
+                dim if isinstance(dim, int) else (batch_size if axis == 0 else 1)
+                for axis, dim in enumerate(arg.shape)
+            ]
+            if arg.type == 'tensor(int64)':
+                # Integer inputs are counts (e.g. the horizon length): run one step
+                feed[arg.name] = np.ones(shape, dtype=np.int64)
+            else:
+                feed[arg.name] = np.zeros(shape, dtype=np.float32)
+        return feed
+
+    def registry_stats(self):
+        """Cached sessions in LRU order (oldest first) with their estimated memory."""
+        return self._registry.stats()
 
     @classmethod
     def reset(cls):
         """Reset singleton (for testing). Forces reload on next access."""
         with cls._lock:
+            if cls._instance is not None:
+                cls._instance._registry.clear()
             cls._instance = None
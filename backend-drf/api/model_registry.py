@@ -0,0 +1,200 @@
+"""
+Model Registry - Versioned ONNX Sessions with Hot Reload and LRU Eviction
+
+Holds the sessions created by MLModelManager, keyed by (kind, architecture, version).
+
+Versions are files next to the default model, named <stem>@<version>.onnx:
+  - stock_prediction_model.onnx            (LSTM, default version '')
+  - stock_prediction_model@2026-10-a.onnx  (LSTM, version '2026-10-a')
+  - stock_prediction_model_step@2026-10-a.onnx, ..._horizon@2026-10-a.onnx (aux models)
+A ModelConfig pins one version through its model_version field.
+
+Hot reload: each lookup re-stats the file at most every reload_interval seconds. When
+its mtime or size changed, a new session is built outside the lock (concurrent lookups
+of that file share one load; lookups of other models never wait for it) and swapped in
+under the lock; calls already holding the old session finish on it. Publish new files
+with an atomic rename (write to a temp name, then mv) so a half-written file is never
+loaded. If a reload fails, the previous session keeps serving.
+
+Eviction: each session is charged an estimated footprint; when the total exceeds the
+memory budget, least recently used sessions are dropped until it fits again.
+"""
+
+import glob
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .single_flight import SingleFlight
+
+
+VERSION_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,50}$')
+
+# Rough resident cost of a local session beyond its weights (arena, graph, kernels)
+SESSION_OVERHEAD_BYTES = 8 * 1024 * 1024
+
+
+def estimate_session_bytes(path):
+    """Estimated resident memory of a local session for a model file."""
+    return 2 * os.path.getsize(path) + SESSION_OVERHEAD_BYTES
+
+
+def versioned_path(path, version):
+    """Return the file path of a model version ('' or None is the default file)."""
+    if not version:
+        return path
+    if not VERSION_PATTERN.match(version):
+        raise ValueError(
+            f"Invalid model version '{version}'. "
+            f"Use 1-50 letters, digits, '.', '_' or '-'."
+        )
+    stem, ext = os.path.splitext(path)
+    return f"{stem}@{version}{ext}"
+
+
+def list_versions(path):
+    """List versions of a model present on disk; '' stands for the default file."""
+    stem, ext = os.path.splitext(path)
+    versions = [''] if os.path.exists(path) else []
+    prefix = f"{stem}@"
+    versions += sorted(
+        found[len(prefix):-len(ext)]
+        for found in glob.glob(f"{glob.escape(prefix)}*{ext}")
+    )
+    return versions
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _Entry:
+    __slots__ = ('session', 'path', 'stamp', 'nbytes', 'checked_at')
+
+    def __init__(self, session, path, stamp, nbytes):
+        self.session = session
+        self.path = path
+        self.stamp = stamp
+        self.nbytes = nbytes
+        self.checked_at = time.monotonic()
+
+
+class ModelRegistry:
+    """
+    LRU cache of sessions with file-change reload and a memory budget.
+
+    Usage:
+        registry = ModelRegistry(loader, memory_budget_mb=256)
+        session = registry.get(('sequence', 'lstm', ''), 'stock_prediction_model.onnx')
+    """
+
+    def __init__(self, loader, memory_budget_mb=256, reload_interval=2.0):
+        """
+        Args:
+            loader (callable): loader(key, path) -> (session, estimated bytes), called when (re)loading
+            memory_budget_mb (float): Total estimated session memory before LRU eviction (default: 256)
+            reload_interval (float): Min seconds between file checks per session (default: 2.0)
+        """
+        self.loader = loader
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.reload_interval = reload_interval
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._loads = SingleFlight()
+
+    def get(self, key, path):
+        """
+        Return the session for key, loading, reloading or reusing it as needed.
+
+        Args:
+            key (tuple): (kind, architecture, version)
+            path (str): Model file for this key
+
+        Returns:
+            session | None: Session, or None while the file does not exist
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            # A key can move to another file (e.g. its quantized variant appeared)
+            same_file = entry is not None and entry.path == path
+            if same_file and now - entry.checked_at < self.reload_interval:
+                self._entries.move_to_end(key)
+                return entry.session
+
+            stamp = _file_stamp(path)
+            if same_file and entry.stamp == stamp:
+                entry.checked_at = now
+                self._entries.move_to_end(key)
+                return entry.session
+
+            if stamp is None:
+                if entry is not None:
+                    self._close(entry)
+                self._entries[key] = _Entry(None, path, None, 0)
+                self._entries.move_to_end(key)
+                return None
+
+        try:
+            return self._loads.do((key, path, stamp), lambda: self._load(key, path, stamp))
+        except Exception as e:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or entry.session is None:
+                    raise
+                print(f"✗ Reload of {path} failed, keeping the loaded version: {str(e)}")
+                entry.checked_at = time.monotonic()
+                return entry.session
+
+    def _load(self, key, path, stamp):
+        """Build a session without holding the lock, then swap it in under the lock."""
+        session, nbytes = self.loader(key, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.session is not None:
+                    print(f"✓ Hot-reloaded {path}")
+                self._close(entry)
+            self._entries[key] = _Entry(session, path, stamp, nbytes)
+            self._entries.move_to_end(key)
+            self._evict(keep=key)
+            return session
+
+    def _evict(self, keep):
+        """Drop least recently used sessions until the estimated total fits the budget."""
+        total = sum(e.nbytes for e in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.memory_budget:
+                break
+            if key == keep or self._entries[key].session is None:
+                continue
+            entry = self._entries.pop(key)
+            total -= entry.nbytes
+            self._close(entry)
+            print(f"✓ Evicted {entry.path} (LRU, budget {self.memory_budget / 2 ** 20:.0f} MB)")
+
+    @staticmethod
+    def _close(entry):
+        close = getattr(entry.session, 'close', None)
+        if close is not None:
+            close()
+
+    def stats(self):
+        """Snapshot of cached sessions in LRU order (oldest first)."""
+        with self._lock:
+            return [
+                {'key': key, 'path': e.path, 'loaded': e.session is not None, 'estimated_mb': e.nbytes / 2 ** 20}
+                for key, e in self._entries.items()
+            ]
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                self._close(entry)
+            self._entries.clear()
@@ -8,6 +8,19 @@ ARCHITECTURE_CHOICES = [
     ('bilstm', 'Bidirectional LSTM'),
 ]
 
+NOISE_SCHEME_CHOICES = [
+    ('gaussian', 'Gaussian'),
+    ('antithetic', 'Antithetic pairs'),
+    ('sobol', 'Sobol (quasi-random)'),
+    ('halton', 'Halton (quasi-random)'),
+    ('lhs', 'Latin hypercube'),
+]
+
+SCALER_SCOPE_CHOICES = [
+    ('backtest', 'Backtest training split'),
+    ('forecast', 'Forecast (expanding history)'),
+]
+
 PROVIDER_CHOICES = [
     ('yfinance', 'Yahoo Finance (yfinance)'),
     ('alphavantage', 'Alpha Vantage'),
@@ -20,8 +33,11 @@ class ModelConfig(models.Model):
     name = models.CharField(max_length=100)
     version = models.PositiveIntegerField(default=1)
     architecture = models.CharField(max_length=20, choices=ARCHITECTURE_CHOICES, default='lstm')
+    # Model file version pinned by this config ('' = default file), see api/model_registry.py
+    model_version = models.CharField(max_length=50, blank=True, default='')
     sequence_length = models.PositiveIntegerField(default=100)
     mc_iterations = models.PositiveIntegerField(default=50)
+    noise_scheme = models.CharField(max_length=20, choices=NOISE_SCHEME_CHOICES, default='gaussian')
     uncertainty_growth = models.FloatField(default=0.02)
     default_confidence = models.FloatField(default=0.95)
     technical_indicators = models.JSONField(default=list)
@@ -75,3 +91,69 @@ class PredictionRecord(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.ticker} @ {self.created_at.strftime('%Y-%m-%d')}"
+
+
+class TickerScaler(models.Model):
+    """Running min/max of a ticker's closes over [first_date, last_date], see api/scaler_store.py."""
+    ticker = models.CharField(max_length=20)
+    scope = models.CharField(max_length=20, choices=SCALER_SCOPE_CHOICES)
+    first_date = models.DateField()
+    # Last bar folded in; for 'backtest' this is the train/test split boundary
+    last_date = models.DateField()
+    # Close at last_date, to detect restated (e.g. split-adjusted) history
+    last_close = models.FloatField()
+    n_bars = models.PositiveIntegerField()
+    data_min = models.FloatField()
+    data_max = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('ticker', 'scope')]
+
+    def __str__(self):
+        return f"{self.ticker} ({self.scope}) {self.first_date} - {self.last_date}"
+
+
+class BacktestCacheEntry(models.Model):
+    """Backtest window predictions per target date, see api/backtest_cache.py."""
+    ticker = models.CharField(max_length=20)
+    architecture = models.CharField(max_length=20, choices=ARCHITECTURE_CHOICES)
+    model_version = models.CharField(max_length=50, blank=True, default='')
+    sequence_length = models.PositiveIntegerField()
+    # Model file identity (name:mtime:size) and train scaler the predictions were made with
+    model_fingerprint = models.CharField(max_length=200)
+    scale = models.FloatField()
+    offset = models.FloatField()
+    # npz: bar dates and closes of the scored series, predictions per target date
+    payload = models.BinaryField()
+    n_windows = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('ticker', 'architecture', 'model_version', 'sequence_length')]
+
+    def __str__(self):
+        return f"{self.ticker} {self.architecture}{'@' + self.model_version if self.model_version else ''} ({self.n_windows} windows)"
+
+
+class PriceHistory(models.Model):
+    """Stored daily bars per ticker and upstream provider, see api/price_store.py."""
+    ticker = models.CharField(max_length=20)
+    # Provider name; providers adjust prices differently, so their series are kept apart
+    source = models.CharField(max_length=20)
+    # Start of the range requested by the last full download; later starts are served from the store
+    history_start = models.DateField()
+    first_date = models.DateField()
+    last_date = models.DateField()
+    n_bars = models.PositiveIntegerField()
+    # npz: bar dates, column names and a (n_bars, n_columns) float64 value matrix
+    payload = models.BinaryField()
+    # Last time the upstream provider was asked for new bars
+    refreshed_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('ticker', 'source')]
+
+    def __str__(self):
+        return f"{self.ticker} ({self.source}) {self.first_date} - {self.last_date}"
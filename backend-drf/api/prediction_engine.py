@@ -8,11 +8,79 @@ Key Features:
 - Recursive prediction: each forecast feeds into the next
 - Uncertainty quantification via Monte Carlo Dropout
 - Growing confidence intervals with prediction horizon
+- Batched MC inference: all MC samples for a day run in a single ONNX call
+- Trajectory-ensemble mode: independent MC paths with empirical quantile bands
+- Stateful step model (optional): hidden state is warmed once from history,
+  then each forecast day advances a single timestep instead of re-running the window
+- In-graph horizon model (optional): the recursive loop runs inside an ONNX Loop,
+  one InferenceSession.run per forecast
+- Variance-reduced MC noise (antithetic, Sobol, Halton, Latin hypercube)
+- Analytic mode: one deterministic pass per day, intervals from the delta method
+  or from backtesting residuals (no Monte Carlo)
 - Trading day date generation (excludes weekends)
 """
 
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+
+PREDICTION_MODES = ('recursive', 'trajectory', 'analytic')
+
+# Interval models for 'analytic' mode:
+# - 'delta':    first-order propagation of the input noise through a finite-difference
+#               Jacobian of the model at the last observed window
+# - 'residual': one-step backtesting RMSE accumulated as a random walk (sqrt(day))
+ANALYTIC_METHODS = ('delta', 'residual')
+
+# MC noise sampling schemes:
+# - 'gaussian':   i.i.d. normal draws
+# - 'antithetic': interleaved (z, -z) pairs, so every even-sized prefix is balanced
+# - 'sobol', 'halton': scrambled quasi-random points mapped to normals (scipy)
+# - 'lhs':        Latin hypercube points mapped to normals (scipy)
+NOISE_SCHEMES = ('gaussian', 'antithetic', 'sobol', 'halton', 'lhs')
+
+
+def _z_score(confidence_level):
+    """Two-sided z-score for the confidence intervals (defaults to 95%)."""
+    # 95% CI: z=1.96, 99% CI: z=2.576, 90% CI: z=1.645
+    z_scores = {
+        0.90: 1.645,
+        0.95: 1.96,
+        0.99: 2.576
+    }
+    return z_scores.get(confidence_level, 1.96)
+
+
+class _RingWindow:
+    """
+    Preallocated float32 ring buffer for the rolling prediction window.
+
+    Values are written twice (at head and head + length) into a buffer of size
+    2 * length, so the latest `length` values are always a contiguous slice and
+    pushing a value never allocates. Leading axes hold independent windows
+    (e.g. one per trajectory).
+    """
+
+    def __init__(self, initial):
+        """
+        Args:
+            initial (np.ndarray): Initial window(s), shape (..., length)
+        """
+        self.length = initial.shape[-1]
+        self._buffer = np.empty(initial.shape[:-1] + (2 * self.length,), dtype='float32')
+        self._buffer[..., :self.length] = initial
+        self._buffer[..., self.length:] = initial
+        self._head = 0
+
+    def view(self):
+        """Current window(s) in chronological order, shape (..., length). No copy."""
+        return self._buffer[..., self._head:self._head + self.length]
+
+    def push(self, values):
+        """Drop the oldest value of each window and append `values`."""
+        self._buffer[..., self._head] = values
+        self._buffer[..., self._head + self.length] = values
+        self._head = (self._head + 1) % self.length
 
 
 class FuturePredictionEngine:
@@ -24,39 +92,274 @@ class FuturePredictionEngine:
 
     Attributes:
         model: Keras LSTM model
-        scaler: MinMaxScaler fitted on training data
+        scaler: AffineScaler (or MinMaxScaler) fitted on training data
         sequence_length: Number of historical days required (default: 100)
+        batch_mc: Whether MC samples are run as one batched ONNX call per day
+        step_model: Optional stateful single-step ONNX model (x, h[, c]) -> (y, h'[, c'])
+        horizon_model: Optional ONNX Loop model producing the whole recursive horizon
+        mc_tolerance: Standard-error tolerance for adaptive MC early stopping
+        noise_scheme: MC noise sampling scheme (see NOISE_SCHEMES)
     """
 
-    def __init__(self, model, scaler, sequence_length=100, uncertainty_growth=0.02):
+    def __init__(self, model, scaler, sequence_length=100, uncertainty_growth=0.02,
+                 batch_mc=True, step_model=None, horizon_model=None,
+                 mc_tolerance=1e-3, mc_batch_size=10, noise_scheme='gaussian', seed=None):
         """
         Initialize prediction engine.
 
         Args:
             model: Trained ONNX model (InferenceSession)
-            scaler: MinMaxScaler fitted on training data only
+            scaler: AffineScaler (or MinMaxScaler) fitted on training data only
             sequence_length (int): Sequence length for LSTM input (default: 100)
             uncertainty_growth (float): Uncertainty increase per day (default: 0.02 = 2%)
+            batch_mc (bool): Run all MC samples of a day as one (mc_iterations, seq_len, 1)
+                batch (default: True). Ignored if the model has a fixed batch axis.
+            step_model: Stateful step InferenceSession (default: None). When given, the
+                hidden state is warmed once from the window and each day costs one
+                timestep. The state keeps context older than sequence_length, so
+                forecasts differ slightly from the windowed model after day 1.
+            horizon_model: Horizon InferenceSession (default: None). When given (and no
+                step model), 'recursive' mode runs the whole horizon in one call with
+                results identical to the windowed loop.
+            mc_tolerance (float): Adaptive MC stops once the standard errors of the
+                sample mean and std fall below this value, in normalized scale
+                (default: 1e-3 ≈ 0.1% of the training price range)
+            mc_batch_size (int): Samples drawn per adaptive MC batch (default: 10)
+            noise_scheme (str): One of NOISE_SCHEMES (default: 'gaussian')
+            seed (int): Seed for the engine's own numpy Generator (default: None)
+
+        Raises:
+            ValueError: If noise_scheme is not supported
         """
+        if noise_scheme not in NOISE_SCHEMES:
+            raise ValueError(
+                f"Invalid noise scheme: '{noise_scheme}'. "
+                f"Must be one of: {', '.join(NOISE_SCHEMES)}."
+            )
+
         self.model = model
         self.scaler = scaler
         self.sequence_length = sequence_length
         self.uncertainty_growth = uncertainty_growth
+        self._input_name = model.get_inputs()[0].name
+        self.batch_mc = batch_mc and self._has_dynamic_batch_axis()
+        self.step_model = step_model
+        self.horizon_model = horizon_model
+        self.mc_tolerance = mc_tolerance
+        self.mc_batch_size = mc_batch_size
+        self.noise_scheme = noise_scheme
+        self._rng = np.random.default_rng(seed)
+        if step_model is not None:
+            self._step_input_names = [i.name for i in step_model.get_inputs()]
+            self._step_state_size = step_model.get_inputs()[1].shape[1]
+
+    def _has_dynamic_batch_axis(self):
+        """True if the model's batch dimension is symbolic (e.g. exported as [None, 100, 1])."""
+        batch_dim = self.model.get_inputs()[0].shape[0]
+        return not isinstance(batch_dim, int)
+
+    def _run_batch(self, X):
+        """
+        Run a batch of windows through the model.
+
+        Args:
+            X (np.ndarray): float32 windows, shape (batch, sequence_length, 1)
+
+        Returns:
+            np.ndarray: Predictions in normalized scale, shape (batch,)
+        """
+        if self.batch_mc:
+            # Single ONNX call for the whole batch (batch axis is dynamic)
+            return self.model.run(None, {self._input_name: X})[0][:, 0]
+
+        return np.array([
+            self.model.run(None, {self._input_name: X[i:i + 1]})[0][0, 0]
+            for i in range(X.shape[0])
+        ])
+
+    def _draw_mc_noise(self, shape, sampler=None):
+        """
+        Draw small Gaussian noise to simulate MC Dropout uncertainty.
+        Scale 0.005 on normalized [0,1] data ≈ ±0.5% perturbation.
+
+        Args:
+            shape (tuple): (..., n_samples, T, 1). Axis -3 indexes MC samples, the
+                last two axes are one sample's dimensions and leading axes are
+                independent blocks (e.g. forecast days).
+            sampler: Quasi-random sampler to continue (default: a new one)
+
+        Returns:
+            np.ndarray: float32 noise of the given shape
+        """
+        return self._fill_mc_noise(np.empty(shape, dtype='float32'), sampler)
+
+    def _fill_mc_noise(self, out, sampler=None, half=None):
+        """
+        Fill `out` with MC noise in place (see _draw_mc_noise).
+
+        Args:
+            out (np.ndarray): float32 buffer, shape (..., n_samples, T, 1)
+            sampler: Quasi-random sampler to continue (default: a new one)
+            half (np.ndarray): 'antithetic' only, scratch buffer for the drawn half
+                of the pairs (default: a new one)
+
+        Returns:
+            np.ndarray: out
+        """
+        if self.noise_scheme == 'gaussian':
+            self._rng.standard_normal(dtype=np.float32, out=out)
+        elif self.noise_scheme == 'antithetic':
+            self._antithetic_normals(out, half)
+        else:
+            self._quasi_random_normals(out, sampler)
+        out *= 0.005
+        return out
+
+    def _mc_noise_days(self, horizon, shape):
+        """
+        Yield MC noise one forecast day at a time, each of shape (n_samples, T, 1).
+
+        Every day is drawn into the same preallocated buffer, so a yielded block is
+        only valid until the next one is requested. Draws come from the same
+        generator (and quasi-random sequence) in the same order as one
+        _draw_mc_noise((horizon, *shape)) block.
+        """
+        buffer = np.empty(shape, dtype='float32')
+        sampler = half = None
+        if self.noise_scheme == 'antithetic':
+            half = np.empty(self._antithetic_half_shape(shape), dtype='float32')
+        elif self.noise_scheme != 'gaussian':
+            sampler = self._qmc_sampler(shape[-2] * shape[-1])
+        for _ in range(horizon):
+            yield self._fill_mc_noise(buffer, sampler, half)
+
+    @staticmethod
+    def _antithetic_half_shape(shape):
+        return shape[:-3] + ((shape[-3] + 1) // 2,) + shape[-2:]
+
+    def _antithetic_normals(self, out, half=None):
+        """Fill `out` with standard normals as interleaved (z, -z) pairs along the sample axis."""
+        n_samples = out.shape[-3]
+        if half is None:
+            half = np.empty(self._antithetic_half_shape(out.shape), dtype='float32')
+        self._rng.standard_normal(dtype=np.float32, out=half)
+
+        out[..., 0::2, :, :] = half
+        # Negate in place: a ufunc writing to the strided rows would buffer a copy
+        np.negative(half, out=half)
+        out[..., 1::2, :, :] = half[..., :n_samples // 2, :, :]
+        return out
+
+    def _quasi_random_normals(self, out, sampler=None):
+        """
+        Fill `out` with standard normals from scrambled Sobol/Halton or Latin
+        hypercube points.
+
+        The low-discrepancy sequence (one per call unless a sampler is passed) is
+        consumed block by block, so each day's samples are consecutive points of the
+        same sequence.
+        """
+        from scipy.special import ndtri
+
+        n_samples = out.shape[-3]
+        blocks = out.reshape(-1, n_samples, out.shape[-2] * out.shape[-1])
+        if sampler is None:
+            sampler = self._qmc_sampler(blocks.shape[-1])
+
+        # Sobol points are balanced (and scipy stays quiet) in power-of-2 blocks:
+        # draw the enclosing block and keep its first n_samples points
+        n_draw = n_samples
+        if self.noise_scheme == 'sobol':
+            n_draw = 1 << (n_samples - 1).bit_length()
+        for block in blocks:
+            ndtri(sampler.random(n_draw)[:n_samples], out=block)
+
+        return out
+
+    def _qmc_sampler(self, dim):
+        from scipy.stats import qmc
+
+        if self.noise_scheme == 'sobol':
+            return qmc.Sobol(dim, scramble=True, rng=self._rng)
+        if self.noise_scheme == 'halton':
+            return qmc.Halton(dim, scramble=True, rng=self._rng)
+        return qmc.LatinHypercube(dim, rng=self._rng)
+
+    def _add_mc_noise(self, X):
+        """Return a float32 copy of X with MC noise added."""
+        return (X + self._draw_mc_noise(X.shape)).astype('float32')
+
+    def _run_step(self, X, states):
+        """
+        Advance the step model over X from the given recurrent states.
+
+        Args:
+            X (np.ndarray): float32 inputs, shape (batch, T, 1)
+            states (list): Recurrent state arrays, each (batch, state_size)
+
+        Returns:
+            tuple: (predictions of shape (batch,), new states list)
+        """
+        feeds = dict(zip(self._step_input_names, [X, *states]))
+        y, *new_states = self.step_model.run(None, feeds)
+        return y[:, 0], new_states
+
+    def _warm_step_states(self, current_sequence, batch_size, noisy=True):
+        """
+        Warm the recurrent state once from history for a batch of MC rows.
+
+        Every row sees an independently noised window (the clean window when noisy
+        is False), so each MC row carries noise on all of its past inputs, like a
+        row of the windowed loop. The last window value is left unconsumed: it is
+        the first day's input.
+
+        Returns:
+            list: Recurrent states, each (batch_size, state_size)
+        """
+        X = np.repeat(
+            current_sequence[:-1].reshape(1, self.sequence_length - 1, 1), batch_size, axis=0
+        )
+        if noisy:
+            X = self._add_mc_noise(X)
+        zero_states = [
+            np.zeros((batch_size, self._step_state_size), dtype='float32')
+            for _ in self._step_input_names[1:]
+        ]
+        _, states = self._run_step(X.astype('float32'), zero_states)
+        return states
 
     def predict_future(self, historical_prices, horizon,
-                       confidence_level=0.95, mc_iterations=50):
+                       confidence_level=0.95, mc_iterations=50, mode='recursive',
+                       adaptive_mc=False, analytic_method='delta', residual_std=None):
         """
         Predict future prices with confidence intervals.
 
         Uses recursive prediction: day 1 prediction feeds into day 2, etc.
         Uncertainty is quantified using Monte Carlo Dropout technique.
 
+        Modes:
+            - 'recursive': MC samples are collapsed to their mean after every day and
+              only the mean is fed back. Intervals use z-scores widened by
+              uncertainty_growth.
+            - 'trajectory': mc_iterations independent paths are advanced together for
+              the whole horizon. Intervals are empirical quantiles of the path spread.
+            - 'analytic': one deterministic forward pass per day, no Monte Carlo.
+              Intervals come from analytic_method (see ANALYTIC_METHODS).
+
         Args:
             historical_prices (np.ndarray): Historical prices, shape (n_days,)
                 Must have at least self.sequence_length days
             horizon (int): Number of trading days to predict (1-365)
             confidence_level (float): Confidence level for intervals (default: 0.95)
             mc_iterations (int): Monte Carlo iterations for uncertainty (default: 50)
+            mode (str): One of PREDICTION_MODES (default: 'recursive')
+            adaptive_mc (bool): 'recursive' mode only. Draw MC samples in batches of
+                mc_batch_size and stop each day once the standard errors fall under
+                mc_tolerance; mc_iterations becomes the upper bound (default: False)
+            analytic_method (str): 'analytic' mode only, one of ANALYTIC_METHODS
+                (default: 'delta')
+            residual_std (float): One-step error of the model in price units, e.g.
+                the backtesting RMSE. Required for analytic_method='residual'.
 
         Returns:
             dict: Prediction results containing:
@@ -64,6 +367,8 @@ class FuturePredictionEngine:
                 - 'lower_bound': List of lower confidence bounds
                 - 'upper_bound': List of upper confidence bounds
                 - 'uncertainty': List of standard deviations
+                - 'mode': Prediction mode used
+                - 'mc_iterations_used': MC samples drawn per day (adaptive_mc only)
 
         Raises:
             ValueError: If insufficient historical data or invalid parameters
@@ -85,86 +390,344 @@ class FuturePredictionEngine:
                 f"Invalid confidence level: {confidence_level}. Must be between 0.80 and 0.99."
             )
 
+        if mode not in PREDICTION_MODES:
+            raise ValueError(
+                f"Invalid prediction mode: '{mode}'. "
+                f"Must be one of: {', '.join(PREDICTION_MODES)}."
+            )
+
+        if mode == 'analytic':
+            if analytic_method not in ANALYTIC_METHODS:
+                raise ValueError(
+                    f"Invalid analytic method: '{analytic_method}'. "
+                    f"Must be one of: {', '.join(ANALYTIC_METHODS)}."
+                )
+            if analytic_method == 'residual' and residual_std is None:
+                raise ValueError(
+                    "Analytic method 'residual' requires residual_std (backtesting RMSE)."
+                )
+
         # Initialize sequence with last 100 historical days (scaled)
         current_sequence = self.scaler.transform(
             historical_prices[-self.sequence_length:].reshape(-1, 1)
         )
 
-        # Storage for predictions
-        predictions = []
-        uncertainties = []
-        lower_bounds = []
-        upper_bounds = []
-
-        # Z-score for confidence intervals
-        # 95% CI: z=1.96, 99% CI: z=2.576, 90% CI: z=1.645
-        z_scores = {
-            0.90: 1.645,
-            0.95: 1.96,
-            0.99: 2.576
-        }
-        z_score = z_scores.get(confidence_level, 1.96)
-
-        # Recursive prediction loop
-        for day in range(horizon):
-            # Monte Carlo Dropout: multiple forward passes with dropout enabled
-            mc_predictions = []
-
-            _input_name = self.model.get_inputs()[0].name
-
-            for _ in range(mc_iterations):
-                # Add small Gaussian noise to simulate MC Dropout uncertainty.
-                # Scale 0.005 on normalized [0,1] data ≈ ±0.5% perturbation.
-                X = current_sequence.reshape(1, self.sequence_length, 1)
-                X_noisy = (X + np.random.normal(0, 0.005, X.shape)).astype('float32')
-
-                pred = self.model.run(None, {_input_name: X_noisy})[0][0, 0]
-                mc_predictions.append(pred)
+        adaptive_mc = adaptive_mc and mode == 'recursive'
 
-            # Calculate statistics from MC samples
-            mc_predictions = np.array(mc_predictions)
-            mean_pred = mc_predictions.mean()
-            std_pred = mc_predictions.std()
-
-            # Increase uncertainty with prediction horizon (error accumulation)
-            # Each additional day adds uncertainty_growth more uncertainty (default: 2%)
-            uncertainty_factor = 1.0 + (self.uncertainty_growth * day)
-            adjusted_std = std_pred * uncertainty_factor
-
-            # Calculate confidence intervals
-            lower = mean_pred - z_score * adjusted_std
-            upper = mean_pred + z_score * adjusted_std
-
-            # Store results (still in normalized scale)
-            predictions.append(mean_pred)
-            uncertainties.append(adjusted_std)
-            lower_bounds.append(lower)
-            upper_bounds.append(upper)
-
-            # Update sequence for next prediction:
-            # Remove oldest value, append new prediction
-            current_sequence = np.roll(current_sequence, -1, axis=0)
-            current_sequence[-1] = mean_pred
+        if mode == 'trajectory':
+            predictions, lower_bounds, upper_bounds, uncertainties = self._predict_trajectories(
+                current_sequence, horizon, confidence_level, mc_iterations
+            )
+        elif mode == 'analytic':
+            predictions, lower_bounds, upper_bounds, uncertainties = self._predict_analytic(
+                current_sequence, horizon, confidence_level, analytic_method, residual_std
+            )
+        else:
+            samples = self._recursive_samples_auto(
+                current_sequence, horizon, mc_iterations, adaptive_mc
+            )
+            predictions, lower_bounds, upper_bounds, uncertainties = self._recursive_statistics(
+                samples, confidence_level
+            )
 
         # Convert from normalized scale back to real prices
         predictions = self.scaler.inverse_transform(
-            np.array(predictions).reshape(-1, 1)
+            np.asarray(predictions, dtype='float64').reshape(-1, 1)
         ).flatten()
 
         lower_bounds = self.scaler.inverse_transform(
-            np.array(lower_bounds).reshape(-1, 1)
+            np.asarray(lower_bounds, dtype='float64').reshape(-1, 1)
         ).flatten()
 
         upper_bounds = self.scaler.inverse_transform(
-            np.array(upper_bounds).reshape(-1, 1)
+            np.asarray(upper_bounds, dtype='float64').reshape(-1, 1)
         ).flatten()
 
-        return {
+        result = {
             'predicted_prices': predictions.round(2).tolist(),
             'lower_bound': lower_bounds.round(2).tolist(),
             'upper_bound': upper_bounds.round(2).tolist(),
-            'uncertainty': [round(u, 4) for u in uncertainties]
+            'uncertainty': [round(float(u), 4) for u in uncertainties],
+            'mode': mode,
         }
+        if adaptive_mc:
+            # Unused sample slots are NaN
+            result['mc_iterations_used'] = np.count_nonzero(~np.isnan(samples), axis=1).tolist()
+        if mode == 'analytic':
+            result['analytic_method'] = analytic_method
+        return result
+
+    def _recursive_samples_auto(self, current_sequence, horizon, mc_iterations, adaptive_mc):
+        """
+        Produce mean-feedback recursive MC samples with the cheapest available backend:
+        the stateful step model, then the in-graph horizon Loop, then one batched run
+        per day. Adaptive MC needs a per-day sample count and always uses the
+        windowed loop.
+
+        Returns:
+            np.ndarray: MC samples per day, shape (horizon, mc_iterations); NaN marks
+                samples skipped by adaptive early stopping
+        """
+        if adaptive_mc:
+            return self._recursive_samples_adaptive(current_sequence, horizon, mc_iterations)
+        if self.step_model is not None:
+            return self._recursive_samples_stateful(current_sequence, horizon, mc_iterations)
+        if self.horizon_model is not None:
+            return self._recursive_samples_in_graph(current_sequence, horizon, mc_iterations)
+        return self._recursive_samples(current_sequence, horizon, mc_iterations)
+
+    def _recursive_statistics(self, samples, confidence_level):
+        """
+        Mean-feedback recursive forecast statistics (normalized scale).
+
+        Args:
+            samples (np.ndarray): MC samples per day, shape (horizon, n); NaN = unused
+
+        Returns:
+            tuple: (predictions, lower_bounds, upper_bounds, uncertainties) arrays
+        """
+        horizon = samples.shape[0]
+        z_score = _z_score(confidence_level)
+
+        # Calculate statistics from MC samples
+        predictions = np.nanmean(samples, axis=1)
+        std_pred = np.nanstd(samples, axis=1)
+
+        # Increase uncertainty with prediction horizon (error accumulation)
+        # Each additional day adds uncertainty_growth more uncertainty (default: 2%)
+        uncertainty_factor = 1.0 + (self.uncertainty_growth * np.arange(horizon))
+        uncertainties = std_pred * uncertainty_factor
+
+        # Calculate confidence intervals (still in normalized scale)
+        lower_bounds = predictions - z_score * uncertainties
+        upper_bounds = predictions + z_score * uncertainties
+
+        return predictions, lower_bounds, upper_bounds, uncertainties
+
+    def _recursive_samples(self, current_sequence, horizon, mc_iterations):
+        """
+        Windowed recursive loop: one batched run of the sequence model per day.
+
+        The window lives in a preallocated ring buffer and each day's noisy batch is
+        written into a reused input tensor, so the loop itself does not allocate.
+
+        Returns:
+            np.ndarray: MC samples per day, shape (horizon, mc_iterations)
+        """
+        samples = np.empty((horizon, mc_iterations), dtype='float32')
+        noise = self._mc_noise_days(horizon, (mc_iterations, self.sequence_length, 1))
+        window = _RingWindow(current_sequence[:, 0])
+        X = np.empty((mc_iterations, self.sequence_length, 1), dtype='float32')
+
+        for day, day_noise in enumerate(noise):
+            # Monte Carlo Dropout: multiple forward passes with dropout enabled
+            np.add(window.view()[:, np.newaxis], day_noise, out=X)
+            samples[day] = self._run_batch(X)
+
+            # Update sequence for next prediction:
+            # Remove oldest value, append new prediction
+            window.push(samples[day].mean())
+
+        return samples
+
+    def _recursive_samples_adaptive(self, current_sequence, horizon, max_iterations):
+        """
+        Windowed recursive loop with convergence-based early stopping.
+
+        Each day draws mc_batch_size samples at a time and stops once both the
+        standard error of the mean (std / sqrt(n)) and of the std
+        (std / sqrt(2(n - 1))) are below mc_tolerance, or max_iterations is reached.
+
+        Returns:
+            np.ndarray: MC samples per day, shape (horizon, max_iterations), with NaN
+                in the slots that were not needed
+        """
+        samples = np.full((horizon, max_iterations), np.nan, dtype='float32')
+        noise = self._mc_noise_days(horizon, (max_iterations, self.sequence_length, 1))
+        window = _RingWindow(current_sequence[:, 0])
+        X = np.empty((max_iterations, self.sequence_length, 1), dtype='float32')
+        batch_size = max(2, self.mc_batch_size)
+
+        for day, day_noise in enumerate(noise):
+            n = 0
+            while True:
+                end = min(n + batch_size, max_iterations)
+                np.add(window.view()[:, np.newaxis], day_noise[n:end], out=X[:end - n])
+                samples[day, n:end] = self._run_batch(X[:end - n])
+                n = end
+                if n >= max_iterations:
+                    break
+
+                std = samples[day, :n].std()
+                se_mean = std / np.sqrt(n)
+                se_std = std / np.sqrt(2 * (n - 1))
+                if max(se_mean, se_std) < self.mc_tolerance:
+                    break
+
+            window.push(samples[day, :n].mean())
+
+        return samples
+
+    def _recursive_samples_stateful(self, current_sequence, horizon, mc_iterations):
+        """
+        Recursive loop on the step model: one timestep per day.
+
+        Each MC row noises every input once (warmup window, then each day's fed-back
+        mean) and keeps that noise in its state, where the windowed loop redraws it
+        over the whole window every day. A day's output sees the same amount of
+        input noise either way, so the bands match the windowed loop's to first order.
+
+        Returns:
+            np.ndarray: MC samples per day, shape (horizon, mc_iterations)
+        """
+        samples = np.empty((horizon, mc_iterations), dtype='float32')
+        noise = self._mc_noise_days(horizon, (mc_iterations, 1, 1))
+        X = np.empty((mc_iterations, 1, 1), dtype='float32')
+
+        # One recurrent state per MC sample; every row is fed the sample mean
+        states = self._warm_step_states(current_sequence, mc_iterations)
+        last_value = current_sequence[-1, 0]
+
+        for day, day_noise in enumerate(noise):
+            np.add(last_value, day_noise, out=X)
+            samples[day], states = self._run_step(X, states)
+            last_value = samples[day].mean()
+
+        return samples
+
+    def _recursive_samples_in_graph(self, current_sequence, horizon, mc_iterations):
+        """
+        Whole recursive loop inside onnxruntime via the horizon model (ONNX Loop).
+
+        Noise for every day and sample is drawn up front (the Loop takes it as one
+        input tensor), so a forecast costs a single InferenceSession.run.
+
+        Returns:
+            np.ndarray: MC samples per day, shape (horizon, mc_iterations)
+        """
+        window = current_sequence.reshape(1, self.sequence_length, 1).astype('float32')
+        noise = self._draw_mc_noise((horizon, mc_iterations, self.sequence_length, 1))
+        return self.horizon_model.run(['samples'], {
+            'window': window,
+            'horizon': np.array(horizon, dtype='int64'),
+            'noise': noise,
+        })[0]
+
+    def _predict_analytic(self, current_sequence, horizon, confidence_level,
+                          analytic_method, residual_std):
+        """
+        Deterministic recursive forecast with analytic intervals (normalized scale).
+
+        The forecast feeds back one clean prediction per day (one row per run).
+
+        - 'delta': std = 0.005 * ||J|| where J is the gradient of the model output
+          w.r.t. the last observed window, estimated with one batched run of
+          sequence_length + 1 forward differences. It grows with uncertainty_growth
+          like the MC std in 'recursive' mode.
+        - 'residual': the one-step backtesting error, converted to normalized scale,
+          accumulates as a random walk: std_day = residual_std * sqrt(day + 1).
+
+        Returns:
+            tuple: (predictions, lower_bounds, upper_bounds, uncertainties) arrays
+        """
+        predictions = np.empty(horizon, dtype='float32')
+
+        if self.step_model is not None:
+            states = self._warm_step_states(current_sequence, 1, noisy=False)
+            X = np.empty((1, 1, 1), dtype='float32')
+            X[0, 0, 0] = current_sequence[-1, 0]
+            for day in range(horizon):
+                predictions[day:day + 1], states = self._run_step(X, states)
+                X[0, 0, 0] = predictions[day]
+        else:
+            window = _RingWindow(current_sequence[:, 0])
+            for day in range(horizon):
+                predictions[day:day + 1] = self._run_batch(
+                    window.view().reshape(1, self.sequence_length, 1)
+                )
+                window.push(predictions[day])
+
+        days = np.arange(horizon)
+        if analytic_method == 'residual':
+            # Affine scaler: a price difference maps to normalized units by the scale
+            unit = self.scaler.transform([[1.0]])[0, 0] - self.scaler.transform([[0.0]])[0, 0]
+            uncertainties = abs(residual_std * unit) * np.sqrt(days + 1)
+        else:
+            uncertainties = self._delta_method_std(current_sequence) * (
+                1.0 + self.uncertainty_growth * days
+            )
+
+        z_score = _z_score(confidence_level)
+        lower_bounds = predictions - z_score * uncertainties
+        upper_bounds = predictions + z_score * uncertainties
+
+        return predictions, lower_bounds, upper_bounds, uncertainties
+
+    def _delta_method_std(self, current_sequence, step=0.005):
+        """
+        First-order std of the model output under i.i.d. N(0, 0.005²) input noise.
+
+        Row 0 is the clean window and row i + 1 perturbs timestep i by `step`, so the
+        whole finite-difference Jacobian costs one batched run.
+        """
+        n = self.sequence_length
+        X = np.repeat(current_sequence.reshape(1, n, 1), n + 1, axis=0).astype('float32')
+        X[np.arange(1, n + 1), np.arange(n), 0] += step
+        y = self._run_batch(X).astype('float64')
+        jacobian = (y[1:] - y[0]) / step
+        return 0.005 * np.sqrt(np.sum(jacobian ** 2))
+
+    def _predict_trajectories(self, current_sequence, horizon, confidence_level, mc_iterations):
+        """
+        Trajectory-ensemble forecast (normalized scale).
+
+        Keeps mc_iterations independent paths alive for the whole horizon. Each path
+        feeds back its own prediction, so the spread at day N reflects compounded
+        path divergence rather than the uncertainty_growth multiplier. All paths are
+        advanced together with one batched run per day.
+
+        Returns:
+            tuple: (predictions, lower_bounds, upper_bounds, uncertainties) arrays
+        """
+        # Path matrix, one row per day
+        paths = np.empty((horizon, mc_iterations), dtype='float32')
+
+        if self.step_model is not None:
+            noise = self._mc_noise_days(horizon, (mc_iterations, 1, 1))
+            X = np.empty((mc_iterations, 1, 1), dtype='float32')
+
+            # One recurrent state per path, warmed once from history. The last row is
+            # seeded with the last observed value so day 0 reads it as paths[day - 1];
+            # it is overwritten on the final day.
+            states = self._warm_step_states(current_sequence, mc_iterations)
+            paths[-1] = current_sequence[-1, 0]
+
+            for day, day_noise in enumerate(noise):
+                np.add(paths[day - 1][:, np.newaxis, np.newaxis], day_noise, out=X)
+                paths[day], states = self._run_step(X, states)
+        else:
+            noise = self._mc_noise_days(horizon, (mc_iterations, self.sequence_length, 1))
+            X = np.empty((mc_iterations, self.sequence_length, 1), dtype='float32')
+
+            # Rolling (paths × seq_len) window, every path starts from the same history
+            windows = _RingWindow(
+                np.repeat(current_sequence[:, 0][np.newaxis], mc_iterations, axis=0)
+            )
+
+            for day, day_noise in enumerate(noise):
+                np.add(windows.view()[:, :, np.newaxis], day_noise, out=X)
+                paths[day] = self._run_batch(X)
+
+                # Each path drops its oldest value and appends its own prediction
+                windows.push(paths[day])
+
+        # Empirical two-sided interval from the final path matrix
+        alpha = 1.0 - confidence_level
+        lower_bounds, upper_bounds = np.quantile(
+            paths, [alpha / 2, 1.0 - alpha / 2], axis=1
+        )
+
+        return paths.mean(axis=1), lower_bounds, upper_bounds, paths.std(axis=1)
 
 
 def generate_trading_dates(start_date, horizon):
@@ -0,0 +1,264 @@
+"""
+Price Store - Local Daily Bars With Incremental Refresh
+
+Every /predict/ call used to download the full 10-year history from the upstream
+provider, although only the newest bar changes between calls. Upstream calls take
+seconds and AlphaVantage allows 25 a day. The PriceHistory table keeps one columnar
+series per (ticker, provider), stored as an npz payload:
+
+  - first request: full download, stored with the requested start date
+  - later requests: served from the store; upstream is asked only for the bars from the
+    last stored date on, which are appended
+  - no upstream call while the store already holds the last completed session, or was
+    refreshed less than PRICE_STORE['MIN_REFRESH_SECONDS'] ago (covers market holidays)
+
+The refresh re-downloads the last stored bar. If its close changed, the provider has
+restated history (dividend/split adjustment), so the whole range is downloaded again
+rather than appending adjusted bars to unadjusted ones. When the incremental refresh
+fails the stored series is served as-is; store failures fall back to a plain download.
+
+warm_history does the same for a list of tickers with the provider's bulk downloads
+(used by manage.py prefetch_prices). A bulk request that fails is retried one ticker
+at a time; tickers that still fail are reported and the other batches go on.
+"""
+
+import io
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import PriceHistory
+
+
+def get_history(ticker, upstream, years=10):
+    """
+    Daily bars for the last `years` years, from the store where possible.
+
+    Args:
+        ticker (str): Ticker symbol
+        upstream (BaseDataProvider): Provider the missing bars are fetched from
+        years (int): History length (default: 10)
+
+    Returns:
+        pd.DataFrame: Bars with a DatetimeIndex named 'Date' and at least a 'Close' column
+
+    Raises:
+        ValueError: If the upstream provider has no data for the ticker
+    """
+    start = (datetime.now() - timedelta(days=years * 365)).date()
+    try:
+        entry = PriceHistory.objects.filter(ticker=ticker, source=upstream.name).first()
+    except DatabaseError:
+        return upstream.get_historical(ticker, years)
+
+    if entry is None or entry.history_start > start:
+        bars = _replace(ticker, upstream.name, start, entry, upstream.get_historical(ticker, years))
+        return _since(bars, start)
+
+    if not _needs_refresh(entry):
+        return _since(decode_bars(entry.payload), start)
+
+    try:
+        tail = upstream.get_historical_since(ticker, entry.last_date)
+    except Exception:
+        # Stale by the bars since the last refresh, but served
+        return _since(decode_bars(entry.payload), start)
+
+    bars = _append(entry, tail)
+    if bars is None:
+        bars = _replace(ticker, upstream.name, start, entry, upstream.get_historical(ticker, years))
+    return _since(bars, start)
+
+
+def warm_history(tickers, upstream, years=10, batch_size=100):
+    """
+    Bring the stored series of many tickers up to date with bulk downloads.
+
+    Missing tickers are downloaded in full and stale ones from their last stored
+    date, batch_size tickers per upstream request; current ones are skipped. If a
+    bulk request raises, its tickers are downloaded one at a time instead; those
+    that still fail are listed under 'failed'.
+
+    Args:
+        tickers (list): Ticker symbols
+        upstream (BaseDataProvider): Provider to download from
+        years (int): History length (default: 10)
+        batch_size (int): Tickers per bulk request (default: 100)
+
+    Returns:
+        dict: {'downloaded': [...], 'refreshed': [...], 'current': [...], 'failed': [...]}
+    """
+    start = (datetime.now() - timedelta(days=years * 365)).date()
+    entries = {
+        e.ticker: e for e in PriceHistory.objects.filter(ticker__in=tickers, source=upstream.name)
+    }
+    result = {'downloaded': [], 'refreshed': [], 'current': [], 'failed': []}
+
+    full, stale = [], []
+    for ticker in tickers:
+        entry = entries.get(ticker)
+        if entry is None or entry.history_start > start:
+            full.append(ticker)
+        elif _needs_refresh(entry):
+            stale.append(ticker)
+        else:
+            result['current'].append(ticker)
+
+    for batch in _batches(stale, batch_size):
+        since = min(entries[t].last_date for t in batch)
+        tails = _download_batch(
+            batch,
+            lambda tickers: upstream.get_historical_since_many(tickers, since),
+            lambda ticker: upstream.get_historical_since(ticker, since),
+        )
+        for ticker in batch:
+            if ticker not in tails:
+                result['failed'].append(ticker)
+            elif _append(entries[ticker], tails[ticker]) is None:
+                full.append(ticker)  # Restated history
+            else:
+                result['refreshed'].append(ticker)
+
+    for batch in _batches(full, batch_size):
+        frames = _download_batch(
+            batch,
+            lambda tickers: upstream.get_historical_many(tickers, years),
+            lambda ticker: upstream.get_historical(ticker, years),
+        )
+        for ticker in batch:
+            if ticker in frames:
+                _replace(ticker, upstream.name, start, entries.get(ticker), frames[ticker])
+                result['downloaded'].append(ticker)
+            else:
+                result['failed'].append(ticker)
+    return result
+
+
+def _download_batch(batch, bulk, single):
+    """bulk(batch) as {ticker: frame}; if it raises, single(ticker) for each ticker."""
+    try:
+        return bulk(batch)
+    except Exception as e:
+        print(f"✗ Bulk download of {len(batch)} tickers failed, retrying one at a time: {str(e)}")
+
+    frames = {}
+    for ticker in batch:
+        try:
+            frame = single(ticker)
+        except Exception:
+            continue
+        if not frame.empty:
+            frames[ticker] = frame
+    return frames
+
+
+def _append(entry, tail):
+    """
+    Append the bars of a get_historical_since(entry.last_date) download.
+
+    Returns:
+        pd.DataFrame | None: Merged bars, or None if the last stored bar was restated
+    """
+    bars = decode_bars(entry.payload)
+    tail = normalize_bars(tail)
+    # An empty download (e.g. a bare pd.DataFrame() from yahooquery) has no dates to
+    # compare; the refresh is still recorded
+    if not tail.empty:
+        if not _same_bar(bars, tail, pd.Timestamp(entry.last_date)):
+            return None
+        new_bars = tail[tail.index > bars.index[-1]].reindex(columns=bars.columns)
+        if len(new_bars):
+            bars = pd.concat([bars, new_bars])
+    _save(entry, bars)
+    return bars
+
+
+def _replace(ticker, source, start, entry, df):
+    """Store a full download as the ticker's series from start (entry may be None)."""
+    bars = normalize_bars(df)
+    if entry is None:
+        entry = PriceHistory(ticker=ticker, source=source)
+    entry.history_start = start
+    _save(entry, bars)
+    return bars
+
+
+def encode_bars(bars):
+    """Serialize a normalize_bars() frame to a compact npz payload."""
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        dates=bars.index.values.astype('datetime64[D]').astype('int64'),
+        columns=np.array(bars.columns, dtype=str),
+        values=bars.to_numpy(dtype='float64'),
+    )
+    return buffer.getvalue()
+
+
+def decode_bars(payload):
+    """Inverse of encode_bars()."""
+    stored = np.load(io.BytesIO(bytes(payload)))
+    dates = stored['dates'].astype('datetime64[D]').astype('datetime64[ns]')
+    index = pd.DatetimeIndex(dates, name='Date')
+    return pd.DataFrame(stored['values'], index=index, columns=stored['columns'].tolist())
+
+
+def normalize_bars(df):
+    """Sorted, de-duplicated, tz-naive daily index and float64 numeric columns."""
+    if df.empty:
+        return df
+    df = df.select_dtypes(include='number').astype('float64')
+    index = pd.to_datetime(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize().rename('Date')
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df
+
+
+def _save(entry, bars):
+    entry.payload = encode_bars(bars)
+    entry.first_date = bars.index[0].date()
+    entry.last_date = bars.index[-1].date()
+    entry.n_bars = len(bars)
+    entry.refreshed_at = timezone.now()
+    try:
+        entry.save()
+    except DatabaseError:
+        pass  # A lost store write only costs a larger download next time
+
+
+def _needs_refresh(entry):
+    if timezone.now() - entry.refreshed_at < timedelta(seconds=_min_refresh_seconds()):
+        return False
+    # Providers return bars up to yesterday; the last completed weekday session is
+    # the newest bar there can be
+    today = np.datetime64(datetime.now().date(), 'D')
+    last_session = np.busday_offset(today, -1, roll='forward')
+    return np.datetime64(entry.last_date, 'D') < last_session
+
+
+def _same_bar(bars, tail, last):
+    """True if the re-downloaded last stored bar still has the stored close."""
+    if last not in tail.index or 'Close' not in tail.columns:
+        return False
+    return bool(np.isclose(tail.at[last, 'Close'], bars.at[last, 'Close'], rtol=1e-6))
+
+
+def _batches(items, size):
+    size = max(size, 1)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _since(bars, start):
+    return bars[bars.index >= pd.Timestamp(start)]
+
+
+def _min_refresh_seconds():
+    from django.conf import settings
+
+    return getattr(settings, 'PRICE_STORE', {}).get('MIN_REFRESH_SECONDS', 0)
@@ -0,0 +1,119 @@
+"""
+Ticker Scaler Store - Persistent Per-Ticker Min-Max Scalers
+
+A min-max scaler is fully defined by the data min and max, and both are monotone
+aggregates: adding bars can only widen them. The TickerScaler table keeps them per
+ticker so requests look the scaler up instead of refitting, and fold in only the bars
+that arrived since the last request.
+
+One row per (ticker, scope):
+  - 'backtest': exactly the current training split [first bar, split boundary], so
+    backtest metrics depend only on the requested data. Reused while the first bar is
+    unchanged; a later split boundary folds in the new training bars. A different
+    first bar (the 10-year window moved) or an earlier boundary refits.
+  - 'forecast': expanding scaler over every bar seen for the ticker. New bars on either
+    side are folded in, so forecasts get a ticker-specific scale instead of the global
+    AAPL training scaler.
+
+A stored entry is only extended if its last bar still has the same close in the new
+data; restated history (e.g. split-adjusted prices) triggers a refit. Store failures
+never fail a prediction: the scaler is then fitted directly.
+"""
+
+import numpy as np
+import pandas as pd
+from django.db import DatabaseError
+
+from .data_pipeline import bar_dates
+from .models import TickerScaler
+from .scaling import AffineScaler
+
+
+def get_backtest_scaler(ticker, train_prices):
+    """
+    Scaler for a backtest training split.
+
+    Args:
+        ticker (str): Ticker symbol
+        train_prices (pd.Series): Training closes with a DatetimeIndex
+
+    Returns:
+        AffineScaler: Scaler fitted on exactly these bars
+    """
+    return _get_scaler(ticker, 'backtest', train_prices)
+
+
+def get_forecast_scaler(ticker, close_prices):
+    """
+    Scaler for forecasts: min/max over every bar seen for the ticker.
+
+    Args:
+        ticker (str): Ticker symbol
+        close_prices (pd.Series): Closes with a DatetimeIndex
+
+    Returns:
+        AffineScaler: Expanding per-ticker scaler
+    """
+    return _get_scaler(ticker, 'forecast', close_prices)
+
+
+def _get_scaler(ticker, scope, prices):
+    values = np.asarray(prices, dtype='float64').reshape(-1)
+    dates = bar_dates(prices)
+    if dates is None or not len(values):
+        return AffineScaler.fit(values.reshape(-1, 1))
+
+    try:
+        entry = TickerScaler.objects.filter(ticker=ticker, scope=scope).first()
+        aggregate = _updated_aggregate(entry, scope, dates, values)
+        if aggregate is None:
+            return AffineScaler.from_range(entry.data_min, entry.data_max)
+        TickerScaler.objects.update_or_create(ticker=ticker, scope=scope, defaults=aggregate)
+    except DatabaseError:
+        return AffineScaler.fit(values.reshape(-1, 1))
+    return AffineScaler.from_range(aggregate['data_min'], aggregate['data_max'])
+
+
+def _updated_aggregate(entry, scope, dates, values):
+    """
+    Fold new bars into a stored entry.
+
+    Returns:
+        dict | None: New field values, or None if the entry already covers the bars
+    """
+    new_bars = None
+    if entry is not None and _same_history(entry, dates, values):
+        first, last = np.datetime64(entry.first_date), np.datetime64(entry.last_date)
+        if scope == 'forecast':
+            new_bars = (dates < first) | (dates > last)
+        elif dates[0] == first and dates[-1] >= last:
+            new_bars = dates > last
+
+    if new_bars is None:
+        # No usable entry: fit on all bars
+        data_min, data_max = np.nanmin(values), np.nanmax(values)
+        first_date, last_date, n_bars = dates[0], dates[-1], len(values)
+    elif not new_bars.any():
+        return None
+    else:
+        added = values[new_bars]
+        data_min = np.fmin(entry.data_min, np.nanmin(added))
+        data_max = np.fmax(entry.data_max, np.nanmax(added))
+        first_date = min(np.datetime64(entry.first_date), dates[0])
+        last_date = max(np.datetime64(entry.last_date), dates[-1])
+        n_bars = entry.n_bars + int(new_bars.sum())
+
+    return {
+        'first_date': pd.Timestamp(first_date).date(),
+        'last_date': pd.Timestamp(last_date).date(),
+        'last_close': float(values[dates == last_date][-1]),
+        'n_bars': n_bars,
+        'data_min': float(data_min),
+        'data_max': float(data_max),
+    }
+
+
+def _same_history(entry, dates, values):
+    """True if the entry's last bar is in the new data with an unchanged close."""
+    found = np.flatnonzero(dates == np.datetime64(entry.last_date))
+    return bool(len(found)) and np.isclose(values[found[-1]], entry.last_close, rtol=1e-6)
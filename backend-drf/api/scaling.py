@@ -0,0 +1,157 @@
+"""
+Affine Scaler - Dependency-Free Min-Max Scaling
+
+Drop-in replacement for the fitted sklearn MinMaxScaler used at inference time. A
+min-max scaler is the affine map x * scale_ + min_, so the artifact is just those
+two vectors, stored as JSON:
+
+    {"format": "affine-scaler", "version": 1, "feature_range": [0, 1],
+     "scale": [...], "min": [...], "data_min": [...], "data_max": [...]}
+
+transform/inverse_transform match sklearn's results without sklearn's import and
+input validation; the *_inplace variants rewrite a float array in place for hot loops.
+
+Convert a pickled MinMaxScaler with: python manage.py generate_scaler --convert
+"""
+
+import json
+
+import numpy as np
+
+
+SCALER_FORMAT = 'affine-scaler'
+SCALER_FORMAT_VERSION = 1
+
+
+class AffineScaler:
+    """
+    Per-feature affine scaler: X_scaled = X * scale_ + min_.
+
+    Usage:
+        scaler = AffineScaler.fit(train_prices.reshape(-1, 1))
+        scaled = scaler.transform(prices.reshape(-1, 1))
+        scaler.inverse_transform_inplace(predictions)   # float32, no allocation
+    """
+
+    def __init__(self, scale, min_, data_min=None, data_max=None, feature_range=(0, 1)):
+        """
+        Args:
+            scale (array-like): Per-feature scale
+            min_ (array-like): Per-feature offset
+            data_min (array-like): Per-feature minimum seen in fit (informational)
+            data_max (array-like): Per-feature maximum seen in fit (informational)
+            feature_range (tuple): Target range (default: (0, 1))
+        """
+        self.scale_ = np.asarray(scale, dtype=np.float64).reshape(-1)
+        self.min_ = np.asarray(min_, dtype=np.float64).reshape(-1)
+        if self.scale_.shape != self.min_.shape:
+            raise ValueError(
+                f"scale and min must have the same length, got {self.scale_.size} and {self.min_.size}"
+            )
+        self.data_min_ = None if data_min is None else np.asarray(data_min, dtype=np.float64).reshape(-1)
+        self.data_max_ = None if data_max is None else np.asarray(data_max, dtype=np.float64).reshape(-1)
+        self.feature_range = tuple(feature_range)
+        self.n_features_in_ = self.scale_.size
+
+    @classmethod
+    def fit(cls, X, feature_range=(0, 1)):
+        """
+        Fit on X (n_samples, n_features) the way MinMaxScaler does, ignoring NaNs.
+
+        Returns:
+            AffineScaler: Fitted scaler
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        return cls.from_range(np.nanmin(X, axis=0), np.nanmax(X, axis=0), feature_range)
+
+    @classmethod
+    def from_range(cls, data_min, data_max, feature_range=(0, 1)):
+        """
+        Build the min-max scaler for known per-feature data minima and maxima.
+
+        Returns:
+            AffineScaler: Scaler mapping [data_min, data_max] onto feature_range
+        """
+        data_min = np.atleast_1d(np.asarray(data_min, dtype=np.float64))
+        data_max = np.atleast_1d(np.asarray(data_max, dtype=np.float64))
+        data_range = data_max - data_min
+        # Constant features get scale 1 instead of a division by zero (as in sklearn)
+        data_range[data_range < 10 * np.finfo(np.float64).eps] = 1.0
+        low, high = feature_range
+        scale = (high - low) / data_range
+        return cls(scale, low - data_min * scale, data_min, data_max, feature_range)
+
+    @classmethod
+    def from_sklearn(cls, scaler):
+        """Build from a fitted sklearn MinMaxScaler."""
+        return cls(scaler.scale_, scaler.min_, scaler.data_min_, scaler.data_max_, scaler.feature_range)
+
+    def transform(self, X):
+        """Scale X; float32 input stays float32, anything else becomes float64."""
+        X = _as_float_array(X)
+        return X * self.scale_.astype(X.dtype) + self.min_.astype(X.dtype)
+
+    def inverse_transform(self, X):
+        """Undo transform; float32 input stays float32, anything else becomes float64."""
+        X = _as_float_array(X)
+        return (X - self.min_.astype(X.dtype)) / self.scale_.astype(X.dtype)
+
+    def transform_inplace(self, X):
+        """Scale a floating ndarray in place and return it."""
+        X *= self.scale_.astype(X.dtype)
+        X += self.min_.astype(X.dtype)
+        return X
+
+    def inverse_transform_inplace(self, X):
+        """Undo transform on a floating ndarray in place and return it."""
+        X -= self.min_.astype(X.dtype)
+        X /= self.scale_.astype(X.dtype)
+        return X
+
+    def to_dict(self):
+        return {
+            'format': SCALER_FORMAT,
+            'version': SCALER_FORMAT_VERSION,
+            'feature_range': list(self.feature_range),
+            'scale': self.scale_.tolist(),
+            'min': self.min_.tolist(),
+            'data_min': None if self.data_min_ is None else self.data_min_.tolist(),
+            'data_max': None if self.data_max_ is None else self.data_max_.tolist(),
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a scaler saved with save().
+
+        Raises:
+            ValueError: If the file is not an affine-scaler artifact
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('format') != SCALER_FORMAT or data.get('version') != SCALER_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported scaler file {path}: expected format '{SCALER_FORMAT}' "
+                f"version {SCALER_FORMAT_VERSION}"
+            )
+        return cls(
+            data['scale'], data['min'], data.get('data_min'), data.get('data_max'),
+            data.get('feature_range', (0, 1)),
+        )
+
+    def __repr__(self):
+        return f"AffineScaler(scale={self.scale_.tolist()}, min={self.min_.tolist()})"
+
+
+def _as_float_array(X):
+    X = np.asarray(X)
+    if X.dtype != np.float32:
+        X = X.astype(np.float64, copy=False)
+    return X
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from .models import ModelConfig, ProviderConfig, PredictionRecord
+from .ml_manager import MLModelManager
+from .prediction_engine import PREDICTION_MODES, ANALYTIC_METHODS
+from .walk_forward import WALK_FORWARD_SCHEMES
 
 
 class StockPredictionSerializers(serializers.Serializer):
@@ -32,13 +35,61 @@ class StockPredictionSerializers(serializers.Serializer):
         help_text="Confidence level for prediction intervals (0.95 = 95% CI)"
     )
 
+    prediction_mode = serializers.ChoiceField(
+        choices=PREDICTION_MODES,
+        required=False,
+        default='recursive',
+        help_text=(
+            "Forecast mode: 'recursive' (mean feedback), 'trajectory' (independent MC paths) "
+            "or 'analytic' (no Monte Carlo, cheapest)"
+        )
+    )
+
+    analytic_method = serializers.ChoiceField(
+        choices=ANALYTIC_METHODS,
+        required=False,
+        default='delta',
+        help_text="Interval model for analytic mode: 'delta' (input-noise Jacobian) or 'residual' (backtest RMSE)"
+    )
+
+    adaptive_mc = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Stop MC sampling early once estimates converge (recursive mode only)"
+    )
+
+    walk_forward_folds = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=20,
+        default=0,
+        help_text="Walk-forward backtest folds scored in parallel (0 or 1 = single split only)"
+    )
+
+    walk_forward_scheme = serializers.ChoiceField(
+        choices=WALK_FORWARD_SCHEMES,
+        required=False,
+        default='expanding',
+        help_text="Walk-forward training window: 'expanding' (from the first bar) or 'rolling' (fixed length)"
+    )
+
+    def validate_walk_forward_folds(self, value):
+        from django.conf import settings
+
+        max_folds = settings.WALK_FORWARD['MAX_FOLDS']
+        if value > max_folds:
+            raise serializers.ValidationError(
+                f"Walk-forward folds must be at most {max_folds}."
+            )
+        return value
+
 
 class ModelConfigSerializer(serializers.ModelSerializer):
     class Meta:
         model = ModelConfig
         fields = [
-            'id', 'name', 'version', 'architecture', 'sequence_length',
-            'mc_iterations', 'uncertainty_growth', 'default_confidence',
+            'id', 'name', 'version', 'architecture', 'model_version', 'sequence_length',
+            'mc_iterations', 'noise_scheme', 'uncertainty_growth', 'default_confidence',
             'technical_indicators', 'is_active', 'metrics', 'notes', 'created_at',
         ]
         read_only_fields = ['id', 'version', 'is_active', 'metrics', 'created_at']
@@ -51,6 +102,24 @@ class ModelConfigSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate(self, attrs):
+        architecture = attrs.get(
+            'architecture', self.instance.architecture if self.instance else 'lstm'
+        )
+        model_version = attrs.get(
+            'model_version', self.instance.model_version if self.instance else ''
+        )
+        if model_version:
+            available = MLModelManager.get_instance().list_versions(architecture)
+            if model_version not in available:
+                raise serializers.ValidationError({
+                    'model_version': (
+                        f"Version '{model_version}' not found for {architecture.upper()}. "
+                        f"Available: {', '.join(v for v in available if v) or 'none'}"
+                    )
+                })
+        return attrs
+
     def validate_sequence_length(self, value):
         allowed = [50, 100, 150]
         if value not in allowed:
@@ -0,0 +1,110 @@
+"""
+Single-Flight - Coalescing of Concurrent Identical Downloads
+
+At market open several users request the same hot tickers at once; without
+coordination each request fires its own upstream download. Two layers make the
+first caller for a key do the work and the others reuse it:
+
+  - SingleFlight: within a process, concurrent callers for a key wait on the
+    leader's future and get its result (or its exception)
+  - file_lock: across gunicorn workers, an advisory flock on a per-key lock file;
+    the worker that waited re-checks the shared cache before fetching
+
+file_lock degrades to no cross-process locking where fcntl is unavailable (Windows)
+and gives up waiting after SINGLE_FLIGHT['LOCK_TIMEOUT'] seconds, so a stuck
+download delays other workers but never blocks them forever.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class SingleFlight:
+    """
+    Runs fn once per key among concurrent callers in this process.
+
+    Usage:
+        flights = SingleFlight()
+        payload = flights.do(key, lambda: download(ticker))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Call fn(), or wait for the in-flight call with the same key.
+
+        Returns:
+            The leader's result; its exception is raised in every waiting caller
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+@contextmanager
+def file_lock(name):
+    """
+    Advisory cross-process lock for a key.
+
+    Yields:
+        bool: True if the lock is held, False if it could not be taken in time
+            (or is unsupported on this platform); callers proceed either way
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield False
+        return
+
+    lock_dir, timeout = _lock_settings()
+    os.makedirs(lock_dir, exist_ok=True)
+    path = os.path.join(lock_dir, hashlib.sha1(name.encode()).hexdigest() + '.lock')
+    with open(path, 'a') as f:
+        deadline = time.monotonic() + timeout
+        acquired = False
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.05)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _lock_settings():
+    from django.conf import settings
+
+    options = getattr(settings, 'SINGLE_FLIGHT', {})
+    lock_dir = options.get('LOCK_DIR') or os.path.join(tempfile.gettempdir(), 'neurostock-locks')
+    return lock_dir, options.get('LOCK_TIMEOUT', 60)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from django.test import TestCase
+
+from api.backtest_cache import BacktestCache
+from api.data_pipeline import run_backtest
+from api.scaling import AffineScaler
+from api.tests.test_prediction_engine import WindowMeanModel
+
+
+def _closes(n=600, start='2020-01-01'):
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range(start, periods=n + 1, name='Date')
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n + 1))), index=index)
+
+
+class BacktestCacheTests(TestCase):
+    def setUp(self):
+        self.model = WindowMeanModel()
+        # A fixed scaler keeps the scale constant while the split moves
+        self.scaler = AffineScaler.fit(np.array([[50.0], [200.0]]))
+
+    def _run(self, closes, fingerprint='model.onnx:1:100', scaler=None):
+        cache = BacktestCache('AAPL', 'lstm', '', fingerprint)
+        return run_backtest(
+            closes, self.model, scaler_factory=lambda train: scaler or self.scaler,
+            chunk_size=64, cache=cache,
+        )
+
+    def test_repeat_backtest_infers_nothing(self):
+        closes = _closes().iloc[:-1]
+        first = self._run(closes)
+        second = self._run(closes)
+        self.assertEqual(first['windows_inferred'], len(first['y_predicted']))
+        self.assertEqual(second['windows_inferred'], 0)
+        np.testing.assert_array_equal(second['y_predicted'], first['y_predicted'])
+        self.assertEqual(second['metrics'], first['metrics'])
+
+    def test_new_bar_infers_only_the_new_window(self):
+        closes = _closes()
+        self._run(closes.iloc[:-1])
+        rolled = self._run(closes.iloc[1:])  # Window moved forward by one bar
+
+        uncached = run_backtest(closes.iloc[1:], self.model, scaler_factory=lambda train: self.scaler)
+        self.assertEqual(rolled['windows_inferred'], 1)
+        np.testing.assert_allclose(rolled['y_predicted'], uncached['y_predicted'], rtol=1e-6)
+
+    def test_model_or_scaler_change_rescores_everything(self):
+        closes = _closes().iloc[:-1]
+        self._run(closes)
+        retrained = self._run(closes, fingerprint='model.onnx:2:100')
+        self.assertEqual(retrained['windows_inferred'], len(retrained['y_predicted']))
+
+        rescaled = self._run(closes, fingerprint='model.onnx:2:100',
+                             scaler=AffineScaler.fit(np.array([[40.0], [250.0]])))
+        self.assertEqual(rescaled['windows_inferred'], len(rescaled['y_predicted']))
+
+    def test_restated_history_misses(self):
+        closes = _closes().iloc[:-1]
+        self._run(closes)
+        restated = closes.copy()
+        restated.iloc[-50] *= 1.01
+        result = self._run(restated)
+        self.assertEqual(result['windows_inferred'], len(result['y_predicted']))
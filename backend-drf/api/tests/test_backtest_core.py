@@ -0,0 +1,60 @@
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.metrics import mean_squared_error, r2_score
+
+from api.backtest_core import StreamingRegressionMetrics, create_sequences
+
+
+class CreateSequencesTests(SimpleTestCase):
+    def test_matches_loop_construction(self):
+        data = np.random.default_rng(0).random((250, 1)).astype('float32')
+        X, y = create_sequences(data, sequence_length=100)
+
+        expected_X = np.array([data[i:i + 100] for i in range(len(data) - 100)])
+        expected_y = np.array([data[i + 100, 0] for i in range(len(data) - 100)])
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+        self.assertEqual(X.dtype, np.float32)
+
+    def test_returns_read_only_views(self):
+        data = np.arange(10, dtype='float64')
+        X, y = create_sequences(data, sequence_length=3)
+        self.assertTrue(np.shares_memory(X, data))
+        self.assertFalse(X.flags.writeable)
+        self.assertFalse(y.flags.writeable)
+        np.testing.assert_array_equal(X[0, :, 0], [0, 1, 2])
+        self.assertEqual(y[0], 3)
+
+    def test_rejects_short_series(self):
+        with self.assertRaises(ValueError):
+            create_sequences(np.zeros(100), sequence_length=100)
+
+
+class StreamingRegressionMetricsTests(SimpleTestCase):
+    def test_chunked_matches_batch_metrics(self):
+        rng = np.random.default_rng(0)
+        # Prices far from zero, where a naive sum of squares loses precision
+        y_true = 10_000 + np.cumsum(rng.normal(0, 1, 3000))
+        y_pred = y_true + rng.normal(0, 2, 3000)
+
+        metrics = StreamingRegressionMetrics()
+        for start in range(0, len(y_true), 256):
+            metrics.update(y_true[start:start + 256], y_pred[start:start + 256])
+        result = metrics.result()
+
+        mse = mean_squared_error(y_true, y_pred)
+        self.assertAlmostEqual(result['mse'], mse, places=9)
+        self.assertAlmostEqual(result['rmse'], np.sqrt(mse), places=9)
+        self.assertAlmostEqual(result['r2'], r2_score(y_true, y_pred), places=9)
+
+    def test_constant_target(self):
+        metrics = StreamingRegressionMetrics()
+        metrics.update(np.full(5, 3.0), np.full(5, 3.0))
+        self.assertEqual(metrics.result()['r2'], 1.0)
+
+        metrics.update(np.full(5, 3.0), np.full(5, 4.0))
+        self.assertEqual(metrics.result()['r2'], 0.0)
+
+    def test_empty_raises(self):
+        with self.assertRaises(ValueError):
+            StreamingRegressionMetrics().result()
@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+
+from api.history_cache import seconds_until_close
+
+
+NEW_YORK = ZoneInfo('America/New_York')
+HOUR = 3600
+
+
+class SecondsUntilCloseTests(SimpleTestCase):
+    def _hours(self, *args, tz=NEW_YORK):
+        return seconds_until_close(now=datetime(*args, tzinfo=tz)) / HOUR
+
+    def test_before_close_expires_at_todays_close(self):
+        self.assertEqual(self._hours(2024, 6, 4, 10, 0), 6)  # Tuesday
+
+    def test_after_close_expires_at_next_close(self):
+        self.assertEqual(self._hours(2024, 6, 4, 17, 0), 23)
+        self.assertEqual(self._hours(2024, 6, 4, 16, 0), 24)  # At the close itself
+
+    def test_weekend_is_skipped(self):
+        self.assertEqual(self._hours(2024, 6, 7, 17, 0), 71)  # Friday -> Monday
+        self.assertEqual(self._hours(2024, 6, 8, 12, 0), 52)  # Saturday -> Monday
+
+    def test_other_timezones_are_converted(self):
+        # 14:00 UTC is 10:00 in New York (EDT)
+        self.assertEqual(self._hours(2024, 6, 4, 14, 0, tz=timezone.utc), 6)
+
+    def test_dst_change_is_real_elapsed_time(self):
+        # Clocks spring forward on Sunday 2024-03-10: one hour less than wall time
+        self.assertEqual(self._hours(2024, 3, 8, 17, 0), 70)
+
+    def test_custom_exchange(self):
+        seconds = seconds_until_close('Europe/London', '16:30',
+                                      now=datetime(2024, 6, 4, 16, 0, tzinfo=ZoneInfo('Europe/London')))
+        self.assertEqual(seconds, 30 * 60)
@@ -0,0 +1,110 @@
+import threading
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from api.inference_dispatcher import BatchingSession
+
+
+class _Input:
+    def __init__(self, name):
+        self.name = name
+        self.shape = ['batch', 3, 1]
+
+
+class RecordingSession:
+    """Doubles its input; the first run blocks until released so callers can queue up."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def get_inputs(self):
+        return [_Input('x')]
+
+    def get_outputs(self):
+        return [_Input('y')]
+
+    def run(self, output_names, feed, run_options=None):
+        X = feed['x']
+        self.batch_sizes.append(X.shape[0])
+        if len(self.batch_sizes) == 1:
+            self.started.set()
+            self.release.wait(5)
+        return [X[:, :, 0] * 2]
+
+
+class BatchingSessionTests(SimpleTestCase):
+    def setUp(self):
+        self.session = RecordingSession()
+        self.batching = BatchingSession(self.session, max_batch_size=64)
+        self.addCleanup(self.batching.close)
+
+    def _call_in_thread(self, X, results, key):
+        thread = threading.Thread(
+            target=lambda: results.__setitem__(key, self.batching.run(None, {'x': X})[0])
+        )
+        thread.start()
+        return thread
+
+    def _queue_behind_blocked_run(self, feeds):
+        """Start one blocking call, queue the feeds behind it, then release."""
+        results = {}
+        threads = [self._call_in_thread(np.zeros((1, 3, 1), 'float32'), results, 'first')]
+        self.assertTrue(self.session.started.wait(5))
+        for key, X in feeds.items():
+            threads.append(self._call_in_thread(X, results, key))
+        # Wait until every queued call is in the batcher's queue
+        for _ in range(500):
+            if self.batching._queue.qsize() == len(feeds):
+                break
+            threading.Event().wait(0.01)
+        self.session.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_calls_merge_and_split_back(self):
+        feeds = {
+            'a': np.full((2, 3, 1), 1.0, 'float32'),
+            'b': np.full((3, 3, 1), 2.0, 'float32'),
+            'c': np.full((1, 3, 1), 3.0, 'float32'),
+        }
+        results = self._queue_behind_blocked_run(feeds)
+
+        self.assertEqual(self.session.batch_sizes, [1, 6])
+        for key, X in feeds.items():
+            np.testing.assert_array_equal(results[key], X[:, :, 0] * 2)
+
+    def test_mismatched_signatures_run_separately(self):
+        feeds = {
+            'a': np.ones((2, 3, 1), 'float32'),
+            'b': np.ones((2, 4, 1), 'float32'),
+        }
+        results = self._queue_behind_blocked_run(feeds)
+
+        self.assertEqual(sorted(self.session.batch_sizes), [1, 2, 2])
+        for key, X in feeds.items():
+            np.testing.assert_array_equal(results[key], X[:, :, 0] * 2)
+
+    def test_lone_caller_runs_unmerged(self):
+        self.session.release.set()
+        X = np.arange(6, dtype='float32').reshape(2, 3, 1)
+        np.testing.assert_array_equal(self.batching.run(None, {'x': X})[0], X[:, :, 0] * 2)
+        self.assertEqual(self.session.batch_sizes, [2])
+
+    def test_large_calls_bypass_the_queue(self):
+        self.session.release.set()
+        X = np.ones((64, 3, 1), 'float32')
+        self.batching.run(None, {'x': X})
+        self.assertIsNone(self.batching._thread)
+
+    def test_errors_reach_every_merged_caller(self):
+        def fail(output_names, feed, run_options=None):
+            raise RuntimeError('boom')
+
+        self.session.release.set()
+        self.session.run = fail
+        with self.assertRaisesMessage(RuntimeError, 'boom'):
+            self.batching.run(None, {'x': np.ones((1, 3, 1), 'float32')})
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import threading
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from api.inference_server import InferenceServer, RemoteSession
+from api.ml_manager import MLModelManager
+from api.tests.test_prediction_engine import _sequence_model
+
+
+class InferenceServerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.session = _sequence_model()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = os.path.join(tmp.name, 'inference.sock')
+
+        manager = mock.Mock()
+        manager.get_model.return_value = self.session
+        manager.get_step_model.return_value = None
+        self.server = InferenceServer(self.socket_path, manager)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_run_round_trip_matches_local_session(self):
+        remote = RemoteSession.connect(self.socket_path, 'lstm', 'sequence', timeout=10)
+        self.assertEqual(
+            [(i.name, i.shape) for i in remote.get_inputs()],
+            [(i.name, i.shape) for i in self.session.get_inputs()],
+        )
+
+        name = remote.get_inputs()[0].name
+        X = np.random.default_rng(0).random((7, 100, 1), dtype=np.float32)
+        expected = self.session.run(None, {name: X})[0]
+        # The second call reuses the thread's connection
+        for _ in range(2):
+            outputs = remote.run(None, {name: X})
+            self.assertEqual(len(outputs), 1)
+            self.assertEqual(outputs[0].dtype, expected.dtype)
+            np.testing.assert_array_equal(outputs[0], expected)
+
+    def test_missing_model_connects_to_none(self):
+        self.assertIsNone(RemoteSession.connect(self.socket_path, 'lstm', 'step', timeout=10))
+
+    def test_server_errors_reach_the_client(self):
+        remote = RemoteSession.connect(self.socket_path, 'lstm', 'sequence', timeout=10)
+        with self.assertRaisesRegex(RuntimeError, 'Inference server error'):
+            remote.run(None, {'not_an_input': np.zeros((1, 100, 1), dtype=np.float32)})
+
+
+@override_settings(INFERENCE_SERVER={'SOCKET': '/nonexistent/neurostock.sock', 'TIMEOUT': 1},
+                   ONNX_OPTIMIZED_MODEL_DIR='')
+class RemoteFallbackTests(SimpleTestCase):
+    def setUp(self):
+        MLModelManager.reset()
+        self.addCleanup(MLModelManager.reset)
+
+    def test_unreachable_server_loads_the_model_locally(self):
+        with mock.patch('sys.stdout'):
+            session = MLModelManager.get_instance().get_model(architecture='lstm')
+        self.assertNotIsInstance(session, RemoteSession)
+        X = np.zeros((2, 100, 1), dtype=np.float32)
+        self.assertEqual(session.run(None, {session.get_inputs()[0].name: X})[0].shape, (2, 1))
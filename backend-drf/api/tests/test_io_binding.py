@@ -0,0 +1,91 @@
+import importlib.util
+import unittest
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from api.io_binding import BoundSession
+from api.prediction_engine import FuturePredictionEngine
+from api.scaling import AffineScaler
+from api.tests.test_prediction_engine import WindowMeanModel
+
+
+HIDDEN_SIZE = 4
+
+
+def _gru_weights():
+    from onnx import numpy_helper
+
+    rng = np.random.default_rng(0)
+    weights = {
+        'W': rng.normal(0, 0.5, (1, 3 * HIDDEN_SIZE, 1)),
+        'R': rng.normal(0, 0.5, (1, 3 * HIDDEN_SIZE, HIDDEN_SIZE)),
+        'B': rng.normal(0, 0.1, (1, 6 * HIDDEN_SIZE)),
+        'W_out': rng.normal(0, 0.5, (HIDDEN_SIZE, 1)),
+    }
+    initializers = [numpy_helper.from_array(value.astype('float32'), name)
+                    for name, value in weights.items()]
+    initializers.append(numpy_helper.from_array(np.array([0]), 'axis_0'))
+    return initializers
+
+
+def _gru_model(stateful):
+    """
+    Tiny GRU with the exported signatures: the step model (x, h) -> (y, h') when
+    stateful, otherwise the sequence model x -> y starting from a zero state.
+    Both share the same weights.
+    """
+    from onnx import TensorProto, helper
+
+    inputs = [helper.make_tensor_value_info('x', TensorProto.FLOAT, ['batch', 'T', 1])]
+    outputs = [helper.make_tensor_value_info('y', TensorProto.FLOAT, ['batch', 1])]
+    nodes = [helper.make_node('Transpose', ['x'], ['x_time_major'], perm=[1, 0, 2])]
+    gru_inputs = ['x_time_major', 'W', 'R', 'B']
+    if stateful:
+        inputs.append(helper.make_tensor_value_info('h', TensorProto.FLOAT, ['batch', HIDDEN_SIZE]))
+        outputs.append(helper.make_tensor_value_info('h_out', TensorProto.FLOAT, ['batch', HIDDEN_SIZE]))
+        nodes.append(helper.make_node('Unsqueeze', ['h', 'axis_0'], ['h0']))
+        gru_inputs += ['', 'h0']
+    nodes += [
+        helper.make_node('GRU', gru_inputs, ['', 'h_last'], hidden_size=HIDDEN_SIZE),
+        helper.make_node('Squeeze', ['h_last', 'axis_0'], ['h_out']),
+        helper.make_node('MatMul', ['h_out', 'W_out'], ['y']),
+    ]
+    graph = helper.make_graph(nodes, 'gru', inputs, outputs, _gru_weights())
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 17)], ir_version=8)
+    return model.SerializeToString()
+
+
+def _gru_step_model():
+    return _gru_model(stateful=True)
+
+
+@unittest.skipUnless(importlib.util.find_spec('onnx'), 'requires the onnx package')
+class BoundSessionTests(SimpleTestCase):
+    def setUp(self):
+        import onnxruntime as ort
+
+        self.raw = ort.InferenceSession(_gru_step_model(), providers=['CPUExecutionProvider'])
+        self.bound = BoundSession(self.raw)
+
+    def test_fed_back_states_match_plain_session(self):
+        x = np.full((3, 1, 1), 0.5, dtype='float32')
+        raw_h = bound_h = np.zeros((3, HIDDEN_SIZE), dtype='float32')
+        for _ in range(5):
+            raw_y, raw_h = self.raw.run(None, {'x': x, 'h': raw_h})
+            bound_y, bound_h = self.bound.run(None, {'x': x, 'h': bound_h})
+            np.testing.assert_allclose(bound_y, raw_y, rtol=1e-6)
+            np.testing.assert_allclose(bound_h, raw_h, rtol=1e-6)
+
+    def test_stateful_forecast_matches_plain_session(self):
+        scaler = AffineScaler.fit(np.array([[0.0], [100.0]]))
+        prices = 50 + 10 * np.sin(np.linspace(0, 12, 150))
+        forecasts = []
+        for step_model in (self.raw, self.bound):
+            engine = FuturePredictionEngine(
+                WindowMeanModel(), scaler, step_model=step_model, noise_scheme='antithetic', seed=3
+            )
+            forecasts.append(engine.predict_future(prices, horizon=10, mc_iterations=8))
+
+        for key in ('predicted_prices', 'lower_bound', 'upper_bound'):
+            np.testing.assert_allclose(forecasts[1][key], forecasts[0][key], rtol=1e-5)
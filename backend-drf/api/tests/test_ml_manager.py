@@ -0,0 +1,117 @@
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from api.ml_manager import MLModelManager
+
+
+@override_settings(ONNX_OPTIMIZED_MODEL_DIR='', INFERENCE_SERVER={})
+class PreloadTests(SimpleTestCase):
+    def setUp(self):
+        MLModelManager.reset()
+        self.addCleanup(MLModelManager.reset)
+
+    def test_preload_loads_and_warms_available_models(self):
+        manager = MLModelManager.get_instance()
+        with mock.patch('sys.stdout'):
+            timings = manager.preload(warmup_batch=4)
+
+        # Only the LSTM sequence model ships with the repo
+        self.assertEqual(set(timings), {'scaler', 'lstm'})
+        self.assertEqual(set(timings['lstm']), {'load_ms', 'warmup_ms'})
+        loaded = [s['key'] for s in manager.registry_stats() if s['loaded']]
+        self.assertEqual(loaded, [('sequence', 'lstm', '')])
+
+        # Requests reuse the preloaded session and scaler
+        with mock.patch.object(manager, '_create_session') as create:
+            manager.get_model(architecture='lstm')
+            manager.get_training_scaler()
+        create.assert_not_called()
+
+    def test_warmup_feed_sizes_symbolic_axes(self):
+        session = mock.Mock()
+        session.get_inputs.return_value = [
+            mock.Mock(shape=['batch', 100, 1], type='tensor(float)'),
+            mock.Mock(shape=['batch', 'T', 1], type='tensor(float)'),
+            mock.Mock(shape=[], type='tensor(int64)'),
+        ]
+        for i, arg in enumerate(session.get_inputs.return_value):
+            arg.name = f'input_{i}'
+
+        feed = MLModelManager._warmup_feed(session, batch_size=8)
+        self.assertEqual(feed['input_0'].shape, (8, 100, 1))
+        self.assertEqual(feed['input_1'].shape, (8, 1, 1))
+        self.assertEqual(feed['input_2'], 1)
+
+
+TEST_PROFILE = {
+    'graph_optimization_level': 'extended',
+    'intra_op_num_threads': 2,
+    'inter_op_num_threads': 1,
+    'execution_mode': 'parallel',
+    'enable_cpu_mem_arena': False,
+    'enable_mem_pattern': False,
+}
+
+
+class SessionProfileTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        overrides = override_settings(
+            ONNX_SESSION_PROFILES={'test': TEST_PROFILE}, ONNX_SESSION_PROFILE='test',
+            ONNX_OPTIMIZED_MODEL_DIR=self.cache_dir,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def _create(self):
+        with mock.patch('sys.stdout'):
+            return MLModelManager._create_session(MLModelManager.MODEL_PATHS['lstm'])
+
+    def test_profile_sets_session_options(self):
+        import onnxruntime as ort
+
+        with mock.patch.object(ort, 'InferenceSession', wraps=ort.InferenceSession) as create:
+            self._create()
+        # onnxruntime may fall back to sequential execution: check what was requested
+        options = create.call_args.kwargs['sess_options']
+        self.assertEqual(options.intra_op_num_threads, 2)
+        self.assertEqual(options.inter_op_num_threads, 1)
+        self.assertEqual(options.execution_mode, ort.ExecutionMode.ORT_PARALLEL)
+        self.assertFalse(options.enable_cpu_mem_arena)
+        self.assertFalse(options.enable_mem_pattern)
+        self.assertEqual(options.graph_optimization_level,
+                         ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED)
+
+    def test_optimized_graph_is_cached_and_reused(self):
+        import onnxruntime as ort
+
+        first = self._create()
+        cached = os.listdir(self.cache_dir)
+        self.assertEqual(len(cached), 1)
+        self.assertTrue(cached[0].endswith(f'.ort{ort.__version__}.extended.onnx'))
+        cached_path = os.path.join(self.cache_dir, cached[0])
+        written = os.stat(cached_path).st_mtime_ns
+
+        second = self._create()
+        # Loaded from the cache without optimizing again, and not rewritten
+        self.assertEqual(second._model_path, cached_path)
+        self.assertEqual(second.get_session_options().graph_optimization_level,
+                         ort.GraphOptimizationLevel.ORT_DISABLE_ALL)
+        self.assertEqual(os.listdir(self.cache_dir), cached)
+        self.assertEqual(os.stat(cached_path).st_mtime_ns, written)
+
+        X = np.random.default_rng(0).random((3, 100, 1), dtype=np.float32)
+        name = first.get_inputs()[0].name
+        np.testing.assert_allclose(second.run(None, {name: X})[0], first.run(None, {name: X})[0],
+                                   rtol=1e-5)
+
+    @override_settings(ONNX_SESSION_PROFILE='missing')
+    def test_unknown_profile_raises(self):
+        with self.assertRaises(ValueError):
+            self._create()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+from api.model_registry import ModelRegistry
+
+
+class FakeSession:
+    def __init__(self, path):
+        with open(path) as f:
+            self.content = f.read()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.loads = []
+
+    def _loader(self, nbytes=1):
+        def load(key, path):
+            self.loads.append(key)
+            return FakeSession(path), nbytes
+        return load
+
+    def _write(self, name, content, mtime=None):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+        return path
+
+    def test_reuses_session_until_file_changes(self):
+        registry = ModelRegistry(self._loader(), reload_interval=0)
+        path = self._write('m.onnx', 'v1', mtime=10 ** 18)
+        key = ('sequence', 'lstm', '')
+
+        first = registry.get(key, path)
+        self.assertIs(registry.get(key, path), first)
+        self.assertEqual(len(self.loads), 1)
+
+        self._write('m.onnx', 'v2', mtime=2 * 10 ** 18)
+        second = registry.get(key, path)
+        self.assertEqual(second.content, 'v2')
+        self.assertTrue(first.closed)
+        self.assertEqual(len(self.loads), 2)
+
+    def test_failed_reload_keeps_previous_session(self):
+        registry = ModelRegistry(self._loader(), reload_interval=0)
+        path = self._write('m.onnx', 'v1', mtime=10 ** 18)
+        key = ('sequence', 'lstm', '')
+        first = registry.get(key, path)
+
+        def broken(key, path):
+            raise RuntimeError('corrupt file')
+        registry.loader = broken
+        self._write('m.onnx', 'v2', mtime=2 * 10 ** 18)
+        self.assertIs(registry.get(key, path), first)
+        self.assertFalse(first.closed)
+
+    def test_missing_file_returns_none(self):
+        registry = ModelRegistry(self._loader())
+        key = ('step', 'lstm', '')
+        self.assertIsNone(registry.get(key, os.path.join(self.dir, 'missing.onnx')))
+        self.assertEqual(self.loads, [])
+
+    def test_evicts_least_recently_used(self):
+        registry = ModelRegistry(self._loader(nbytes=2 ** 20), memory_budget_mb=2)
+        keys = [('sequence', arch, '') for arch in ('lstm', 'gru', 'transformer')]
+        paths = [self._write(f'{key[1]}.onnx', key[1]) for key in keys]
+
+        lstm = registry.get(keys[0], paths[0])
+        registry.get(keys[1], paths[1])
+        registry.get(keys[0], paths[0])  # lstm is now the most recently used
+        registry.get(keys[2], paths[2])
+
+        self.assertEqual([s['key'] for s in registry.stats()], [keys[0], keys[2]])
+        self.assertFalse(lstm.closed)
+
+    def test_load_runs_outside_the_lock(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_loader(key, path):
+            if key[1] == 'lstm':
+                started.set()
+                release.wait(5)
+            self.loads.append(key)
+            return FakeSession(path), 1
+
+        registry = ModelRegistry(slow_loader)
+        lstm_path = self._write('lstm.onnx', 'lstm')
+        gru_path = self._write('gru.onnx', 'gru')
+        results = {}
+
+        def get_lstm():
+            results['lstm'] = registry.get(('sequence', 'lstm', ''), lstm_path)
+        threads = [threading.Thread(target=get_lstm) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(started.wait(5))
+
+        # Another model loads while the slow one is still in its loader
+        self.assertEqual(registry.get(('sequence', 'gru', ''), gru_path).content, 'gru')
+
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results['lstm'].content, 'lstm')
+        self.assertEqual(self.loads.count(('sequence', 'lstm', '')), 1)
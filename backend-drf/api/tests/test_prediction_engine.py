@@ -0,0 +1,215 @@
+import importlib.util
+import os
+import tracemalloc
+import unittest
+import warnings
+
+import numpy as np
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from api.prediction_engine import NOISE_SCHEMES, FuturePredictionEngine
+from api.scaling import AffineScaler
+
+
+class _Input:
+    def __init__(self, name, shape):
+        self.name = name
+        self.shape = shape
+
+
+class WindowMeanModel:
+    """Stand-in sequence model: predicts the mean of each window."""
+
+    def get_inputs(self):
+        return [_Input('input', ['batch', 100, 1])]
+
+    def run(self, output_names, feeds):
+        X = feeds['input']
+        return [X.mean(axis=1)]
+
+
+def _engine(noise_scheme='gaussian', seed=7):
+    scaler = AffineScaler.fit(np.array([[0.0], [100.0]]))
+    return FuturePredictionEngine(
+        WindowMeanModel(), scaler, noise_scheme=noise_scheme, seed=seed
+    )
+
+
+class MCNoiseTests(SimpleTestCase):
+    def test_per_day_noise_matches_one_block_draw(self):
+        horizon, shape = 6, (9, 100, 1)
+        for scheme in NOISE_SCHEMES:
+            with self.subTest(scheme=scheme):
+                block = _engine(scheme)._draw_mc_noise((horizon,) + shape)
+                days = np.stack([day.copy() for day in _engine(scheme)._mc_noise_days(horizon, shape)])
+                np.testing.assert_array_equal(days, block)
+
+    def test_days_are_drawn_into_one_buffer(self):
+        horizon, shape = 20, (50, 100, 1)
+        # Quasi-random schemes are left out: scipy allocates each block of points
+        for scheme in ('gaussian', 'antithetic'):
+            with self.subTest(scheme=scheme):
+                days = _engine(scheme)._mc_noise_days(horizon, shape)
+                first = next(days)
+                tracemalloc.start()
+                try:
+                    for day in days:
+                        self.assertIs(day, first)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                # A fresh array per day would put at least one day of noise in the peak
+                self.assertLess(peak, first.nbytes // 2)
+
+    def test_sobol_does_not_warn_on_odd_sample_counts(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            noise = _engine('sobol')._draw_mc_noise((3, 9, 100, 1))
+        self.assertTrue(np.isfinite(noise).all())
+
+    def test_antithetic_pairs_cancel(self):
+        noise = _engine('antithetic')._draw_mc_noise((4, 100, 1))
+        np.testing.assert_array_equal(noise[0::2], -noise[1::2])
+
+
+SEQUENCE_MODEL = os.path.join(settings.BASE_DIR, 'stock_prediction_model.onnx')
+
+
+def _sequence_model():
+    import onnxruntime as ort
+
+    return ort.InferenceSession(SEQUENCE_MODEL, providers=['CPUExecutionProvider'])
+
+
+def _prices(n=300):
+    rng = np.random.default_rng(2)
+    return 150 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def _run_one(model, window):
+    """One forward pass on a single window of shape (sequence_length,)."""
+    X = window.reshape(1, -1, 1).astype('float32')
+    return model.run(None, {model.get_inputs()[0].name: X})[0][0, 0]
+
+
+def _windowed_reference(model, window, noise):
+    """Per-sample recursive loop: every MC sample is its own run, the day mean is fed back."""
+    samples = np.empty(noise.shape[:2], dtype='float32')
+    for day, day_noise in enumerate(noise):
+        samples[day] = [_run_one(model, window + n[:, 0]) for n in day_noise]
+        window = np.append(window[1:], samples[day].mean())
+    return samples
+
+
+def _trajectory_reference(model, window, noise):
+    """Per-path loop: each path feeds back its own prediction."""
+    horizon, n_paths = noise.shape[:2]
+    paths = np.empty((horizon, n_paths), dtype='float32')
+    windows = [window.copy() for _ in range(n_paths)]
+    for day in range(horizon):
+        for i in range(n_paths):
+            paths[day, i] = _run_one(model, windows[i] + noise[day, i, :, 0])
+            windows[i] = np.append(windows[i][1:], paths[day, i])
+    return paths
+
+
+class ForecastModeTests(SimpleTestCase):
+    """Every forecast mode against a plain per-sample windowed loop on the real model."""
+
+    horizon, mc_iterations, seed = 5, 6, 11
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model = _sequence_model()
+        cls.prices = _prices()
+        cls.scaler = AffineScaler.fit(cls.prices.reshape(-1, 1))
+        cls.window = cls.scaler.transform(cls.prices[-100:].reshape(-1, 1))[:, 0].astype('float32')
+
+    def _engine(self, **kwargs):
+        return FuturePredictionEngine(self.model, self.scaler, seed=self.seed, **kwargs)
+
+    def _noise(self):
+        # Same generator and seed as the engine under test, drawn as one block
+        return self._engine()._draw_mc_noise(
+            (self.horizon, self.mc_iterations, 100, 1)
+        )
+
+    def test_batched_recursive_matches_windowed_reference(self):
+        samples = self._engine()._recursive_samples(
+            self.window.reshape(-1, 1), self.horizon, self.mc_iterations
+        )
+        expected = _windowed_reference(self.model, self.window, self._noise())
+        np.testing.assert_allclose(samples, expected, rtol=1e-5, atol=1e-6)
+
+    def test_batched_and_per_sample_runs_agree(self):
+        batched = self._engine().predict_future(self.prices, self.horizon, mc_iterations=self.mc_iterations)
+        per_sample = self._engine(batch_mc=False).predict_future(
+            self.prices, self.horizon, mc_iterations=self.mc_iterations
+        )
+        for key in ('predicted_prices', 'lower_bound', 'upper_bound'):
+            np.testing.assert_allclose(per_sample[key], batched[key], atol=0.011)
+
+    @unittest.skipUnless(importlib.util.find_spec('onnx'), 'requires the onnx package')
+    def test_in_graph_horizon_matches_windowed_reference(self):
+        import onnx
+        import onnxruntime as ort
+        from convert_to_onnx import _build_horizon_model
+
+        horizon_model = ort.InferenceSession(
+            _build_horizon_model(onnx.load(SEQUENCE_MODEL)).SerializeToString(),
+            providers=['CPUExecutionProvider'],
+        )
+        samples = self._engine(horizon_model=horizon_model)._recursive_samples_auto(
+            self.window.reshape(-1, 1), self.horizon, self.mc_iterations, adaptive_mc=False
+        )
+        expected = _windowed_reference(self.model, self.window, self._noise())
+        np.testing.assert_allclose(samples, expected, rtol=1e-5, atol=1e-6)
+
+    def test_adaptive_without_early_stop_matches_recursive(self):
+        engine = self._engine(mc_tolerance=0.0, mc_batch_size=4)
+        samples = engine._recursive_samples_adaptive(
+            self.window.reshape(-1, 1), self.horizon, self.mc_iterations
+        )
+        expected = _windowed_reference(self.model, self.window, self._noise())
+        np.testing.assert_allclose(samples, expected, rtol=1e-5, atol=1e-6)
+
+    def test_adaptive_stops_once_converged(self):
+        result = self._engine(mc_tolerance=1.0, mc_batch_size=4).predict_future(
+            self.prices, self.horizon, mc_iterations=40, adaptive_mc=True
+        )
+        self.assertEqual(result['mc_iterations_used'], [4] * self.horizon)
+
+    def test_trajectory_matches_per_path_reference(self):
+        predictions, lower, upper, std = self._engine()._predict_trajectories(
+            self.window.reshape(-1, 1), self.horizon, 0.9, self.mc_iterations
+        )
+        paths = _trajectory_reference(self.model, self.window, self._noise())
+        np.testing.assert_allclose(predictions, paths.mean(axis=1), rtol=1e-5)
+        np.testing.assert_allclose(std, paths.std(axis=1), rtol=1e-3, atol=1e-6)
+        np.testing.assert_allclose(lower, np.quantile(paths, 0.05, axis=1), rtol=1e-5)
+        np.testing.assert_allclose(upper, np.quantile(paths, 0.95, axis=1), rtol=1e-5)
+
+    def test_analytic_follows_the_clean_windowed_path(self):
+        predictions, lower, upper, _ = self._engine()._predict_analytic(
+            self.window.reshape(-1, 1), self.horizon, 0.95, 'delta', None
+        )
+        clean = np.zeros((self.horizon, 1, 100, 1), dtype='float32')
+        expected = _windowed_reference(self.model, self.window, clean)[:, 0]
+        np.testing.assert_allclose(predictions, expected, rtol=1e-5)
+        self.assertTrue(np.all(lower < predictions) and np.all(predictions < upper))
+
+    def test_delta_method_std_of_a_linear_model(self):
+        # The window mean has gradient 1/100 per timestep: std = 0.005 * sqrt(100) / 100
+        engine = _engine()
+        window = np.full((100, 1), 0.5, dtype='float32')
+        self.assertAlmostEqual(engine._delta_method_std(window), 0.0005, places=5)
+
+    def test_residual_method_grows_as_a_random_walk(self):
+        engine = _engine()
+        _, _, _, std = engine._predict_analytic(
+            np.full((100, 1), 0.5, dtype='float32'), 4, 0.95, 'residual', residual_std=2.0
+        )
+        # Scaler maps [0, 100] onto [0, 1]: 2 price units are 0.02
+        np.testing.assert_allclose(std, 0.02 * np.sqrt([1, 2, 3, 4]), rtol=1e-6)
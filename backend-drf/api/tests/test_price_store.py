@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from api.management.commands import prefetch_prices
+from api.models import PriceHistory
+from api.price_store import decode_bars, encode_bars, get_history, warm_history
+
+
+def _bars(days=30, end=None, close=100.0):
+    end = pd.Timestamp(end or datetime.now().date() - timedelta(days=1))
+    index = pd.bdate_range(end=end, periods=days, name='Date').as_unit('ns')
+    return pd.DataFrame({'Close': close + np.arange(days, dtype='float64')}, index=index)
+
+
+class FakeProvider:
+    """Bulk downloads raise when a batch holds a ticker in fail_bulk; fail_all never download."""
+
+    name = 'fake'
+
+    def __init__(self, fail_bulk=(), fail_all=()):
+        self.fail_bulk = set(fail_bulk)
+        self.fail_all = set(fail_all)
+        self.bulk_calls = []
+
+    def get_historical(self, ticker, years=10):
+        if ticker in self.fail_all:
+            raise ValueError(f'No data for {ticker}')
+        return _bars()
+
+    def get_historical_since(self, ticker, start):
+        bars = self.get_historical(ticker)
+        return bars[bars.index >= pd.Timestamp(start)]
+
+    def get_historical_many(self, tickers, years=10):
+        self.bulk_calls.append(list(tickers))
+        if self.fail_bulk & set(tickers):
+            raise ConnectionError('bulk endpoint down')
+        return {t: self.get_historical(t) for t in tickers if t not in self.fail_all}
+
+    def get_historical_since_many(self, tickers, start):
+        return {t: frame[frame.index >= pd.Timestamp(start)]
+                for t, frame in self.get_historical_many(tickers).items()}
+
+
+class StoreUpstream:
+    """Serves a fixed bar frame and records which download was used."""
+
+    name = 'fake'
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+
+    def get_historical(self, ticker, years=10):
+        self.calls.append('full')
+        return self.bars
+
+    def get_historical_since(self, ticker, start):
+        self.calls.append('since')
+        return self.bars[self.bars.index >= pd.Timestamp(start)]
+
+
+def _last_session():
+    today = np.datetime64(datetime.now().date(), 'D')
+    return pd.Timestamp(np.busday_offset(today, -1, roll='forward'))
+
+
+@override_settings(PRICE_STORE={'MIN_REFRESH_SECONDS': 0})
+class GetHistoryTests(TestCase):
+    def setUp(self):
+        self.latest = _bars(days=60, end=_last_session())
+        self.upstream = StoreUpstream(self.latest.iloc[:-3])
+
+    def test_encode_decode_round_trip(self):
+        pd.testing.assert_frame_equal(decode_bars(encode_bars(self.latest)), self.latest,
+                                      check_freq=False)
+
+    def test_new_bars_are_appended(self):
+        get_history('AAPL', self.upstream)
+        self.upstream.bars = self.latest
+        bars = get_history('AAPL', self.upstream)
+
+        self.assertEqual(self.upstream.calls, ['full', 'since'])
+        pd.testing.assert_frame_equal(bars, self.latest, check_freq=False)
+        self.assertEqual(PriceHistory.objects.get(ticker='AAPL').n_bars, len(self.latest))
+
+    def test_current_store_makes_no_upstream_call(self):
+        self.upstream.bars = self.latest
+        get_history('AAPL', self.upstream)
+        get_history('AAPL', self.upstream)
+        self.assertEqual(self.upstream.calls, ['full'])
+
+    def test_restated_history_is_downloaded_again(self):
+        get_history('AAPL', self.upstream)
+        self.upstream.bars = self.latest / 2  # e.g. a 2:1 split adjustment
+        bars = get_history('AAPL', self.upstream)
+
+        self.assertEqual(self.upstream.calls, ['full', 'since', 'full'])
+        pd.testing.assert_frame_equal(bars, self.latest / 2, check_freq=False)
+
+    def test_failed_refresh_serves_the_store(self):
+        stored = get_history('AAPL', self.upstream)
+
+        def down(ticker, start):
+            raise ConnectionError('upstream down')
+        self.upstream.get_historical_since = down
+        pd.testing.assert_frame_equal(get_history('AAPL', self.upstream), stored, check_freq=False)
+
+    def test_empty_refresh_serves_the_store(self):
+        stored = get_history('AAPL', self.upstream)
+        # yahooquery returns a bare pd.DataFrame() when it has no data
+        self.upstream.get_historical_since = lambda ticker, start: pd.DataFrame()
+        pd.testing.assert_frame_equal(get_history('AAPL', self.upstream), stored, check_freq=False)
+        self.assertEqual(self.upstream.calls, ['full'])
+
+
+class WarmHistoryTests(TestCase):
+    def test_failed_batch_is_retried_one_ticker_at_a_time(self):
+        upstream = FakeProvider(fail_bulk={'BAD'}, fail_all={'BAD'})
+        with mock.patch('sys.stdout'):
+            result = warm_history(['AAPL', 'BAD', 'MSFT', 'NVDA'], upstream, batch_size=2)
+
+        self.assertEqual(upstream.bulk_calls, [['AAPL', 'BAD'], ['MSFT', 'NVDA']])
+        self.assertEqual(sorted(result['downloaded']), ['AAPL', 'MSFT', 'NVDA'])
+        self.assertEqual(result['failed'], ['BAD'])
+        self.assertEqual(PriceHistory.objects.count(), 3)
+
+    def test_current_tickers_are_skipped(self):
+        upstream = FakeProvider()
+        warm_history(['AAPL'], upstream)
+        result = warm_history(['AAPL'], upstream)
+        self.assertEqual(result['current'], ['AAPL'])
+        self.assertEqual(len(upstream.bulk_calls), 1)
+
+
+class PrefetchPricesCommandTests(TestCase):
+    def _call(self, upstream, tickers):
+        with mock.patch.dict(prefetch_prices.PROVIDERS, {'yfinance': lambda: upstream}), \
+                mock.patch('sys.stdout'):
+            call_command('prefetch_prices', tickers=tickers, batch_size=1, stdout=mock.Mock())
+
+    def test_partial_failure_succeeds(self):
+        self._call(FakeProvider(fail_bulk={'BAD'}, fail_all={'BAD'}), 'AAPL,BAD')
+        self.assertTrue(PriceHistory.objects.filter(ticker='AAPL').exists())
+
+    def test_every_batch_failing_exits_non_zero(self):
+        upstream = FakeProvider(fail_bulk={'AAPL', 'BAD'}, fail_all={'AAPL', 'BAD'})
+        with self.assertRaises(CommandError):
+            self._call(upstream, 'AAPL,BAD')
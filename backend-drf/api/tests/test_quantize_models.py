@@ -0,0 +1,60 @@
+import importlib.util
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from api.ml_manager import MLModelManager
+from api.tests.test_prediction_engine import SEQUENCE_MODEL
+
+
+@unittest.skipUnless(importlib.util.find_spec('onnx'), 'requires the onnx package')
+class QuantizeModelsCommandTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.model_path = os.path.join(tmp.name, 'stock_prediction_model.onnx')
+        shutil.copy(SEQUENCE_MODEL, self.model_path)
+        shutil.copy(SEQUENCE_MODEL, os.path.join(tmp.name, 'stock_prediction_model@v2.onnx'))
+
+        paths = mock.patch.dict(MLModelManager.MODEL_PATHS, {'lstm': self.model_path})
+        paths.start()
+        self.addCleanup(paths.stop)
+
+    def _session(self, path):
+        import onnxruntime as ort
+
+        return ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+
+    def test_writes_a_loadable_int8_model_per_version(self):
+        # onnxruntime's quantizer logs a pre-processing hint through the root logger
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        call_command('quantize_models', architectures='lstm', repeats=1, stdout=io.StringIO())
+
+        manager = MLModelManager.get_instance()
+        X = np.random.default_rng(0).random((4, 100, 1), dtype=np.float32)
+        fp32 = self._session(self.model_path)
+        expected = fp32.run(None, {fp32.get_inputs()[0].name: X})[0]
+        for version in ('', 'v2'):
+            with self.subTest(version=version):
+                int8_path = manager.quantized_model_path('lstm', version)
+                self.assertTrue(int8_path.endswith('_int8.onnx' if not version else '_int8@v2.onnx'))
+                int8 = self._session(int8_path)
+                self.assertEqual(int8.get_inputs()[0].shape[1:], fp32.get_inputs()[0].shape[1:])
+                predicted = int8.run(None, {int8.get_inputs()[0].name: X})[0]
+                np.testing.assert_allclose(predicted, expected, atol=0.05)
+                self.assertLess(os.path.getsize(int8_path), os.path.getsize(self.model_path))
+        # No temporary files are left behind
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(self.model_path))),
+            ['stock_prediction_model.onnx', 'stock_prediction_model@v2.onnx',
+             'stock_prediction_model_int8.onnx', 'stock_prediction_model_int8@v2.onnx'],
+        )
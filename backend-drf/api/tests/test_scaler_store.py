@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from django.test import TestCase
+
+from api.models import TickerScaler
+from api.scaler_store import get_backtest_scaler, get_forecast_scaler
+
+
+def _closes(n=400, start='2020-01-01', seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=n, name='Date')
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), index=index)
+
+
+def _train_split(closes, train_ratio=0.7):
+    return closes.iloc[:int(len(closes) * train_ratio)]
+
+
+class BacktestScalerTests(TestCase):
+    def test_fits_the_training_split(self):
+        train = _train_split(_closes())
+        scaler = get_backtest_scaler('AAPL', train)
+        np.testing.assert_allclose(scaler.data_min_, [train.min()])
+        np.testing.assert_allclose(scaler.data_max_, [train.max()])
+
+    def test_repeat_call_is_a_cache_hit(self):
+        train = _train_split(_closes())
+        first = get_backtest_scaler('AAPL', train)
+        updated_at = TickerScaler.objects.get(ticker='AAPL', scope='backtest').updated_at
+
+        with self.assertNumQueries(1):
+            again = get_backtest_scaler('AAPL', train)
+        np.testing.assert_array_equal(again.scale_, first.scale_)
+        self.assertEqual(
+            TickerScaler.objects.get(ticker='AAPL', scope='backtest').updated_at, updated_at
+        )
+
+    def test_later_boundary_folds_in_the_new_training_bars(self):
+        closes = _closes()
+        get_backtest_scaler('AAPL', _train_split(closes.iloc[:300]))
+        train = _train_split(closes)  # Same first bar, later split boundary
+        scaler = get_backtest_scaler('AAPL', train)
+        np.testing.assert_allclose(scaler.data_min_, [train.min()])
+        np.testing.assert_allclose(scaler.data_max_, [train.max()])
+        self.assertEqual(TickerScaler.objects.get(ticker='AAPL', scope='backtest').n_bars, len(train))
+
+    def test_rolling_window_fits_the_current_split_only(self):
+        closes = _closes(401)
+        closes.iloc[0] = closes.max() * 2  # Yesterday's max rolls out of the window today
+        get_backtest_scaler('AAPL', _train_split(closes.iloc[:400]))
+        today = _train_split(closes.iloc[1:])
+        scaler = get_backtest_scaler('AAPL', today)
+        np.testing.assert_allclose(scaler.data_min_, [today.min()])
+        np.testing.assert_allclose(scaler.data_max_, [today.max()])
+
+    def test_earlier_split_boundary_refits(self):
+        closes = _closes()
+        get_backtest_scaler('AAPL', _train_split(closes))
+        shorter = _train_split(closes.iloc[:300])
+        scaler = get_backtest_scaler('AAPL', shorter)
+        np.testing.assert_allclose(scaler.data_min_, [shorter.min()])
+        np.testing.assert_allclose(scaler.data_max_, [shorter.max()])
+
+    def test_restated_history_refits(self):
+        train = _train_split(_closes())
+        get_backtest_scaler('AAPL', train)
+        restated = train / 4  # e.g. a 4:1 split adjustment
+        scaler = get_backtest_scaler('AAPL', restated)
+        np.testing.assert_allclose(scaler.data_max_, [restated.max()])
+
+
+class ForecastScalerTests(TestCase):
+    def test_folds_in_new_bars(self):
+        closes = _closes()
+        get_forecast_scaler('MSFT', closes.iloc[:300])
+        scaler = get_forecast_scaler('MSFT', closes.iloc[100:])
+        np.testing.assert_allclose(scaler.data_min_, [closes.min()])
+        np.testing.assert_allclose(scaler.data_max_, [closes.max()])
+        self.assertEqual(TickerScaler.objects.get(ticker='MSFT', scope='forecast').n_bars, len(closes))
@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.preprocessing import MinMaxScaler
+
+from api.scaling import AffineScaler
+
+
+def _prices(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return (100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))).reshape(-1, 1)
+
+
+class AffineScalerTests(SimpleTestCase):
+    def test_matches_sklearn(self):
+        train, test = _prices()[:350], _prices()[350:]
+        for feature_range in ((0, 1), (-1, 1)):
+            with self.subTest(feature_range=feature_range):
+                reference = MinMaxScaler(feature_range=feature_range).fit(train)
+                scaler = AffineScaler.fit(train, feature_range=feature_range)
+
+                np.testing.assert_allclose(scaler.scale_, reference.scale_, rtol=1e-12)
+                np.testing.assert_allclose(scaler.min_, reference.min_, rtol=1e-12)
+                np.testing.assert_allclose(scaler.transform(test), reference.transform(test), rtol=1e-12)
+                scaled = reference.transform(test)
+                np.testing.assert_allclose(
+                    scaler.inverse_transform(scaled), reference.inverse_transform(scaled), rtol=1e-12
+                )
+
+    def test_from_sklearn_and_constant_feature(self):
+        constant = np.full((10, 1), 42.0)
+        reference = MinMaxScaler().fit(constant)
+        scaler = AffineScaler.from_sklearn(reference)
+        np.testing.assert_array_equal(scaler.transform(constant), reference.transform(constant))
+        np.testing.assert_array_equal(AffineScaler.fit(constant).scale_, reference.scale_)
+
+    def test_float32_and_inplace_variants(self):
+        scaler = AffineScaler.fit(_prices())
+        X = _prices()[:50].astype('float32')
+        self.assertEqual(scaler.transform(X).dtype, np.float32)
+
+        expected = scaler.inverse_transform(scaler.transform(X))
+        buffer = scaler.transform(X)
+        self.assertIs(scaler.inverse_transform_inplace(buffer), buffer)
+        np.testing.assert_allclose(buffer, expected, rtol=1e-6)
+
+    def test_save_and_load_round_trip(self):
+        scaler = AffineScaler.fit(_prices())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scaler.json')
+            scaler.save(path)
+            loaded = AffineScaler.load(path)
+        self.assertEqual(loaded.to_dict(), scaler.to_dict())
+
+    def test_load_rejects_other_formats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scaler.json')
+            with open(path, 'w') as f:
+                f.write('{"format": "pickle"}')
+            with self.assertRaises(ValueError):
+                AffineScaler.load(path)
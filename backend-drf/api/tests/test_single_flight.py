@@ -0,0 +1,142 @@
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import pandas as pd
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from api import history_cache
+from api.single_flight import SingleFlight, file_lock
+
+
+N_CALLERS = 8
+
+
+class SingleFlightTests(SimpleTestCase):
+    def _run_callers(self, flights, fn):
+        """Start N_CALLERS threads on one key while the leader's fn is blocked."""
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flights.do('key', fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(N_CALLERS)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def _wait_for_waiters(self, flights):
+        # All callers but the leader are parked on the leader's future
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            future = flights._calls.get('key')
+            if future is not None and len(future._condition._waiters) == N_CALLERS - 1:
+                return
+            time.sleep(0.01)
+        self.fail('callers did not queue up behind the leader')
+
+    def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return 'payload'
+
+        threads, results, errors = self._run_callers(flights, fetch)
+        self._wait_for_waiters(flights)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['payload'] * N_CALLERS)
+        self.assertEqual(errors, [])
+        self.assertEqual(flights._calls, {})
+
+    def test_exception_reaches_every_waiter(self):
+        flights = SingleFlight()
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            raise ValueError('upstream down')
+
+        threads, results, errors = self._run_callers(flights, fetch)
+        self._wait_for_waiters(flights)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), N_CALLERS)
+        self.assertTrue(all(isinstance(e, ValueError) for e in errors))
+        # The next call runs again rather than reusing the failure
+        self.assertEqual(flights.do('key', lambda: 'retry'), 'retry')
+
+
+class FileLockTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        overrides = override_settings(SINGLE_FLIGHT={'LOCK_DIR': tmp.name, 'LOCK_TIMEOUT': 0.2})
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def _try_lock(self, name):
+        acquired = []
+
+        def take():
+            with file_lock(name) as held:
+                acquired.append(held)
+
+        thread = threading.Thread(target=take)
+        thread.start()
+        thread.join(5)
+        return acquired[0]
+
+    def test_held_lock_times_out_other_holders(self):
+        with file_lock('history:yfinance:AAPL:10') as held:
+            self.assertTrue(held)
+            self.assertFalse(self._try_lock('history:yfinance:AAPL:10'))
+            self.assertTrue(self._try_lock('history:yfinance:MSFT:10'))
+
+    def test_released_lock_can_be_taken(self):
+        with file_lock('history:yfinance:AAPL:10'):
+            pass
+        with file_lock('history:yfinance:AAPL:10') as held:
+            self.assertTrue(held)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class HistoryCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.fetches = []
+
+    def _fetch(self):
+        self.fetches.append(1)
+        index = pd.bdate_range('2024-01-01', periods=5, name='Date')
+        return pd.DataFrame({'Close': [1.0, 2.0, 3.0, 4.0, 5.0]}, index=index)
+
+    @override_settings(HISTORY_CACHE={'ENABLED': True})
+    def test_repeat_request_is_served_from_cache(self):
+        first = history_cache.get_cached_history('yfinance', 'AAPL', 10, self._fetch)
+        second = history_cache.get_cached_history('yfinance', 'AAPL', 10, self._fetch)
+        pd.testing.assert_frame_equal(second, first)
+        self.assertEqual(len(self.fetches), 1)
+
+    @override_settings(HISTORY_CACHE={'ENABLED': False})
+    def test_disabled_cache_skips_the_file_lock(self):
+        with mock.patch.object(history_cache, 'file_lock') as lock:
+            history_cache.get_cached_history('yfinance', 'AAPL', 10, self._fetch)
+            history_cache.get_cached_history('yfinance', 'AAPL', 10, self._fetch)
+        lock.assert_not_called()
+        self.assertEqual(len(self.fetches), 2)
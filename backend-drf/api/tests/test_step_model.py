@@ -0,0 +1,47 @@
+import importlib.util
+import unittest
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from api.ml_manager import MLModelManager
+from api.prediction_engine import FuturePredictionEngine
+from api.scaling import AffineScaler
+from api.tests.test_io_binding import _gru_model
+
+
+@unittest.skipUnless(importlib.util.find_spec('onnx'), 'requires the onnx package')
+class StepModelBandTests(SimpleTestCase):
+    def setUp(self):
+        import onnxruntime as ort
+
+        self.sequence = ort.InferenceSession(_gru_model(stateful=False),
+                                             providers=['CPUExecutionProvider'])
+        self.step = ort.InferenceSession(_gru_model(stateful=True),
+                                         providers=['CPUExecutionProvider'])
+        # Wide price range: band widths stay well above the 2-decimal rounding
+        self.scaler = AffineScaler.fit(np.array([[0.0], [100_000.0]]))
+        self.prices = 50_000 + 10_000 * np.sin(np.linspace(0, 12, 150))
+
+    def _band_widths(self, step_model):
+        engine = FuturePredictionEngine(self.sequence, self.scaler, step_model=step_model,
+                                        uncertainty_growth=0.0, seed=0)
+        result = engine.predict_future(self.prices, horizon=5, mc_iterations=400)
+        return np.subtract(result['upper_bound'], result['lower_bound'])
+
+    def test_step_model_bands_match_windowed_bands(self):
+        windowed = self._band_widths(step_model=None)
+        stateful = self._band_widths(step_model=self.step)
+        np.testing.assert_allclose(stateful, windowed, rtol=0.15)
+
+
+class StepModelSettingTests(SimpleTestCase):
+    def test_step_model_is_opt_in(self):
+        manager = MLModelManager.get_instance()
+        with mock.patch.object(manager, '_get_optional_model', return_value='step-session'):
+            with override_settings(ML_STEP_MODELS=[]):
+                self.assertIsNone(manager.get_step_model(architecture='lstm'))
+            with override_settings(ML_STEP_MODELS=['lstm']):
+                self.assertEqual(manager.get_step_model(architecture='lstm'), 'step-session')
+                self.assertIsNone(manager.get_step_model(architecture='gru'))
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import time
+from unittest import mock
+
+import numpy as np
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from api import walk_forward
+from api.walk_forward import run_walk_forward, walk_forward_folds
+
+
+MODEL_PATH = os.path.join(settings.BASE_DIR, 'stock_prediction_model.onnx')
+
+
+def _prices(n=700):
+    rng = np.random.default_rng(1)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+class WalkForwardFoldTests(SimpleTestCase):
+    def test_expanding_and_rolling_bounds(self):
+        self.assertEqual(
+            walk_forward_folds(1000, 3, 'expanding', 0.5, 100),
+            [(0, 500, 666), (0, 666, 832), (0, 832, 1000)],
+        )
+        self.assertEqual(
+            walk_forward_folds(1000, 3, 'rolling', 0.5, 100),
+            [(0, 500, 666), (166, 666, 832), (332, 832, 1000)],
+        )
+
+    def test_rejects_short_series(self):
+        with self.assertRaises(ValueError):
+            walk_forward_folds(150, 5, sequence_length=100)
+
+
+class PoolSizeTests(SimpleTestCase):
+    @override_settings(WALK_FORWARD={'MAX_WORKERS': 2})
+    def test_capped_by_container_quota(self):
+        with mock.patch.object(os, 'sched_getaffinity', return_value=set(range(16)), create=True), \
+                mock.patch.object(walk_forward, '_cgroup_cpu_quota', return_value=1.5):
+            self.assertEqual(walk_forward._available_cores(), 2)
+            self.assertEqual(walk_forward._pool_size(), 2)
+        with mock.patch.object(walk_forward, '_available_cores', return_value=1):
+            self.assertEqual(walk_forward._pool_size(), 1)
+
+    def test_worker_entry_module_skips_heavy_imports(self):
+        code = (
+            'import sys, api.walk_forward_worker; '
+            'print(sorted(m for m in ("pandas", "yfinance", "onnxruntime", "django") if m in sys.modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+class RunWalkForwardTests(SimpleTestCase):
+    def test_pool_matches_in_process_scoring(self):
+        prices = _prices()
+        in_process = run_walk_forward(prices, MODEL_PATH, n_folds=3, max_workers=1)
+        with override_settings(WALK_FORWARD={'MAX_WORKERS': 2, 'IDLE_TIMEOUT_SECONDS': 0.1}), \
+                mock.patch.object(walk_forward, '_available_cores', return_value=2):
+            self.addCleanup(walk_forward._reset_executor)
+            pooled = run_walk_forward(prices, MODEL_PATH, n_folds=3, max_workers=2)
+            self.assertIsNotNone(walk_forward._executor)
+            # Shut down once idle
+            deadline = time.monotonic() + 5
+            while walk_forward._executor is not None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertIsNone(walk_forward._executor)
+        self.assertEqual(pooled, in_process)
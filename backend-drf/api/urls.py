@@ -7,6 +7,7 @@ from .views import (
     ModelConfigDetailView,
     ModelConfigActivateView,
     ModelConfigAvailabilityView,
+    ModelVersionsView,
     ProviderListView,
     ProviderTestView,
     MarketQuoteView,
@@ -38,6 +39,7 @@ urlpatterns = [
 
     # Model Configurations — static paths MUST come before <int:pk>
     path('model-configs/availability/', ModelConfigAvailabilityView.as_view(), name='model-config-availability'),
+    path('model-configs/versions/', ModelVersionsView.as_view(), name='model-config-versions'),
     path('model-configs/', ModelConfigListCreateView.as_view(), name='model-config-list'),
     path('model-configs/<int:pk>/', ModelConfigDetailView.as_view(), name='model-config-detail'),
     path('model-configs/<int:pk>/activate/', ModelConfigActivateView.as_view(), name='model-config-activate'),
@@ -6,6 +6,7 @@ Includes:
 2. ModelConfigListCreateView  — CRUD for user model configurations
 3. ModelConfigDetailView      — Detail/update/delete a model config
 4. ModelConfigActivateView    — Activate a model config
+   ModelVersionsView          — Model versions on disk per architecture
 5. ProviderListView           — List available providers + user configs
 6. ProviderTestView           — Validate a provider API key
 7. MarketQuoteView            — Real-time/delayed quote for a ticker
@@ -19,7 +20,9 @@ Includes:
 import csv
 from io import StringIO
 from datetime import timedelta
+from functools import partial
 
+from django.conf import settings
 from django.core.cache import cache
 from django.db.models import Count, Max
 from django.http import HttpResponse
@@ -32,11 +35,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics import mean_squared_error, r2_score
-import numpy as np
-
-from .data_pipeline import prepare_backtesting_data, create_sequences
+from .backtest_cache import BacktestCache
+from .data_pipeline import run_backtest
 from .data_providers import (
     get_provider_with_fallback,
     get_realtime_provider,
@@ -47,6 +47,8 @@ from .data_providers import (
 from .ml_manager import MLModelManager
 from .models import ModelConfig, ProviderConfig, PredictionRecord
 from .prediction_engine import FuturePredictionEngine, generate_trading_dates
+from .scaler_store import get_backtest_scaler, get_forecast_scaler
+from .walk_forward import run_walk_forward
 from .serializers import (
     StockPredictionSerializers,
     ModelConfigSerializer,
@@ -62,9 +64,11 @@ from .serializers import (
 class StockPredictionAPIView(APIView):
     """
     POST /api/v1/predict/
-    Body: {"ticker": "AAPL", "future_days": 30, "confidence_level": 0.95}
+    Body: {"ticker": "AAPL", "future_days": 30, "confidence_level": 0.95,
+           "prediction_mode": "recursive", "adaptive_mc": false,
+           "analytic_method": "delta"}
 
-    Uses the user's active ModelConfig (if any) for MC iterations,
+    Uses the user's active ModelConfig (if any) for MC iterations, noise scheme,
     uncertainty growth, architecture, and confidence defaults.
     Uses the user's active data provider (if configured).
     Saves a PredictionRecord after each successful prediction.
@@ -80,6 +84,11 @@ class StockPredictionAPIView(APIView):
 
         ticker = serializer.validated_data['ticker'].upper()
         future_days = serializer.validated_data.get('future_days', 0)
+        prediction_mode = serializer.validated_data.get('prediction_mode', 'recursive')
+        adaptive_mc = serializer.validated_data.get('adaptive_mc', False)
+        analytic_method = serializer.validated_data.get('analytic_method', 'delta')
+        walk_forward_folds = serializer.validated_data.get('walk_forward_folds', 0)
+        walk_forward_scheme = serializer.validated_data.get('walk_forward_scheme', 'expanding')
 
         # Resolve active model config parameters
         model_config = None
@@ -89,8 +98,10 @@ class StockPredictionAPIView(APIView):
             ).first()
 
         mc_iterations = model_config.mc_iterations if model_config else 50
+        noise_scheme = model_config.noise_scheme if model_config else 'gaussian'
         uncertainty_growth = model_config.uncertainty_growth if model_config else 0.02
         architecture = model_config.architecture if model_config else 'lstm'
+        model_version = model_config.model_version if model_config else ''
         sequence_length = model_config.sequence_length if model_config else 100
 
         confidence_level = serializer.validated_data.get(
@@ -101,8 +112,8 @@ class StockPredictionAPIView(APIView):
         try:
             # Check if requested architecture is available
             manager = MLModelManager.get_instance()
-            if not manager.is_architecture_available(architecture):
-                if architecture != 'lstm':
+            if not manager.is_architecture_available(architecture, model_version):
+                if architecture != 'lstm' and not model_version:
                     return Response(
                         {
                             'error': (
@@ -127,9 +138,21 @@ class StockPredictionAPIView(APIView):
             # Backtesting (always executed)
             backtesting_result = self._perform_backtesting(
                 close_prices, df.index,
+                ticker=ticker,
                 sequence_length=sequence_length,
-                architecture=architecture
+                architecture=architecture,
+                model_version=model_version,
             )
+            if walk_forward_folds > 1:
+                backtesting_result['walk_forward'] = run_walk_forward(
+                    close_prices,
+                    manager.model_path(architecture, model_version),
+                    n_folds=walk_forward_folds,
+                    scheme=walk_forward_scheme,
+                    sequence_length=sequence_length,
+                    chunk_size=settings.BACKTEST_CHUNK_SIZE,
+                    max_workers=settings.WALK_FORWARD['MAX_WORKERS'] or None,
+                )
 
             response_data = {
                 'status': 'success',
@@ -139,8 +162,10 @@ class StockPredictionAPIView(APIView):
                     'id': model_config.id if model_config else None,
                     'name': model_config.name if model_config else 'Default',
                     'architecture': architecture,
+                    'model_version': model_version,
                     'sequence_length': sequence_length,
                     'mc_iterations': mc_iterations,
+                    'noise_scheme': noise_scheme,
                 } if model_config else None,
                 'historical_data': {
                     'dates': df.index.strftime('%Y-%m-%d').tolist(),
@@ -157,12 +182,19 @@ class StockPredictionAPIView(APIView):
             if future_days > 0:
                 future_result = self._perform_future_prediction(
                     historical_prices=close_prices.values,
+                    scaler=self._forecast_scaler(ticker, close_prices),
                     horizon=future_days,
                     confidence_level=confidence_level,
                     last_date=df.index[-1],
                     mc_iterations=mc_iterations,
+                    noise_scheme=noise_scheme,
                     uncertainty_growth=uncertainty_growth,
                     architecture=architecture,
+                    model_version=model_version,
+                    mode=prediction_mode,
+                    adaptive_mc=adaptive_mc,
+                    analytic_method=analytic_method,
+                    residual_std=backtesting_result['metrics']['rmse'],
                 )
                 response_data['future_predictions'] = future_result
 
@@ -194,38 +226,27 @@ class StockPredictionAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _perform_backtesting(self, close_prices, dates, sequence_length=100, architecture='lstm'):
-        data_split = prepare_backtesting_data(close_prices, train_ratio=0.7)
-
-        train_scaler = MinMaxScaler(feature_range=(0, 1))
-        train_scaler.fit(data_split['train'].values.reshape(-1, 1))
-
-        past_100_scaled = train_scaler.transform(
-            data_split['past_100'].values.reshape(-1, 1)
-        )
-        test_scaled = train_scaler.transform(
-            data_split['test'].values.reshape(-1, 1)
+    def _perform_backtesting(self, close_prices, dates, ticker=None, sequence_length=100,
+                             architecture='lstm', model_version=''):
+        manager = MLModelManager.get_instance()
+        model = manager.get_model(architecture=architecture, version=model_version)
+        scaler_factory = None
+        if ticker and settings.TICKER_SCALERS:
+            scaler_factory = partial(get_backtest_scaler, ticker)
+        cache = None
+        if ticker and settings.BACKTEST_CACHE:
+            cache = BacktestCache(
+                ticker, architecture, model_version,
+                manager.model_fingerprint(architecture, model_version),
+            )
+        backtest = run_backtest(
+            close_prices, model, sequence_length=sequence_length, scaler_factory=scaler_factory,
+            chunk_size=settings.BACKTEST_CHUNK_SIZE, cache=cache,
         )
+        y_actual, y_predicted = backtest['y_actual'], backtest['y_predicted']
+        metrics = backtest['metrics']
 
-        input_data = np.concatenate([past_100_scaled, test_scaled], axis=0)
-        x_test, y_test = create_sequences(input_data, sequence_length=sequence_length)
-
-        model = MLModelManager.get_instance().get_model(architecture=architecture)
-        input_name = model.get_inputs()[0].name
-        y_predicted_scaled = model.run(None, {input_name: x_test.astype('float32')})[0]
-
-        y_predicted = train_scaler.inverse_transform(
-            y_predicted_scaled.reshape(-1, 1)
-        ).flatten()
-        y_actual = train_scaler.inverse_transform(
-            y_test.reshape(-1, 1)
-        ).flatten()
-
-        mse = mean_squared_error(y_actual, y_predicted)
-        rmse = np.sqrt(mse)
-        r2 = r2_score(y_actual, y_predicted)
-
-        split_idx = data_split['split_idx']
+        split_idx = backtest['split_idx']
         test_start_idx = split_idx + sequence_length
         test_dates = dates[test_start_idx:].strftime('%Y-%m-%d').tolist()
 
@@ -234,27 +255,48 @@ class StockPredictionAPIView(APIView):
             'test_prices': y_actual.round(2).tolist(),
             'predicted_prices': y_predicted.round(2).tolist(),
             'metrics': {
-                'mse': round(float(mse), 2),
-                'rmse': round(float(rmse), 2),
-                'r2': round(float(r2), 4),
+                'mse': round(metrics['mse'], 2),
+                'rmse': round(metrics['rmse'], 2),
+                'r2': round(metrics['r2'], 4),
             },
         }
 
+    @staticmethod
+    def _forecast_scaler(ticker, close_prices):
+        """Per-ticker forecast scaler, or None for the global training scaler."""
+        if not settings.TICKER_SCALERS:
+            return None
+        return get_forecast_scaler(ticker, close_prices)
+
     def _perform_future_prediction(self, historical_prices, horizon, confidence_level,
-                                   last_date, mc_iterations=50, uncertainty_growth=0.02,
-                                   architecture='lstm'):
-        model = MLModelManager.get_instance().get_model(architecture=architecture)
-        scaler = MLModelManager.get_instance().get_training_scaler()
+                                   last_date, scaler=None, mc_iterations=50, noise_scheme='gaussian',
+                                   uncertainty_growth=0.02,
+                                   architecture='lstm', model_version='',
+                                   mode='recursive', adaptive_mc=False,
+                                   analytic_method='delta', residual_std=None):
+        manager = MLModelManager.get_instance()
+        model = manager.get_model(architecture=architecture, version=model_version)
+        step_model = manager.get_step_model(architecture=architecture, version=model_version)
+        horizon_model = manager.get_horizon_model(architecture=architecture, version=model_version)
+        if scaler is None:
+            scaler = manager.get_training_scaler()
 
         engine = FuturePredictionEngine(
             model, scaler,
             uncertainty_growth=uncertainty_growth,
+            step_model=step_model,
+            horizon_model=horizon_model,
+            noise_scheme=noise_scheme,
         )
         result = engine.predict_future(
             historical_prices=historical_prices,
             horizon=horizon,
             confidence_level=confidence_level,
             mc_iterations=mc_iterations,
+            mode=mode,
+            adaptive_mc=adaptive_mc,
+            analytic_method=analytic_method,
+            residual_std=residual_std,
         )
         result['dates'] = generate_trading_dates(last_date, horizon)
         result['confidence_level'] = confidence_level
@@ -314,6 +356,18 @@ class ModelConfigActivateView(APIView):
         return Response(ModelConfigSerializer(config).data)
 
 
+class ModelVersionsView(APIView):
+    """Returns the model versions on disk per architecture ('' is the default file)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        manager = MLModelManager.get_instance()
+        return Response({
+            arch: manager.list_versions(arch)
+            for arch in ['lstm', 'gru', 'bilstm']
+        })
+
+
 class ModelConfigAvailabilityView(APIView):
     """Returns which model architectures have their .onnx files present."""
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,301 @@
+"""
+Walk-Forward Backtesting - Multi-Fold Evaluation on a Process Pool
+
+The single 70/30 backtest gives one R² that depends on where the split falls.
+Walk-forward scoring cuts the series into N consecutive test blocks after an initial
+training period; fold k trains its own scaler on the bars before its test block and
+scores that block one step ahead:
+
+    expanding:  [train........][test k]        train always starts at bar 0
+    rolling:         [train....][test k]       train keeps the initial length
+
+Folds run in parallel on a shared ProcessPoolExecutor of 'spawn' workers. The price
+series goes to the workers through shared memory, and each worker writes its
+predictions into a shared output array; tasks only pickle the fold bounds and the
+model path. Workers run walk_forward_worker.py, which keeps Django, pandas and
+yfinance out of their imports, and load the model file themselves (one
+single-threaded session per worker, reused across requests).
+
+Every web worker process owns its own pool, so the pool is small: at most
+WALK_FORWARD['MAX_WORKERS'] processes (default 2), never more than the CPUs the
+container may use (affinity and cgroup CPU quota). It is created on the first
+walk-forward request, shut down after WALK_FORWARD['IDLE_TIMEOUT_SECONDS'] without
+one, and at interpreter exit.
+
+Configure with settings.WALK_FORWARD.
+"""
+
+import atexit
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .backtest_core import StreamingRegressionMetrics
+from .data_pipeline import bar_dates
+from .walk_forward_worker import score_fold
+
+
+WALK_FORWARD_SCHEMES = ('expanding', 'rolling')
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+# Requests currently using the pool, and the timer that shuts it down when idle
+_executor_users = 0
+_idle_timer = None
+
+
+def walk_forward_folds(n_bars, n_folds, scheme='expanding', initial_train_ratio=0.5,
+                       sequence_length=100):
+    """
+    Fold boundaries for a walk-forward backtest.
+
+    The first int(n_bars * initial_train_ratio) bars are the initial training period;
+    the rest is cut into n_folds consecutive test blocks (the last one takes the
+    remainder).
+
+    Args:
+        n_bars (int): Length of the price series
+        n_folds (int): Number of folds
+        scheme (str): 'expanding' or 'rolling' (default: 'expanding')
+        initial_train_ratio (float): Share of bars in the first training period (default: 0.5)
+        sequence_length (int): Window length; every training period must cover it
+
+    Returns:
+        list: (train_start, test_start, test_end) bar indices per fold
+
+    Raises:
+        ValueError: If the scheme is unknown or the series is too short for the folds
+    """
+    if scheme not in WALK_FORWARD_SCHEMES:
+        raise ValueError(
+            f"Invalid walk-forward scheme: '{scheme}'. "
+            f"Must be one of: {', '.join(WALK_FORWARD_SCHEMES)}."
+        )
+    initial = int(n_bars * initial_train_ratio)
+    test_size = (n_bars - initial) // max(n_folds, 1)
+    if n_folds < 1 or initial < sequence_length or test_size < 1:
+        raise ValueError(
+            f"Insufficient data for {n_folds} walk-forward folds: {n_bars} days with "
+            f"sequence length {sequence_length}."
+        )
+
+    folds = []
+    for k in range(n_folds):
+        test_start = initial + k * test_size
+        test_end = n_bars if k == n_folds - 1 else test_start + test_size
+        train_start = 0 if scheme == 'expanding' else test_start - initial
+        folds.append((train_start, test_start, test_end))
+    return folds
+
+
+def run_walk_forward(close_prices, model_path, n_folds=5, scheme='expanding',
+                     sequence_length=100, initial_train_ratio=0.5, chunk_size=256,
+                     max_workers=None):
+    """
+    Score every fold of a walk-forward backtest, in parallel across processes.
+
+    Args:
+        close_prices (pd.Series): Time series of closing prices
+        model_path (str): ONNX sequence model file (loaded by each worker)
+        n_folds (int): Number of folds (default: 5)
+        scheme (str): 'expanding' or 'rolling' (default: 'expanding')
+        sequence_length (int): Window length (default: 100)
+        initial_train_ratio (float): Share of bars in the first training period (default: 0.5)
+        chunk_size (int): Windows per model call inside a fold (default: 256)
+        max_workers (int): Folds run at once; 1 scores in this process
+            (default: the pool size, see module docstring)
+
+    Returns:
+        dict: {'scheme', 'folds': [per-fold bounds and metrics],
+               'aggregate': pooled mse/rmse/r2 plus mean/std of fold rmse and r2}
+    """
+    prices = np.asarray(close_prices, dtype='float64').reshape(-1)
+    folds = walk_forward_folds(
+        len(prices), n_folds, scheme, initial_train_ratio, sequence_length
+    )
+    if max_workers is None:
+        max_workers = _pool_size()
+    max_workers = max(1, min(max_workers, _pool_size(), len(folds)))
+
+    shm_prices = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+    shm_predicted = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+    try:
+        np.ndarray(prices.shape, dtype='float64', buffer=shm_prices.buf)[:] = prices
+        tasks = [
+            (shm_prices.name, shm_predicted.name, len(prices), fold, model_path,
+             sequence_length, chunk_size)
+            for fold in folds
+        ]
+        if max_workers == 1:
+            fold_metrics = [score_fold(*task) for task in tasks]
+        else:
+            fold_metrics = _map_on_pool(tasks, max_workers)
+
+        predicted = np.ndarray(prices.shape, dtype='float64', buffer=shm_predicted.buf)
+        pooled = StreamingRegressionMetrics()
+        pooled.update(prices[folds[0][1]:], predicted[folds[0][1]:])
+        aggregate = pooled.result()
+    finally:
+        predicted = None
+        for shm in (shm_prices, shm_predicted):
+            shm.close()
+            shm.unlink()
+
+    dates = bar_dates(close_prices)
+    label = (lambda i: str(dates[i])) if dates is not None else (lambda i: i)
+    fold_results = []
+    for k, ((train_start, test_start, test_end), metrics) in enumerate(zip(folds, fold_metrics)):
+        fold_results.append({
+            'fold': k + 1,
+            'train_start': label(train_start),
+            'test_start': label(test_start),
+            'test_end': label(test_end - 1),
+            'train_days': test_start - train_start,
+            'test_days': test_end - test_start,
+            'mse': round(metrics['mse'], 2),
+            'rmse': round(metrics['rmse'], 2),
+            'r2': round(metrics['r2'], 4),
+        })
+
+    r2s = np.array([m['r2'] for m in fold_metrics])
+    rmses = np.array([m['rmse'] for m in fold_metrics])
+    return {
+        'scheme': scheme,
+        'folds': fold_results,
+        'aggregate': {
+            'mse': round(aggregate['mse'], 2),
+            'rmse': round(aggregate['rmse'], 2),
+            'r2': round(aggregate['r2'], 4),
+            'rmse_mean': round(float(rmses.mean()), 2),
+            'rmse_std': round(float(rmses.std()), 2),
+            'r2_mean': round(float(r2s.mean()), 4),
+            'r2_std': round(float(r2s.std()), 4),
+        },
+    }
+
+
+def _map_on_pool(tasks, max_workers):
+    """Run fold tasks on the shared pool, rebuilding it once if a worker died."""
+    for attempt in range(2):
+        executor = _acquire_executor()
+        try:
+            # Submit at most max_workers folds at a time from this request
+            results = [None] * len(tasks)
+            for start in range(0, len(tasks), max_workers):
+                batch = tasks[start:start + max_workers]
+                futures = [executor.submit(score_fold, *task) for task in batch]
+                for i, future in enumerate(futures):
+                    results[start + i] = future.result()
+            return results
+        except BrokenProcessPool:
+            _reset_executor()
+            if attempt:
+                raise
+        finally:
+            _release_executor()
+
+
+def _acquire_executor():
+    """Return the pool, creating it if needed; pair with _release_executor()."""
+    global _executor, _executor_pid, _executor_users
+    with _executor_lock:
+        # A pool inherited across fork (gunicorn --preload) belongs to the parent
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+            if _executor_pid != os.getpid():
+                _executor_users = 0
+            _executor_pid = os.getpid()
+        _executor_users += 1
+        return _executor
+
+
+def _release_executor():
+    """Start the idle countdown once the last request using the pool is done."""
+    global _executor_users, _idle_timer
+    with _executor_lock:
+        _executor_users = max(_executor_users - 1, 0)
+        if _executor_users or _executor is None:
+            return
+        if _idle_timer is not None:
+            _idle_timer.cancel()
+        _idle_timer = threading.Timer(_idle_timeout(), _shutdown_if_idle)
+        _idle_timer.daemon = True
+        _idle_timer.start()
+
+
+def _shutdown_if_idle():
+    with _executor_lock:
+        if _executor_users == 0:
+            _shutdown_executor()
+
+
+def _reset_executor():
+    with _executor_lock:
+        _shutdown_executor()
+
+
+def _shutdown_executor():
+    """Drop the pool; the caller holds _executor_lock."""
+    global _executor
+    if _executor is not None and _executor_pid == os.getpid():
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+atexit.register(_reset_executor)
+
+
+def _pool_size():
+    from django.conf import settings
+
+    max_workers = getattr(settings, 'WALK_FORWARD', {}).get('MAX_WORKERS', 2)
+    cores = _available_cores()
+    return min(max_workers, cores) if max_workers else cores
+
+
+def _idle_timeout():
+    from django.conf import settings
+
+    return getattr(settings, 'WALK_FORWARD', {}).get('IDLE_TIMEOUT_SECONDS', 300)
+
+
+def _available_cores():
+    """CPUs this process may use: affinity mask, capped by a cgroup CPU quota."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cores = min(cores, max(1, math.ceil(quota)))
+    return cores
+
+
+def _cgroup_cpu_quota():
+    """CPU limit of the container in cores (cgroup v2, then v1), or None if unlimited."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
@@ -0,0 +1,76 @@
+"""
+Walk-Forward Worker - Fold Scoring in Pool Processes
+
+Entry point of the 'spawn' workers started by walk_forward.py. A spawned worker
+imports this module to unpickle its tasks, so it only imports numpy at module level
+(plus the numpy-only backtest_core and scaling modules): no Django, pandas or
+yfinance. onnxruntime is imported on the first fold a worker scores.
+"""
+
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .backtest_core import StreamingRegressionMetrics, create_sequences
+from .scaling import AffineScaler
+
+
+# Worker-side sessions, keyed by (model path, mtime, size)
+_sessions = {}
+
+
+def score_fold(prices_name, predicted_name, n_bars, fold, model_path, sequence_length,
+               chunk_size):
+    """Fit the fold's train-only scaler, score its test block, write predictions to shared memory."""
+    train_start, test_start, test_end = fold
+    # Spawned workers report to the parent's resource tracker, so attaching here does
+    # not hand the blocks to a second tracker that would unlink them on worker exit
+    shm_prices = shared_memory.SharedMemory(name=prices_name)
+    shm_predicted = shared_memory.SharedMemory(name=predicted_name)
+    try:
+        prices = np.ndarray((n_bars,), dtype='float64', buffer=shm_prices.buf)
+        predicted = np.ndarray((n_bars,), dtype='float64', buffer=shm_predicted.buf)
+
+        scaler = AffineScaler.fit(prices[train_start:test_start].reshape(-1, 1))
+        scaled = scaler.transform(
+            prices[test_start - sequence_length:test_end].reshape(-1, 1)
+        ).astype('float32')
+        X, _ = create_sequences(scaled, sequence_length=sequence_length)
+
+        session = _worker_session(model_path)
+        input_name = session.get_inputs()[0].name
+        out = predicted[test_start:test_end]
+        step = chunk_size if chunk_size and chunk_size > 0 else len(X)
+        for start in range(0, len(X), step):
+            stop = min(start + step, len(X))
+            out[start:stop] = session.run(None, {input_name: X[start:stop]})[0][:, 0]
+        scaler.inverse_transform_inplace(out)
+
+        metrics = StreamingRegressionMetrics()
+        metrics.update(prices[test_start:test_end], out)
+        return metrics.result()
+    finally:
+        prices = predicted = out = None
+        shm_prices.close()
+        shm_predicted.close()
+
+
+def _worker_session(model_path):
+    """Single-threaded session per worker process; reloaded when the file changes."""
+    import onnxruntime as ort
+
+    st = os.stat(model_path)
+    key = (model_path, st.st_mtime_ns, st.st_size)
+    session = _sessions.get(key)
+    if session is None:
+        sess_options = ort.SessionOptions()
+        # Parallelism comes from the pool; one thread per worker avoids oversubscription
+        sess_options.intra_op_num_threads = 1
+        sess_options.inter_op_num_threads = 1
+        session = ort.InferenceSession(
+            model_path, sess_options=sess_options, providers=['CPUExecutionProvider']
+        )
+        _sessions.clear()
+        _sessions[key] = session
+    return session
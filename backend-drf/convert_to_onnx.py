@@ -7,12 +7,34 @@ Ejecutar UNA SOLA VEZ localmente (donde TensorFlow está instalado):
 
 El archivo resultante (stock_prediction_model.onnx) debe commitearse en git.
 En producción (Render) se usa onnxruntime en lugar de TensorFlow.
+
+Además se exporta un modelo "step" con estado (stock_prediction_model_step.onnx):
+    (x, h, c) -> (y, h', c')
+que permite calentar el estado oculto una vez con el historial y luego avanzar
+un solo timestep por día en el pronóstico recursivo. Solo LSTM/GRU apilados
+(un BiLSTM necesita la secuencia completa hacia atrás y no se puede avanzar paso a paso).
+
+    python convert_to_onnx.py --step-only   # solo el modelo step
+
+Para un GRU entrenado localmente:
+    python -c "from convert_to_onnx import convert_step; convert_step('stock_prediction_model_gru.keras', 'stock_prediction_model_gru_step.onnx')"
+
+Por último se genera un modelo "horizon" (stock_prediction_model_horizon.onnx) que
+envuelve el modelo de secuencia en un operador ONNX Loop y produce todo el horizonte
+en una sola llamada: (window, horizon, noise) -> samples. Solo necesita el .onnx ya
+exportado (no TensorFlow), así que funciona para LSTM, GRU y BiLSTM:
+
+    python convert_to_onnx.py --horizon-only
+    python -c "from convert_to_onnx import convert_horizon; convert_horizon('stock_prediction_model_gru.onnx', 'stock_prediction_model_gru_horizon.onnx')"
 """
 
 import os
+import sys
 
 KERAS_MODEL_PATH = "stock_prediction_model.keras"
 ONNX_MODEL_PATH  = "stock_prediction_model.onnx"
+ONNX_STEP_MODEL_PATH = "stock_prediction_model_step.onnx"
+ONNX_HORIZON_MODEL_PATH = "stock_prediction_model_horizon.onnx"
 
 def convert():
     if not os.path.exists(KERAS_MODEL_PATH):
@@ -55,5 +77,225 @@ def convert():
     print("  2. git commit -m 'Add ONNX model for lightweight inference'")
     print("  3. git push")
 
+
+def _build_step_model(model, tf):
+    """
+    Construye un modelo Keras equivalente que expone el estado de las capas recurrentes.
+
+    Entradas:  x (batch, T, 1), h (batch, sum(units)), c (batch, sum(units)) [solo LSTM]
+    Salidas:   y (batch, 1), h' y c' con el mismo layout concatenado por capa.
+    """
+    keras = tf.keras
+    recurrent_types = (keras.layers.LSTM, keras.layers.GRU)
+
+    if any(isinstance(layer, keras.layers.Bidirectional) for layer in model.layers):
+        raise ValueError("Los modelos bidireccionales no admiten inferencia paso a paso.")
+
+    rnn_layers = [layer for layer in model.layers if isinstance(layer, recurrent_types)]
+    if not rnn_layers:
+        raise ValueError("El modelo no contiene capas LSTM/GRU.")
+    has_cell_state = isinstance(rnn_layers[0], keras.layers.LSTM)
+    if any(isinstance(layer, keras.layers.LSTM) != has_cell_state for layer in rnn_layers):
+        raise ValueError("No se admite mezclar capas LSTM y GRU en el modelo step.")
+
+    state_size = sum(layer.units for layer in rnn_layers)
+    x_in = keras.Input(shape=(None, 1), name="x")
+    h_in = keras.Input(shape=(state_size,), name="h")
+    c_in = keras.Input(shape=(state_size,), name="c") if has_cell_state else None
+
+    out = x_in
+    h_out, c_out = [], []
+    offset = 0
+    for layer in model.layers:
+        if isinstance(layer, keras.layers.InputLayer):
+            continue
+        if not isinstance(layer, recurrent_types):
+            # Dense / Dropout (Dropout es identidad en inferencia)
+            out = layer(out)
+            continue
+
+        # Clonar la capa devolviendo secuencia completa + estados, con los mismos pesos
+        config = layer.get_config()
+        config.update(return_sequences=True, return_state=True, stateful=False)
+        step_layer = layer.__class__.from_config(config)
+
+        units = layer.units
+        h0 = h_in[:, offset:offset + units]
+        initial_state = [h0, c_in[:, offset:offset + units]] if has_cell_state else [h0]
+        offset += units
+
+        seq, *states = step_layer(out, initial_state=initial_state)
+        step_layer.set_weights(layer.get_weights())
+        h_out.append(states[0])
+        if has_cell_state:
+            c_out.append(states[1])
+
+        # La última capa recurrente del modelo original devuelve solo el último paso
+        out = seq if layer.return_sequences else states[0]
+
+    outputs = [out, keras.layers.Concatenate(axis=-1)(h_out) if len(h_out) > 1 else h_out[0]]
+    if has_cell_state:
+        outputs.append(keras.layers.Concatenate(axis=-1)(c_out) if len(c_out) > 1 else c_out[0])
+
+    inputs = [x_in, h_in] + ([c_in] if has_cell_state else [])
+    return keras.Model(inputs=inputs, outputs=outputs), state_size, has_cell_state
+
+
+def convert_step(keras_path=KERAS_MODEL_PATH, onnx_path=ONNX_STEP_MODEL_PATH):
+    if not os.path.exists(keras_path):
+        print(f"ERROR: No se encontró {keras_path}")
+        return
+
+    print(f"\nConstruyendo modelo step desde {keras_path} ...")
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(keras_path)
+    try:
+        step_model, state_size, has_cell_state = _build_step_model(model, tf)
+    except ValueError as e:
+        print(f"  Omitido: {e}")
+        return
+
+    input_signature = [
+        tf.TensorSpec([None, None, 1], tf.float32, name="x"),
+        tf.TensorSpec([None, state_size], tf.float32, name="h"),
+    ]
+    if has_cell_state:
+        input_signature.append(tf.TensorSpec([None, state_size], tf.float32, name="c"))
+
+    @tf.function(input_signature=input_signature)
+    def step_fn(*args):
+        return step_model(list(args), training=False)
+
+    tf2onnx.convert.from_function(
+        step_fn,
+        input_signature=input_signature,
+        output_path=onnx_path,
+        opset=13,
+    )
+
+    size_mb = os.path.getsize(onnx_path) / (1024 * 1024)
+    print(f"✓ Modelo step exportado: {onnx_path} ({size_mb:.2f} MB) | estado: {state_size}")
+
+
+def _build_horizon_model(seq_model):
+    """
+    Envuelve el grafo de secuencia en un Loop ONNX de pronóstico recursivo.
+
+    Entradas:
+        window  (1, seq_len, 1)            ventana escalada inicial
+        horizon ()  int64                  número de días (trip count del Loop)
+        noise   (horizon, mc, seq_len, 1)  ruido MC por día y muestra
+    Salidas:
+        samples (horizon, mc)              predicciones MC escaladas por día
+
+    Cada iteración replica FuturePredictionEngine en modo 'recursive':
+    window + noise[i] -> modelo -> media de las muestras -> se desplaza la ventana.
+    """
+    import onnx
+    from onnx import helper, TensorProto
+
+    seq_graph = seq_model.graph
+    seq_input = seq_graph.input[0].name
+    seq_output = seq_graph.output[0].name
+    seq_len = seq_graph.input[0].type.tensor_type.shape.dim[1].dim_value
+
+    def const(name, values):
+        return helper.make_node(
+            'Constant', [], [name],
+            value=helper.make_tensor(name, TensorProto.INT64, [len(values)], values),
+        )
+
+    # Cuerpo del Loop: (iter, cond, window) -> (cond, window', y)
+    # Los nodos del modelo de secuencia se insertan tal cual; su entrada pasa a ser
+    # window + noise[i]. Los pesos quedan como initializers del grafo principal
+    # (visibles desde el cuerpo como valores del scope externo).
+    body_nodes = [
+        helper.make_node('Identity', ['horizon/cond_in'], ['horizon/cond_out']),
+        helper.make_node('Gather', ['noise', 'horizon/iter'], ['horizon/noise_i'], axis=0),
+        helper.make_node('Add', ['horizon/window_in', 'horizon/noise_i'], [seq_input]),
+        *seq_graph.node,
+        helper.make_node('ReduceMean', [seq_output], ['horizon/mean'], axes=[0], keepdims=1),
+        const('horizon/axis1', [1]),
+        const('horizon/axis2', [2]),
+        const('horizon/one', [1]),
+        const('horizon/end', [seq_len]),
+        helper.make_node('Unsqueeze', ['horizon/mean', 'horizon/axis2'], ['horizon/mean_3d']),
+        helper.make_node(
+            'Slice', ['horizon/window_in', 'horizon/one', 'horizon/end', 'horizon/axis1'],
+            ['horizon/window_tail'],
+        ),
+        helper.make_node(
+            'Concat', ['horizon/window_tail', 'horizon/mean_3d'], ['horizon/window_out'], axis=1
+        ),
+        helper.make_node('Squeeze', [seq_output, 'horizon/axis1'], ['horizon/y']),
+    ]
+    body = helper.make_graph(
+        body_nodes,
+        'horizon_body',
+        inputs=[
+            helper.make_tensor_value_info('horizon/iter', TensorProto.INT64, []),
+            helper.make_tensor_value_info('horizon/cond_in', TensorProto.BOOL, []),
+            helper.make_tensor_value_info('horizon/window_in', TensorProto.FLOAT, [1, seq_len, 1]),
+        ],
+        outputs=[
+            helper.make_tensor_value_info('horizon/cond_out', TensorProto.BOOL, []),
+            helper.make_tensor_value_info('horizon/window_out', TensorProto.FLOAT, [1, seq_len, 1]),
+            helper.make_tensor_value_info('horizon/y', TensorProto.FLOAT, ['mc']),
+        ],
+    )
+
+    main_nodes = [
+        helper.make_node(
+            'Constant', [], ['horizon/cond'],
+            value=helper.make_tensor('horizon/cond', TensorProto.BOOL, [], [True]),
+        ),
+        helper.make_node(
+            'Loop', ['horizon', 'horizon/cond', 'window'],
+            ['window_final', 'samples'], body=body,
+        ),
+    ]
+    graph = helper.make_graph(
+        main_nodes,
+        'horizon_model',
+        inputs=[
+            helper.make_tensor_value_info('window', TensorProto.FLOAT, [1, seq_len, 1]),
+            helper.make_tensor_value_info('horizon', TensorProto.INT64, []),
+            helper.make_tensor_value_info('noise', TensorProto.FLOAT, ['horizon', 'mc', seq_len, 1]),
+        ],
+        outputs=[
+            helper.make_tensor_value_info('window_final', TensorProto.FLOAT, [1, seq_len, 1]),
+            helper.make_tensor_value_info('samples', TensorProto.FLOAT, ['horizon', 'mc']),
+        ],
+        initializer=list(seq_graph.initializer),
+    )
+    model = helper.make_model(graph, opset_imports=list(seq_model.opset_import))
+    model.ir_version = seq_model.ir_version
+    onnx.checker.check_model(model)
+    return model
+
+
+def convert_horizon(onnx_path=ONNX_MODEL_PATH, horizon_path=ONNX_HORIZON_MODEL_PATH):
+    if not os.path.exists(onnx_path):
+        print(f"ERROR: No se encontró {onnx_path}")
+        return
+
+    print(f"\nEnvolviendo {onnx_path} en un Loop ONNX ...")
+    import onnx
+
+    horizon_model = _build_horizon_model(onnx.load(onnx_path))
+    onnx.save(horizon_model, horizon_path)
+
+    size_mb = os.path.getsize(horizon_path) / (1024 * 1024)
+    print(f"✓ Modelo horizon exportado: {horizon_path} ({size_mb:.2f} MB)")
+
+
 if __name__ == "__main__":
-    convert()
+    if "--horizon-only" in sys.argv:
+        convert_horizon()
+        sys.exit(0)
+    if "--step-only" not in sys.argv:
+        convert()
+    convert_step()
+    convert_horizon()
@@ -97,6 +97,29 @@ else:
     }
 
 
+# Cache
+# Shared by all gunicorn workers: Redis when REDIS_URL is set (needs the redis
+# package), otherwise a local file-based cache.
+
+_REDIS_URL = config('REDIS_URL', default=None)
+
+if _REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=str(BASE_DIR / 'django_cache')),
+            'OPTIONS': {'MAX_ENTRIES': 2000},
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -179,5 +202,130 @@ EMAIL_HOST_PASSWORD = config('SENDGRID_API_KEY', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@em7361.cholabs.dedyn.io')
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
 
+# Per-ticker min/max scalers stored in the TickerScaler table (api/scaler_store.py).
+# When False, backtests refit per request and forecasts use the global AAPL scaler.
+TICKER_SCALERS = config('TICKER_SCALERS', default=True, cast=bool)
+
+# Backtest windows per model call (api/data_pipeline.run_backtest); bounds the input
+# tensor and activations on long histories. 0 runs every window in one call.
+BACKTEST_CHUNK_SIZE = config('BACKTEST_CHUNK_SIZE', default=256, cast=int)
+
+# Reuse backtest window predictions across requests (api/backtest_cache.py); only
+# windows on newly arrived bars are inferred
+BACKTEST_CACHE = config('BACKTEST_CACHE', default=True, cast=bool)
+
+# Local daily-bar store (api/price_store.py): history is downloaded once per ticker,
+# later requests fetch only the bars after the last stored date. Upstream is not asked
+# again within MIN_REFRESH_SECONDS of the last refresh.
+PRICE_STORE = {
+    'ENABLED': config('PRICE_STORE', default=True, cast=bool),
+    'MIN_REFRESH_SECONDS': config('PRICE_STORE_MIN_REFRESH_SECONDS', default=900, cast=int),
+}
+
+# Shared cache of historical downloads (api/history_cache.py), valid until the next
+# exchange close
+HISTORY_CACHE = {
+    'ENABLED': config('HISTORY_CACHE', default=True, cast=bool),
+    'EXCHANGE_TIMEZONE': config('HISTORY_CACHE_EXCHANGE_TZ', default='America/New_York'),
+    'CLOSE_TIME': config('HISTORY_CACHE_CLOSE_TIME', default='16:00'),
+}
+
+# Single-flight historical downloads (api/single_flight.py): workers wait on a per-key
+# file lock in LOCK_DIR (default: <tmp>/neurostock-locks) for up to LOCK_TIMEOUT seconds
+SINGLE_FLIGHT = {
+    'LOCK_DIR': config('SINGLE_FLIGHT_LOCK_DIR', default=''),
+    'LOCK_TIMEOUT': config('SINGLE_FLIGHT_LOCK_TIMEOUT', default=60, cast=int),
+}
+
+# Walk-forward backtests (api/walk_forward.py): folds run on a process pool per web
+# worker, capped at MAX_WORKERS processes and the container's CPU limit (0 = no cap
+# beyond the CPU limit); the pool is shut down after IDLE_TIMEOUT_SECONDS unused
+WALK_FORWARD = {
+    'MAX_WORKERS': config('WALK_FORWARD_MAX_WORKERS', default=2, cast=int),
+    'MAX_FOLDS': config('WALK_FORWARD_MAX_FOLDS', default=10, cast=int),
+    'IDLE_TIMEOUT_SECONDS': config('WALK_FORWARD_IDLE_TIMEOUT', default=300, cast=int),
+}
+
+# Cross-request micro-batching of ONNX inference (api/inference_dispatcher.py).
+# Only merges calls from threads sharing a process: enable it with a threaded worker
+# class (gunicorn --threads N); with sync workers it only adds a thread hop.
+INFERENCE_BATCHING = {
+    'ENABLED': config('INFERENCE_BATCHING', default=False, cast=bool),
+    'MAX_BATCH_SIZE': config('INFERENCE_MAX_BATCH_SIZE', default=512, cast=int),
+}
+
+# ONNX IOBinding with thread-local reusable input/output buffers (api/io_binding.py),
+# pooled per distinct input shape. Off by default: no measurable gain on single-thread
+# timings with the current models; try it with larger models or long horizons
+INFERENCE_IO_BINDING = {
+    'ENABLED': config('INFERENCE_IO_BINDING', default=False, cast=bool),
+    'MAX_SHAPES_PER_THREAD': config('INFERENCE_IO_BINDING_MAX_SHAPES', default=8, cast=int),
+}
+
+# Shared out-of-process inference (api/inference_server.py). When INFERENCE_SOCKET is
+# set, web workers forward ONNX calls to `python manage.py run_inference_server`.
+INFERENCE_SERVER = {
+    'SOCKET': config('INFERENCE_SOCKET', default=''),
+    'TIMEOUT': config('INFERENCE_TIMEOUT', default=120.0, cast=float),
+}
+
+# ONNX Runtime session tuning (api/ml_manager.py). Pick a profile per host with
+# ONNX_SESSION_PROFILE. graph_optimization_level: disable | basic | extended | all;
+# execution_mode: sequential | parallel; 0 threads = let onnxruntime use all cores.
+ONNX_SESSION_PROFILES = {
+    'default': {
+        'graph_optimization_level': 'all',
+        'intra_op_num_threads': 1,
+        'inter_op_num_threads': 1,
+        'execution_mode': 'sequential',
+        'enable_cpu_mem_arena': True,
+        'enable_mem_pattern': True,
+    },
+    # Dedicated inference host (e.g. run_inference_server) with spare cores
+    'multicore': {
+        'graph_optimization_level': 'all',
+        'intra_op_num_threads': 0,
+        'inter_op_num_threads': 1,
+        'execution_mode': 'sequential',
+        'enable_cpu_mem_arena': True,
+        'enable_mem_pattern': True,
+    },
+    # Smallest resident memory: no arena, no pre-planned buffers
+    'low_memory': {
+        'graph_optimization_level': 'all',
+        'intra_op_num_threads': 1,
+        'inter_op_num_threads': 1,
+        'execution_mode': 'sequential',
+        'enable_cpu_mem_arena': False,
+        'enable_mem_pattern': False,
+    },
+}
+ONNX_SESSION_PROFILE = config('ONNX_SESSION_PROFILE', default='default')
+# Optimized graphs are cached here, keyed by model hash + onnxruntime version ('' disables).
+# Level 'all' graphs can be CPU-specific: keep this directory host-local.
+ONNX_OPTIMIZED_MODEL_DIR = config('ONNX_OPTIMIZED_MODEL_DIR', default=str(BASE_DIR / 'onnx_cache'))
+
+# Versioned model registry (api/model_registry.py): sessions beyond the memory budget
+# are evicted LRU; model files are re-checked for changes every RELOAD_CHECK_SECONDS.
+MODEL_REGISTRY = {
+    'MEMORY_BUDGET_MB': config('MODEL_MEMORY_BUDGET_MB', default=256, cast=float),
+    'RELOAD_CHECK_SECONDS': config('MODEL_RELOAD_CHECK_SECONDS', default=2.0, cast=float),
+}
+
+# Architectures whose sequence model loads its INT8 variant (<stem>_int8.onnx from
+# `manage.py quantize_models`) when present, e.g. ML_PREFER_QUANTIZED=lstm,gru.
+# Step and horizon models are not quantized and keep their fp32 files.
+ML_PREFER_QUANTIZED = config('ML_PREFER_QUANTIZED', default='', cast=Csv())
+
+# Architectures whose forecasts run on the stateful step model (<stem>_step.onnx from
+# convert_to_onnx.py) when present, e.g. ML_STEP_MODELS=lstm. Each day then costs one
+# timestep, but the state keeps context older than the 100-day window, so forecasts
+# differ from the windowed model's after day 1.
+ML_STEP_MODELS = config('ML_STEP_MODELS', default='', cast=Csv())
+
+# Load and warm every available model at worker boot (stock_prediction_main/wsgi.py).
+# With `gunicorn --preload` this runs once in the master, before workers fork.
+ML_PRELOAD = config('ML_PRELOAD', default=False, cast=bool)
+
 # Password Reset Token Expiration (hours)
 PASSWORD_RESET_TIMEOUT = 3600  # 1 hour in seconds
\ No newline at end of file
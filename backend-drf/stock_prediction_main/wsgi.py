@@ -5,6 +5,10 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
+
+With ML_PRELOAD=True the ML models and scaler are loaded and warmed up here, so
+the first request on a new worker does not pay for it. Run gunicorn with
+--preload to do this once in the master and share the weights copy-on-write.
 """
 
 import os
@@ -14,3 +18,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stock_prediction_main.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.ML_PRELOAD:
+    from api.ml_manager import MLModelManager
+    MLModelManager.get_instance().preload()